@@ -0,0 +1,992 @@
+import os
+import tempfile
+import threading
+import time
+from datetime import date
+from types import SimpleNamespace
+import tkinter as tk
+from tkinter import ttk
+from unittest import TestCase, skipIf
+from unittest.mock import patch
+
+from tktwid import *
+from tktwid.widgets import _AutocompleteDropdown, _ScrollRouter
+
+
+def _has_display():
+    try:
+        tk.Tk().destroy()
+    except tk.TclError:
+        return False
+    return True
+
+
+HAS_DISPLAY = _has_display()
+
+
+@skipIf(not HAS_DISPLAY, "no display available")
+class TkTestCase(TestCase):
+    "Tests that need a Tk root, skipped when there is no display"
+
+    def setUp(self):
+        self.root = tk.Tk()
+        self.root.withdraw()
+
+    def tearDown(self):
+        self.root.destroy()
+
+    def jobs(self):
+        "The after callbacks waiting"
+        return self.root.tk.splitlist(self.root.tk.call("after", "info"))
+
+    def pump(self, ms=0):
+        "Run the events and the after callbacks due in ms"
+        if ms:
+            done = tk.BooleanVar(self.root)
+            self.root.after(ms, done.set, True)
+            self.root.wait_variable(done)
+        self.root.update()
+
+
+class EventDispatcherTest(TkTestCase):
+    def test_destroy_drops_closures(self):
+        dispatcher = EventDispatcher.of(self.root)
+        frame = ttk.Frame(self.root)
+        dispatcher.subscribe("<Button-1>", frame, lambda e: frame)
+        dispatcher.subscribe_toplevel("<Configure>", frame, lambda e: frame)
+        self.assertIn(str(frame), dispatcher._all["<Button-1>"])
+
+        frame.destroy()
+        self.assertNotIn(str(frame), dispatcher._all["<Button-1>"])
+        for subscribers in dispatcher._toplevel["<Configure>"].values():
+            self.assertNotIn(str(frame), subscribers)
+
+    def test_kept_by_root(self):
+        self.assertIs(EventDispatcher.of(self.root), self.root._tktwid_dispatcher)
+
+
+class PrefixIndexTest(TestCase):
+    def setUp(self):
+        self.index = PrefixIndex(
+            ["Brasil", "Bolivia", "Belgica", "Argentina", "Alemanha"], ngram=2
+        )
+
+    def test_prefix(self):
+        self.assertEqual(self.index.search("b"), ["Belgica", "Bolivia", "Brasil"])
+        self.assertEqual(self.index.search("bo"), ["Bolivia"])
+
+    def test_substring(self):
+        self.assertEqual(self.index.search("ent", mode="substring"), ["Argentina"])
+
+    def test_fuzzy_ranks_by_grams(self):
+        self.assertEqual(self.index.search("brsil", 1, mode="fuzzy"), ["Brasil"])
+
+    def test_fuzzy_candidates_capped(self):
+        index = PrefixIndex([f"item{i:06}" for i in range(20000)], ngram=3)
+        index.fuzzy_candidates = 50
+        result = index.search("item019999", 5, mode="fuzzy")
+        self.assertEqual(len(result), 5)
+        self.assertTrue(all(item.startswith("item") for item in result))
+
+
+class MaskFormatterTest(TestCase):
+    mask = "+ 99 (99) 99999-9999"
+
+    def test_compiled_once(self):
+        self.assertIs(MaskFormatter.of(self.mask), MaskFormatter.of(self.mask))
+
+    def test_format(self):
+        formatter = MaskFormatter.of(self.mask)
+        self.assertEqual(formatter.format("5511987654321"), "+ 55 (11) 98765-4321")
+        self.assertEqual(formatter.format("55x11"), "+ 55 (11")
+        self.assertEqual(formatter.format(""), "")
+
+    def test_many_like_one_by_one(self):
+        formatter = MaskFormatter.of(self.mask)
+        values = ["5511987654321", "551198765", "+ 55 (11) 98765-4321", "ab", 55]
+        self.assertEqual(
+            formatter.format_many(values), [formatter.format(v) for v in values]
+        )
+        formatted = formatter.format_many(values)
+        self.assertEqual(
+            formatter.validate_many(formatted),
+            [formatter.validate(v) for v in formatted],
+        )
+        self.assertEqual(formatter.validate_many(formatted)[:3], [True, False, True])
+
+
+class DateFormatTest(TestCase):
+    def test_empty_dates(self):
+        formatter = DateFormat.of("dd/mm/yyyy")
+        self.assertEqual(formatter.format(None), "")
+        self.assertEqual(formatter.format_many([None, "2020-05-04"]), ["", "04/05/2020"])
+
+    def test_parse(self):
+        formatter = DateFormat.of("dd/mm/yyyy")
+        self.assertEqual(formatter.parse("4/5/2020", strict=False), date(2020, 5, 4))
+        with self.assertRaises(ValueError):
+            formatter.parse("4/5/2020")
+
+
+class TableThemeTest(TkTestCase):
+    def test_empty_dates_in_rows(self):
+        table = TableTheme(self.root, ["id", "date"])
+        table.set_formatter("date", DateFormat.of("dd/mm/yyyy"))
+        table.add_row(["1", None])
+        table.add_rows([["2", None], ["3", "2020-05-04"]])
+        values = [table.set(iid, "date") for iid in table.get_children()]
+        self.assertEqual(values, ["", "", "04/05/2020"])
+
+
+def _schema(fields=40, command=None):
+    return {
+        "items": [{"type": "title", "text": "Client"}]
+        + [
+            {"type": "entry", "name": f"field{i}", "label": f"Field {i}: "}
+            for i in range(fields)
+        ]
+        + [{"type": "button", "name": "submit", "text": "Submit", "command": command}],
+        "states": {"reading": {"buttons": {"submit": "disabled"}}},
+    }
+
+
+class FormSchemaTest(TestCase):
+    def setUp(self):
+        FormSchema._cache.clear()
+
+    def test_not_valid(self):
+        with self.assertRaises(ValueError):
+            FormSchema({"items": [{"type": "entry"}]})
+        with self.assertRaises(ValueError):
+            FormSchema({"items": [{"type": "nothing"}]})
+        with self.assertRaises(ValueError):
+            FormSchema({"states": {"s": {"elements": {"name": "active"}}}})
+
+    def test_callbacks_out_of_key(self):
+        for i in range(50):
+            plan = FormSchema.of(_schema(command=lambda: i))
+        self.assertEqual(len(FormSchema._cache), 1)
+        self.assertEqual(plan.calls()[-1][1][2](), 49)
+
+    def test_cache_bounded(self):
+        for i in range(FormSchema.cache_size + 10):
+            FormSchema.of(_schema(fields=i))
+        self.assertEqual(len(FormSchema._cache), FormSchema.cache_size)
+
+    def test_compiled_once(self):
+        compile = FormSchema._compile
+        with patch.object(
+            FormSchema, "_compile", autospec=True, side_effect=compile
+        ) as compiled:
+            for i in range(10):
+                FormSchema.of(_schema(command=lambda: i))
+        self.assertEqual(compiled.call_count, 1)
+
+
+class FormSchemaBuildTest(TkTestCase):
+    def test_benchmark(self):
+        times = FormSchema.benchmark(n=2, fields=5)
+        self.assertEqual(sorted(times), ["compile", "imperative", "schema"])
+
+    def test_from_schema(self):
+        pressed = []
+        form = FormTheme.from_schema(
+            self.root, _schema(fields=3, command=lambda: pressed.append(1))
+        )
+        self.assertEqual(form.elements(), ["field0", "field1", "field2"])
+        form.button("submit").invoke()
+        self.assertEqual(pressed, [1])
+
+        form.set_state("reading")
+        self.assertEqual(str(form.button("submit").cget("state")), "disabled")
+
+
+class AutocompleteTest(TkTestCase):
+    def test_dropdown_kept_by_toplevel(self):
+        entry = EntryTheme(self.root, autocomplete=["a", "b"])
+        dropdown = _AutocompleteDropdown.of(entry)
+        self.assertIs(self.root._autocomplete_dropdown, dropdown)
+        self.assertIs(_AutocompleteDropdown.of(entry), dropdown)
+
+    def test_destroy_cancels_hide(self):
+        entry = EntryTheme(self.root, autocomplete=["ana", "anibal"])
+        entry._autocomplete_hide()
+        self.assertIsNotNone(entry._autocomplete_hide_job)
+        entry.destroy()
+        # The delayed hide of the destroyed entry must not run
+        self.pump(200)
+
+
+class TextareaTest(TkTestCase):
+    text = "line\n" * 1000
+
+    def setUp(self):
+        super().setUp()
+        with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False) as f:
+            f.write(self.text)
+        self.path = f.name
+        self.addCleanup(os.remove, self.path)
+
+    def state(self, textarea):
+        return str(textarea.text.cget("state"))
+
+    def test_not_editable_while_loading(self):
+        textarea = TextareaTheme(self.root, chunk_size=100)
+        textarea.load(self.path, readonly=False)
+        self.assertTrue(textarea.loading())
+        self.assertEqual(self.state(textarea), "disabled")
+
+        textarea.finish_loading()
+        self.assertEqual(self.state(textarea), "normal")
+        self.assertEqual(textarea.get_value(), self.text)
+
+    def test_disable_while_loading(self):
+        textarea = TextareaTheme(self.root, chunk_size=100)
+        textarea.load(self.path, readonly=False)
+        textarea.disable()
+        textarea.finish_loading()
+        self.assertEqual(self.state(textarea), "disabled")
+
+    def test_form_reset_loads_file(self):
+        form = FormTheme(self.root)
+        form.add_textarea("notes", file=self.path, chunk_size=100)
+        self.assertEqual(form.get()["notes"], self.text)
+        self.assertFalse(form.changed())
+
+        form.set_values({"notes": "other"})
+        self.assertTrue(form.changed())
+
+        form.reset()
+        self.assertEqual(form.get()["notes"], self.text)
+        self.assertFalse(form.changed())
+
+
+class LogConsoleTest(TkTestCase):
+    def test_append_from_thread(self):
+        console = LogConsoleTheme(self.root)
+        thread = threading.Thread(target=console.extend, args=(["a", "b"],))
+        thread.start()
+        thread.join()
+        self.pump(200)
+        self.assertEqual(console.get_value(), "a\nb\n")
+
+    def test_flush_only_lines_queued(self):
+        console = LogConsoleTheme(self.root, idle_ms=20)
+        flushes = []
+        flush = console._flush
+        console._flush = lambda: flushes.append(1) or flush()
+        self.pump(100)
+        self.assertEqual(flushes, [])
+
+        console.append("a")
+        self.pump(100)
+        self.assertEqual(flushes, [1])
+        self.assertEqual(console.get_value(), "a\n")
+
+    def test_follow_twice(self):
+        console = LogConsoleTheme(self.root)
+        self.addCleanup(console.stop_following)
+        with tempfile.NamedTemporaryFile("w", delete=False) as f:
+            pass
+        self.addCleanup(os.remove, f.name)
+
+        console.follow(f.name)
+        follower = console._follower
+        console.follow(f.name)
+        self.assertIs(console._follower, follower)
+
+    def test_destroy_cancels_flush(self):
+        console = LogConsoleTheme(self.root)
+        job = console._flush_job
+        self.assertIn(job, self.jobs())
+        console.destroy()
+        self.assertNotIn(job, self.jobs())
+
+
+class SimpleCalendarTest(TkTestCase):
+    def test_range_of_one_date(self):
+        calendar = SimpleCalendar(self.root, mode="grid", select="range")
+        calendar.set_range("2020-05-04", "2020-05-04")
+        self.assertEqual(calendar.get_value(), "2020-05-04")
+
+        calendar.set_range("2020-05-09", "2020-05-04")
+        self.assertEqual(calendar.get_value(), "2020-05-04/2020-05-09")
+
+    def test_select_not_valid(self):
+        with self.assertRaises(AttributeError):
+            SimpleCalendar(self.root, select="week")
+
+    def test_popup_kept_by_toplevel(self):
+        calendar = SimpleCalendar(self.root, mode="grid")
+        self.assertIsNone(calendar._popup_class().find(calendar))
+        popup = calendar._popup_class().of(calendar)
+        self.assertIs(calendar._popup_class().find(calendar), popup)
+
+    def test_popup_shared(self):
+        first = SimpleCalendar(self.root, first_year=2000, last_year=2010)
+        second = SimpleCalendar(self.root, first_year=1990, last_year=2030)
+        first.set_value("2005-03-04")
+        second.set_value("2020-01-02")
+
+        first._build(None)
+        popup = first._popup_class().find(first)
+        self.assertEqual(popup.year.size(), 11)
+
+        second._build(None)
+        self.assertIs(second._popup_class().find(second), popup)
+        self.assertIs(popup.owner(), second)
+        self.assertEqual(popup.year.size(), 41)
+        self.assertEqual(int(popup.year.get(popup.year.curselection()[0])), 2020)
+
+        popup.confirm()
+        self.assertIsNone(popup.owner())
+        self.assertEqual(second.get_value(), "2020-01-02")
+
+
+class ScrollFrameThemeTest(TkTestCase):
+    def setUp(self):
+        super().setUp()
+        self.scroll = ScrollFrameTheme(self.root)
+        self.scroll.pack(fill="both", expand=True)
+
+    def test_virtual_mode_off(self):
+        self.scroll.refresh()
+        with self.assertRaises(AttributeError):
+            self.scroll.set_count(10)
+
+    def test_virtual_rows(self):
+        bound = {}
+        self.scroll.set_virtual(
+            1000,
+            lambda master: LabelTheme(master),
+            lambda row, index: bound.__setitem__(index, row),
+            row_height=20,
+        )
+        self.pump()
+        self.assertIn(0, bound)
+        self.assertLess(len(self.scroll._rows), 100)
+
+        self.scroll.set_count(1)
+        self.assertEqual(list(self.scroll._rows), [0])
+
+    def test_router_kept_by_root(self):
+        router = _ScrollRouter.of(self.scroll)
+        self.assertIs(self.root._tktwid_scroll_router, router)
+        self.assertIs(_ScrollRouter.of(self.root), router)
+
+    def test_nested_hand_off(self):
+        self.root.geometry("300x300")
+        self.root.deiconify()
+        inner = ScrollFrameTheme(self.scroll.viewPort, smooth=False)
+        inner.pack(fill="x")
+        LabelTheme(inner.viewPort, text="short").pack()
+        tk.Frame(self.scroll.viewPort, height=2000, width=10).pack()
+        self.pump(50)
+
+        event = SimpleNamespace(
+            num=5,
+            delta=0,
+            state=0,
+            x_root=inner.winfo_rootx() + 5,
+            y_root=inner.winfo_rooty() + 5,
+        )
+        _ScrollRouter.of(self.root)._wheel(event)
+        self.pump(100)
+        self.assertEqual(inner._canvas.yview()[0], 0.0)
+        self.assertGreater(self.scroll._canvas.yview()[0], 0.0)
+
+    def test_tiles_mode_off(self):
+        self.scroll.refresh_tiles()
+        with self.assertRaises(AttributeError):
+            self.scroll.set_grid_size(10, 10)
+
+    def test_tiles_budget(self):
+        self.root.geometry("200x200")
+        self.root.deiconify()
+        self.scroll.set_tiles(
+            100, 100, lambda master, row, column: FrameTheme(master), 50, 50, budget=40
+        )
+        self.pump()
+        shown = len(self.scroll._shown)
+        self.assertGreater(shown, 0)
+        self.assertLess(shown, 100)
+
+        self.scroll.set_grid_size(2, 2)
+        self.assertTrue(all(r < 2 and c < 2 for r, c in self.scroll._shown))
+
+    def test_batch_updates_region_once(self):
+        calls = []
+        update = self.scroll._update_region
+        self.scroll._update_region = lambda: calls.append(1) or update()
+        self.pump()
+        calls.clear()
+
+        with self.scroll.batch() as viewPort:
+            for i in range(100):
+                LabelTheme(viewPort, text=i).pack()
+        self.pump()
+
+        self.assertEqual(len(calls), 1)
+        region = self.scroll._canvas.cget("scrollregion").split()
+        self.assertGreater(int(float(region[3])), 100)
+
+
+class LazyFormTest(TkTestCase):
+    def setUp(self):
+        super().setUp()
+        with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False) as f:
+            f.write("notes\n" * 100)
+        self.path = f.name
+        self.addCleanup(os.remove, self.path)
+
+    def test_textarea_file_before_and_after_realize(self):
+        form = FormTheme(self.root, lazy=True)
+        form.start_field("Notes")
+        form.add_textarea("notes", file=self.path, chunk_size=64)
+        form.close_field()
+
+        self.assertIsNone(form._elements["notes"]["widget"])
+        self.assertEqual(form.get()["notes"], "notes\n" * 100)
+        self.assertFalse(form.changed())
+
+        form.realize()
+        self.assertEqual(form.get()["notes"], "notes\n" * 100)
+
+    def test_realize_takes_widget_value(self):
+        form = FormTheme(self.root, lazy=True)
+        form.start_field("Dates")
+        form.add_calendar("day", value="04/05/2020")
+        form.close_field()
+
+        form.realize()
+        self.assertEqual(form.get()["day"], "2020-05-04")
+        self.assertFalse(form.changed())
+
+    def test_set_before_realize(self):
+        form = FormTheme(self.root, lazy=True)
+        form.start_field("Client")
+        form.add_entry("name")
+        form.close_field()
+
+        form.set_values({"name": "Ana"})
+        self.assertEqual(form.dirty_fields(), ["name"])
+        form.realize()
+        self.assertEqual(form["name"]["widget"].get_value(), "Ana")
+        self.assertEqual(form.get()["name"], "Ana")
+
+    def test_realize_keeps_layout_cursors(self):
+        form = FormTheme(self.root, lazy=True, layout="flat")
+        form.start_field("Client")
+        form.add_entry("a")
+        form.close_field()
+        b = form.add_entry("b")
+
+        form.realize()
+        c = form.add_entry("c", new_line=False)
+        self.assertIs(c.master, b.master)
+        self.assertEqual(c.grid_info()["row"], b.grid_info()["row"])
+
+
+class FormModelTest(TkTestCase):
+    def setUp(self):
+        super().setUp()
+        self.form = FormTheme(self.root)
+        self.form.add_entry("name", value="Ana")
+        self.form.add_textarea("notes", value="first")
+
+    def test_same_dirty_rule_for_every_element(self):
+        form = self.form
+        form.set_values({"name": "Bia", "notes": "second"})
+        self.assertEqual(sorted(form.dirty_fields()), ["name", "notes"])
+
+        form.set_values({"name": "Ana", "notes": "first"})
+        self.assertEqual(form.dirty_fields(), [])
+        self.assertFalse(form.changed())
+
+    def test_textarea_edit(self):
+        form = self.form
+        form["notes"]["widget"].text.insert("end", " edited")
+        self.pump()
+        self.assertEqual(form.dirty_fields(), ["notes"])
+        self.assertEqual(form.get()["notes"], "first edited")
+
+        form.mark_clean()
+        self.assertFalse(form.changed())
+
+    def test_entry_typing(self):
+        form = self.form
+        form["name"]["widget"].insert("end", "na")
+        self.assertEqual(form.dirty_fields(), ["name"])
+
+    def test_batch_notifies_once(self):
+        changes = []
+        self.form.add_listener(changes.append)
+        with self.form.batch():
+            self.form.set_values({"name": "Bia"})
+            self.form.set_values({"name": "Caio", "notes": "second"})
+        self.assertEqual(
+            changes, [{"name": ("Ana", "Caio"), "notes": ("first", "second")}]
+        )
+
+    def test_required(self):
+        self.form.add_entry("city", required=True)
+        self.assertEqual(list(self.form.validate()), ["city"])
+
+    def test_pattern_not_checked(self):
+        self.form.add_entry("code", value="abc", pattern=r"[0-9]+")
+        self.assertEqual(self.form.validate(), {})
+        self.assertEqual(self.form.get()["code"], "abc")
+
+
+class FormStateTest(TkTestCase):
+    def setUp(self):
+        super().setUp()
+        self.form = FormTheme(self.root)
+        self.form.add_entry("a")
+        self.form.add_entry("b")
+        self.form.add_button("save", "Save", lambda: None)
+        self.form.new_state("view", {"elements": {"a": "disabled"}})
+
+        self.touched = []
+        set_widget_state = self.form._set_widget_state
+        self.form._set_widget_state = lambda group, name, state: (
+            self.touched.append(name) or set_widget_state(group, name, state)
+        )
+
+    def _set_state(self, state_name):
+        self.touched.clear()
+        self.form.set_state(state_name)
+        return sorted(self.touched)
+
+    def test_only_changes_touched(self):
+        self.assertEqual(self._set_state("all_active"), ["a", "b", "save"])
+        self.assertEqual(self._set_state("all_active"), [])
+        self.assertEqual(self._set_state("view"), ["a"])
+        self.assertEqual(self._set_state("all_disabled"), ["b", "save"])
+        self.assertEqual(self._set_state("only_buttons"), ["save"])
+        self.assertEqual(self.form._widget_states[("elements", "a")], "disabled")
+
+    def test_state_not_valid(self):
+        self.form.new_state("wrong", {"elements": {"a": "hidden"}})
+        with self.assertRaises(AttributeError):
+            self.form.set_state("wrong")
+
+
+class SubmitTest(TkTestCase):
+    def setUp(self):
+        super().setUp()
+        self.release = threading.Event()
+        self.addCleanup(self.release.set)
+        self.results = []
+        self.errors = []
+
+        self.form = FormTheme(self.root)
+        self.form.add_entry("name", value="Ana")
+
+    def _add(self, command):
+        self.form.add_button(
+            "save",
+            "Save",
+            command,
+            submit="thread",
+            on_result=self.results.append,
+            on_error=self.errors.append,
+        )
+
+    def _wait(self):
+        for i in range(100):
+            if not self.form.submitting():
+                return
+            self.pump(20)
+
+    def test_busy_until_result(self):
+        self._add(lambda values: self.release.wait(5) and values)
+        self.assertTrue(self.form.submit("save"))
+        self.assertTrue(self.form.submitting("save"))
+        self.assertEqual(self.form._widget_states[("elements", "name")], "disabled")
+        self.assertFalse(self.form.submit("save"))
+
+        self.release.set()
+        self._wait()
+        self.assertEqual(self.results, [{"name": "Ana"}])
+        self.assertEqual(self.form._widget_states[("elements", "name")], "active")
+
+    def test_two_buttons(self):
+        other = threading.Event()
+        self.addCleanup(other.set)
+        self._add(lambda values: self.release.wait(5) and values)
+        self.form.add_button(
+            "print",
+            "Print",
+            lambda values: other.wait(5) and values,
+            submit="thread",
+        )
+        state = self.form._widget_states
+        self.form.submit("save")
+        self.form.submit("print")
+
+        self.release.set()
+        for i in range(50):
+            if not self.form.submitting("save"):
+                break
+            self.pump(20)
+        self.assertEqual(state[("elements", "name")], "disabled")
+        self.assertEqual(state[("buttons", "print")], "disabled")
+
+        other.set()
+        self._wait()
+        self.assertEqual(state[("elements", "name")], "active")
+        self.assertEqual(state[("buttons", "save")], "active")
+        self.assertEqual(state[("buttons", "print")], "active")
+
+    def test_state_set_while_running(self):
+        self._add(lambda values: self.release.wait(5) and values)
+        self.form.submit("save")
+        self.form.set_state("only_buttons")
+        self.release.set()
+        self._wait()
+        self.assertEqual(self.form._widget_states[("elements", "name")], "disabled")
+        self.assertEqual(self.form._current_state, "only_buttons")
+
+    def test_error_in_the_tk_thread(self):
+        def command(values):
+            raise ValueError(values["name"])
+
+        self._add(command)
+        self.form.submit("save")
+        self._wait()
+        self.assertEqual([str(e) for e in self.errors], ["Ana"])
+        self.assertEqual(self.results, [])
+
+
+class ComputeTest(TkTestCase):
+    def setUp(self):
+        super().setUp()
+        self.form = FormTheme(self.root)
+        for name, value in [("price", "2"), ("qty", "3"), ("total", "")]:
+            self.form.add_entry(name, value=value)
+        self.form.compute(
+            "total", lambda price, qty: str(int(price) * int(qty)), ["price", "qty"]
+        )
+
+    def test_computed_value_is_not_an_edit(self):
+        changes = []
+        history = self.form.history()
+        self.form.add_listener(changes.append)
+
+        self.form.set_values({"qty": "4"})
+        self.form.recompute()
+        self.assertEqual(self.form.get()["total"], "8")
+        self.assertEqual(changes, [{"qty": ("3", "4")}])
+
+        history.undo()
+        self.assertEqual(self.form.get()["qty"], "3")
+        self.assertFalse(history.can_undo())
+        self.form.recompute()
+        self.assertEqual(self.form.get()["total"], "6")
+
+    def test_muted_values_computed(self):
+        navigator = self.form.navigate(
+            [{"price": "2", "qty": "3"}, {"price": "5", "qty": "5"}], prefetch=0
+        )
+        navigator.next()
+        self.pump(50)
+        self.assertEqual(self.form.get()["total"], "25")
+        self.assertFalse(self.form.changed())
+
+    def test_recompute_not_computed(self):
+        with self.assertRaises(KeyError):
+            self.form.recompute(["price"])
+
+
+class FormHistoryTest(TkTestCase):
+    def setUp(self):
+        super().setUp()
+        self.form = FormTheme(self.root)
+        self.form.add_entry("name", value="Ana")
+        self.history = self.form.history()
+
+    def test_undo_redo(self):
+        self.form.set_values({"name": "Bia"})
+        self.assertTrue(self.history.undo())
+        self.assertEqual(self.form.get()["name"], "Ana")
+        self.assertTrue(self.history.redo())
+        self.assertEqual(self.form.get()["name"], "Bia")
+        self.assertFalse(self.history.redo())
+
+    def test_snapshot_name_used_again(self):
+        history = self.history
+        history.snapshot("a")
+        self.form.set_values({"name": "Bia"})
+        history.snapshot("b")
+        self.form.set_values({"name": "Caio"})
+        history.snapshot("a")
+
+        history.restore("b")
+        self.assertEqual(self.form.get()["name"], "Bia")
+        history.restore("a")
+        self.assertEqual(self.form.get()["name"], "Caio")
+        self.assertEqual(sorted(history.snapshots()), ["a", "b"])
+
+
+class FormWizardTest(TkTestCase):
+    def test_finish_validates_every_page(self):
+        finished = []
+        wizard = FormWizard(self.root, cache_pages=1, on_finish=finished.append)
+        wizard.add_page("Client", lambda form: form.add_entry("name", required=True))
+        wizard.add_page("Address", {"items": [{"type": "entry", "name": "city"}]})
+        wizard.show(1)
+
+        # The errors are shown by HelpTheme, made for Windows
+        with patch.object(FormWizard, "_valid", return_value=False):
+            self.assertIsNone(wizard.finish())
+        self.assertEqual(wizard._index, 0)
+        self.assertEqual(finished, [])
+
+        wizard.page().set_values({"name": "Ana"})
+        self.assertEqual(wizard.finish(), {"name": "Ana", "city": ""})
+        self.assertEqual(finished, [{"name": "Ana", "city": ""}])
+
+    def test_pages_not_built(self):
+        wizard = FormWizard(self.root, cache_pages=1)
+        wizard.add_page("Client", lambda form: form.add_entry("name"))
+        wizard.add_page(
+            "Address", {"items": [{"type": "entry", "name": "city", "required": True}]}
+        )
+        wizard.add_page("Notes", lambda form: form.add_entry("notes", required=True))
+        wizard.show(0)
+
+        self.assertTrue(wizard._errors(1))
+        wizard._values["city"] = "Rio"
+        self.assertFalse(wizard._errors(1))
+        self.assertNotIn(1, wizard._forms)
+
+        # Built to be checked, and kept with cache_pages 1
+        self.assertTrue(wizard._errors(2))
+        self.assertIn(2, wizard._forms)
+        self.assertIn(0, wizard._forms)
+
+
+def _count_widgets(widget):
+    return sum(1 + _count_widgets(child) for child in widget.winfo_children())
+
+
+class FlatLayoutTest(TkTestCase):
+    def _build(self, layout):
+        form = FormTheme(self.root, layout=layout)
+        for i in range(300):
+            form.add_entry(f"field{i}", f"Field {i}: ", required=i % 2 == 0)
+            if i % 10 == 9:
+                form.add_separator()
+        return form
+
+    def test_half_the_widgets(self):
+        pack = _count_widgets(self._build("pack"))
+        flat = _count_widgets(self._build("flat"))
+        self.assertLessEqual(flat * 2, pack)
+
+    def test_side_by_side(self):
+        form = FormTheme(self.root, layout="flat")
+        form.add_entry("a", "A: ")
+        separator = form.add_separator(orient="vertical")
+        info = form.add_info("note", new_line=False)
+        form.add_entry("b", "B: ")
+        self.assertEqual(separator.grid_info()["column"], 2)
+        self.assertEqual(info.grid_info()["column"], 3)
+        self.assertEqual(form["b"]["widget"].grid_info()["column"], 1)
+
+
+class DialogManagerTest(TkTestCase):
+    def setUp(self):
+        super().setUp()
+        self.dialogs = DialogManager(self.root, prewarm_ms=0)
+        self.built = []
+
+    def _register(self, name, fail=False):
+        def build(dialog):
+            if fail:
+                raise ValueError(name)
+            self.built.append(name)
+            form = FormTheme(dialog)
+            form.add_entry("name")
+            form.pack()
+            return form
+
+        self.dialogs.register(name, build)
+
+    def test_prewarm_skips_destroyed(self):
+        self._register("a")
+        self._register("b")
+        self.dialogs.destroy("b")
+        self.pump(100)
+        self.assertEqual(self.built, ["a"])
+
+        self.dialogs.open("b", {"name": "Ana"})
+        self.assertEqual(self.dialogs.form("b").get()["name"], "Ana")
+
+    def test_failed_build_not_registered(self):
+        errors = []
+        self.root.report_callback_exception = lambda *args: errors.append(args[1])
+        self._register("a", fail=True)
+        self._register("b")
+        self.pump(100)
+
+        self.assertEqual(self.built, ["b"])
+        self.assertEqual(len(errors), 1)
+        self.assertRaises(ValueError, self.dialogs.dialog, "a")
+        self.assertNotIn("a", self.dialogs._dialogs)
+        self.assertEqual(
+            [w for w in self.root.winfo_children() if isinstance(w, tk.Toplevel)],
+            [self.dialogs.dialog("b")],
+        )
+
+
+class FormCacheTest(TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "forms.jsonl")
+        self.cache = FormCache(self.path)
+
+    def test_changes_folded(self):
+        cache = self.cache
+        cache.write("client", "values", {"name": "Ana", "city": "Rio"})
+        cache.write("client", "set", {"city": "Lima"})
+        cache.write("client", "sections", {"Address": True})
+        cache.write("other", "values", {"name": "Bia"})
+
+        self.assertEqual(
+            cache.load("client"), ({"name": "Ana", "city": "Lima"}, {"Address": True})
+        )
+        self.assertEqual(cache.load("missing"), ({}, {}))
+
+    def test_line_cut_by_a_crash(self):
+        self.cache.write("client", "values", {"name": "Ana"})
+        self.cache.flush()
+        with open(self.path, "a", encoding="utf-8") as file:
+            file.write('{"form": "client", "set": {"na')
+        self.assertEqual(self.cache.load("client"), ({"name": "Ana"}, {}))
+
+    def test_compact(self):
+        cache = self.cache
+        cache.compact_lines = 5
+        for i in range(20):
+            cache.write("client", "set", {"count": i})
+        cache.flush()
+
+        with open(self.path, encoding="utf-8") as file:
+            self.assertLessEqual(len(file.readlines()), 5)
+        self.assertEqual(cache.load("client"), ({"count": 19}, {}))
+
+    def test_close(self):
+        self.cache.write("client", "values", {"name": "Ana"})
+        writer = self.cache._writer
+        self.cache.close()
+        self.assertFalse(writer.is_alive())
+        self.assertEqual(FormCache(self.path).load("client"), ({"name": "Ana"}, {}))
+
+        self.cache.write("client", "set", {"name": "Bia"})
+        self.cache.close()
+        self.assertEqual(FormCache(self.path).load("client"), ({"name": "Bia"}, {}))
+
+    def test_clear(self):
+        self.cache.write("client", "values", {"name": "Ana"})
+        self.cache.write("other", "values", {"name": "Bia"})
+        self.cache.clear("client")
+        self.assertEqual(self.cache.load("client"), ({}, {}))
+        self.assertEqual(self.cache.load("other"), ({"name": "Bia"}, {}))
+
+        self.cache.clear()
+        self.assertFalse(os.path.exists(self.path))
+
+
+class PersistTest(TkTestCase):
+    def test_restore(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = os.path.join(directory.name, "forms.jsonl")
+
+        form = FormTheme(self.root)
+        form.add_entry("name", value="Ana")
+        form.persist(path, key="client")
+        form.set_values({"name": "Bia"})
+        form.destroy()
+
+        form = FormTheme(self.root)
+        form.add_entry("name", value="Ana")
+        form.persist(path, key="client")
+        self.assertEqual(form.get(), {"name": "Bia"})
+
+
+class _SlowRecords:
+    "Records whose second item is read only when ready is set"
+
+    def __init__(self, records):
+        self.records = records
+        self.ready = threading.Event()
+
+    def __len__(self):
+        return len(self.records)
+
+    def __getitem__(self, index):
+        if index == 1:
+            self.ready.wait(5)
+        return self.records[index]
+
+
+class RecordNavigatorTest(TkTestCase):
+    records = [{"name": "Ana"}, {"name": "Bia"}, {"name": "Caio"}]
+
+    def setUp(self):
+        super().setUp()
+        self.form = FormTheme(self.root)
+        self.form.add_entry("name")
+
+    def test_navigation_is_not_an_edit(self):
+        history = self.form.history()
+        navigator = self.form.navigate(self.records, prefetch=0)
+        navigator.next()
+        self.assertEqual(self.form.get()["name"], "Bia")
+        self.assertFalse(history.can_undo())
+        self.assertFalse(self.form.changed())
+        self.assertEqual(navigator.changes(), {})
+
+        self.form.set_values({"name": "Bianca"})
+        self.assertTrue(history.can_undo())
+        self.assertEqual(navigator.changes(), {1: {"name": "Bianca"}})
+
+        navigator.next()
+        self.assertFalse(self.form.changed())
+        navigator.previous()
+        self.assertEqual(self.form.get()["name"], "Bianca")
+        self.assertTrue(self.form.changed())
+
+    def test_collapsed_lazy_section(self):
+        form = FormTheme(self.root, lazy=True)
+        form.add_entry("name")
+        form.start_field("Address")
+        form.add_entry("city")
+        form.close_field()
+        records = [{"name": "Ana", "city": "Rio"}, {"name": "Bia", "city": "Lima"}]
+        navigator = form.navigate(records, prefetch=0)
+
+        navigator.next()
+        self.assertIsNone(form._elements["city"]["widget"])
+        form.realize()
+        self.assertEqual(form["city"]["widget"].get_value(), "Lima")
+        self.assertEqual(form.get(), {"name": "Bia", "city": "Lima"})
+        self.assertFalse(form.changed())
+
+    def test_pending_prefetch_does_not_block(self):
+        records = _SlowRecords(self.records)
+        self.addCleanup(records.ready.set)
+        navigator = self.form.navigate(records, prefetch=1)
+
+        self.assertIsNone(navigator.go(1))
+        self.assertEqual(navigator.index, 0)
+        self.assertEqual(navigator.next(), 2)
+
+        records.ready.set()
+        self.pump(200)
+        self.assertEqual(navigator.index, 2)
+        self.assertEqual(self.form.get()["name"], "Caio")
@@ -1,7 +1,24 @@
+import atexit
+import codecs
+import io
+import json
+import mmap
+import os
+import queue
 import re
+import sys
+import threading
 import time
 import tkinter as tk
-from datetime import date
+import weakref
+from bisect import bisect_left
+from calendar import Calendar, day_abbr, month_name, monthrange
+from collections import Counter, OrderedDict, deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import date, timedelta
+from functools import lru_cache, wraps
+from heapq import nlargest
 from tkinter import ttk
 from tkinter.colorchooser import askcolor
 from tkinter.filedialog import (
@@ -13,9 +30,191 @@ from tkinter.filedialog import (
 
 from PIL import Image, ImageTk
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 TKINTER_COLOR_DEFAULT = "#f0f0f0"
 
 
+class EventDispatcher:
+    """
+    Owner of the application wide bindings used by tktwid widgets.
+
+    Each sequence is bound only once per application and its events are
+    routed to the widgets that subscribed to them, so widgets that did not
+    subscribe cost nothing. Callbacks that are bound methods are kept by weak
+    reference, and the subscriptions of a widget are dropped by its <Destroy>
+    event, with the lambdas and closures that keep the widget.
+
+    Get the dispatcher of an application with EventDispatcher.of(widget).
+
+    Kinds of subscription:
+        subscribe : every event of the sequence, like bind_all
+        subscribe_pointer : events with the pointer over the widget. The
+            innermost subscribed widget is called first, a callback that
+            returns 'continue' passes the event to the next one outside
+        subscribe_toplevel : events of the widget's toplevel window itself,
+            like <Configure> when the window moves. Events of its children
+            are not sent to Python.
+    """
+
+    def __init__(self, root):
+        self._root = root
+        self._tag = f"tktwid{id(self)}"
+        self._all = {}
+        self._pointer = {}
+        self._toplevel = {}
+        self._tagged = set()
+        self._watched = set()
+
+    @classmethod
+    def of(cls, widget):
+        "Return the dispatcher of the widget's application"
+        root = widget._root()
+        # Kept by the root, it goes away with it
+        dispatcher = getattr(root, "_tktwid_dispatcher", None)
+        if dispatcher == None:
+            dispatcher = root._tktwid_dispatcher = cls(root)
+
+        return dispatcher
+
+    def _watch(self, widget):
+        path = str(widget)
+        if path not in self._watched:
+            self._watched.add(path)
+            widget.bind("<Destroy>", lambda e: self._forget(path, e), add="+")
+
+    def _entry(self, widget, callback):
+        self._watch(widget)
+        try:
+            callback = weakref.WeakMethod(callback)
+        except TypeError:
+            callback = (lambda callback: lambda: callback)(callback)
+
+        return weakref.ref(widget), callback
+
+    def _forget(self, path, event):
+        "Internal function. Drop the subscriptions of a widget destroyed"
+        # Toplevels get the <Destroy> of their children too
+        if str(event.widget) != path:
+            return
+
+        self._watched.discard(path)
+        self._tagged.discard(path)
+        for registry in (self._all, self._pointer):
+            for subscribers in registry.values():
+                subscribers.pop(path, None)
+        for toplevels in self._toplevel.values():
+            toplevels.pop(path, None)
+            for subscribers in toplevels.values():
+                subscribers.pop(path, None)
+
+    @staticmethod
+    def _alive(entry):
+        """Internal function. The callback of entry or None if the widget or
+        the callback are gone."""
+        widget, callback = entry[0](), entry[1]()
+        if widget == None or callback == None:
+            return None
+        try:
+            if not widget.winfo_exists():
+                return None
+        except tk.TclError:
+            return None
+
+        return callback
+
+    def _bind(self, registry, sequence, handler):
+        if sequence not in registry:
+            registry[sequence] = {}
+            self._root.bind_all(sequence, handler, add="+")
+
+        return registry[sequence]
+
+    def subscribe(self, sequence, widget, callback):
+        "Call callback(event) for every event of sequence while widget exists"
+        subscribers = self._bind(
+            self._all, sequence, lambda e: self._dispatch_all(sequence, e)
+        )
+        subscribers[str(widget)] = self._entry(widget, callback)
+
+    def subscribe_pointer(self, sequence, widget, callback):
+        "Call callback(event) for events of sequence with the pointer over widget"
+        subscribers = self._bind(
+            self._pointer, sequence, lambda e: self._dispatch_pointer(sequence, e)
+        )
+        subscribers[str(widget)] = self._entry(widget, callback)
+
+    def subscribe_toplevel(self, sequence, widget, callback):
+        "Call callback(event) for events of sequence in the widget's toplevel"
+        top = widget.winfo_toplevel()
+
+        if str(top) not in self._tagged:
+            self._tagged.add(str(top))
+            self._watch(top)
+            top.bindtags((self._tag,) + top.bindtags())
+
+        if sequence not in self._toplevel:
+            self._toplevel[sequence] = {}
+            self._root.bind_class(
+                self._tag, sequence, lambda e: self._dispatch_toplevel(sequence, e)
+            )
+
+        subscribers = self._toplevel[sequence].setdefault(str(top), {})
+        subscribers[str(widget)] = self._entry(widget, callback)
+
+    def unsubscribe(self, sequence, widget):
+        "Remove every subscription of widget to sequence"
+        path = str(widget)
+        self._all.get(sequence, {}).pop(path, None)
+        self._pointer.get(sequence, {}).pop(path, None)
+        for subscribers in self._toplevel.get(sequence, {}).values():
+            subscribers.pop(path, None)
+
+    def _callback(self, subscribers, path):
+        """Internal function. The callback subscribed by path, forgetting it
+        when its widget is gone."""
+        callback = self._alive(subscribers[path])
+        if callback == None:
+            del subscribers[path]
+
+        return callback
+
+    def _dispatch_all(self, sequence, event):
+        subscribers = self._all[sequence]
+        for path in list(subscribers):
+            callback = self._callback(subscribers, path)
+            if callback != None:
+                callback(event)
+
+    def _dispatch_pointer(self, sequence, event):
+        subscribers = self._pointer[sequence]
+        if not subscribers:
+            return
+
+        try:
+            widget = self._root.winfo_containing(event.x_root, event.y_root)
+        except (KeyError, tk.TclError):
+            return
+
+        while widget != None:
+            path = str(widget)
+            if path in subscribers:
+                callback = self._callback(subscribers, path)
+                if callback != None and callback(event) != "continue":
+                    return
+            widget = widget.master
+
+    def _dispatch_toplevel(self, sequence, event):
+        subscribers = self._toplevel[sequence].get(str(event.widget), {})
+        for path in list(subscribers):
+            callback = self._callback(subscribers, path)
+            if callback != None:
+                callback(event)
+
+
 class Notification(tk.Toplevel):
     def __init__(self, master, frameref=None, width=30, padx=5, pady=5, font=None):
         super(Notification, self).__init__(master)
@@ -151,19 +350,187 @@ class ToplevelCentered(tk.Toplevel):
         self.transient(master)
         self.resizable(0, 0)
 
+        # Size of the last centring, moving the window sends Configure too
+        self._size = None
         self._set_geometry()
         self.bind("<Configure>", self._set_geometry)
 
-    def _set_geometry(self, *args):
-        x = (self.winfo_screenwidth() - self.winfo_width()) // 2
-        y = (self.winfo_screenheight() - self.winfo_height()) // 2 - 30
+    def _set_geometry(self, event=None):
+        # The children send their Configure to the Toplevel binding too
+        if event != None and event.widget is not self:
+            return
+
+        if self.winfo_ismapped():
+            size = (self.winfo_width(), self.winfo_height())
+        else:
+            # A withdrawn window only has the size it asks for
+            size = (self.winfo_reqwidth(), self.winfo_reqheight())
+        if size == self._size:
+            return
+        self._size = size
+
+        x = (self.winfo_screenwidth() - size[0]) // 2
+        y = (self.winfo_screenheight() - size[1]) // 2 - 30
 
         self.geometry("+{x}+{y}".format(x=x, y=y))
 
     def set_geometry(self):
+        "Center the window again"
+        self._size = None
         self.after(100, self._set_geometry)
 
 
+class DialogManager:
+    """
+    Keep ToplevelCentered dialogs to open them many times without building
+    them again.
+
+    The dialogs registered are built one per idle pass some time after the
+    start, hidden. Closing a dialog withdraws it, and opening it resets its
+    form and shows it.
+
+    dialogs = DialogManager(root)
+    dialogs.register('client', build_client)
+    ...
+    dialogs.open('client', {'name': 'Ana'})
+
+    Args:
+        master (tk.Widget)
+        prewarm_ms (int) wait after the start before building the dialogs.
+            Default 500
+    """
+
+    def __init__(self, master, prewarm_ms=500):
+        self.master = master
+        self.prewarm_ms = prewarm_ms
+        self._builders = OrderedDict()
+        self._dialogs = {}
+        self._forms = {}
+        # Not built by the prewarm, destroyed or failed to build
+        self._skipped = set()
+        self._prewarm_job = None
+        self._started = False
+
+    def register(self, name, build, title=None):
+        """
+        Args:
+            name (str) name of the dialog
+            build (function) build(dialog) creates the widgets in the
+                ToplevelCentered dialog and returns its FormTheme, or None
+            title (str) title of the dialog
+        """
+        assert name not in self._builders, f"Dialog -{name} already registered!"
+        self._builders[name] = (build, title)
+        self._schedule_prewarm()
+
+    def _schedule_prewarm(self):
+        if self._prewarm_job == None:
+            delay = 1 if self._started else self.prewarm_ms
+            self._prewarm_job = self.master.after(delay, self._wait_idle)
+
+    def _wait_idle(self):
+        self._prewarm_job = self.master.after_idle(self._prewarm)
+
+    def _prewarm(self):
+        """Internal function. Build one dialog, the next one waits for the
+        events pending to keep the application responsive."""
+        self._started = True
+        self._prewarm_job = None
+        for name in self._builders:
+            if name not in self._dialogs and name not in self._skipped:
+                try:
+                    self._build(name)
+                except Exception as e:
+                    # Built again when opened, the others are still built
+                    self._skipped.add(name)
+                    self.master._root().report_callback_exception(
+                        type(e), e, e.__traceback__
+                    )
+                break
+        else:
+            return
+
+        self._schedule_prewarm()
+
+    def _build(self, name):
+        build, title = self._builders[name]
+        dialog = ToplevelCentered(self.master)
+        # Before the first idle pass, so it is never shown
+        dialog.withdraw()
+        if title != None:
+            dialog.title(title)
+        dialog.protocol("WM_DELETE_WINDOW", lambda: self.close(name))
+
+        try:
+            form = build(dialog)
+        except Exception:
+            dialog.destroy()
+            raise
+
+        self._dialogs[name] = dialog
+        self._forms[name] = form
+        self._skipped.discard(name)
+        return dialog
+
+    def dialog(self, name):
+        "Return the dialog name, building it if it is not ready"
+        dialog = self._dialogs.get(name)
+        if dialog == None:
+            dialog = self._build(name)
+        return dialog
+
+    def form(self, name):
+        self.dialog(name)
+        return self._forms[name]
+
+    def open(self, name, values=None, default_values=True):
+        """
+        Reset the form of the dialog name and show it.
+
+        Args:
+            values (dict) values set after the reset, like {'element_name': value}
+            default_values (bool) reset to the default values, see FormTheme.reset
+        """
+        dialog = self.dialog(name)
+        form = self._forms[name]
+        if form != None:
+            form.reset(default_values)
+            if values:
+                form.set_values(values)
+
+        dialog.update_idletasks()
+        dialog._set_geometry()
+        dialog.deiconify()
+        dialog.lift()
+        dialog.focus_set()
+        return dialog
+
+    def close(self, name):
+        "Hide the dialog name, it is kept to be opened again"
+        dialog = self._dialogs.get(name)
+        if dialog != None:
+            dialog.withdraw()
+
+    def is_open(self, name):
+        dialog = self._dialogs.get(name)
+        return dialog != None and dialog.winfo_viewable() == 1
+
+    def destroy(self, name=None):
+        """Destroy the dialog name, or every dialog. They are built again when
+        opened, not by the prewarm."""
+        names = [name] if name != None else list(self._builders)
+        for key in names:
+            self._skipped.add(key)
+            dialog = self._dialogs.pop(key, None)
+            self._forms.pop(key, None)
+            if dialog != None:
+                dialog.destroy()
+
+        if name == None and self._prewarm_job != None:
+            self.master.after_cancel(self._prewarm_job)
+            self._prewarm_job = None
+
+
 class ProgressTopMostTheme(tk.Toplevel):
     def __init__(self, master, text, *args, **kw):
         super(ProgressTopMostTheme, self).__init__(master, *args, **kw)
@@ -288,7 +655,7 @@ class HelpTheme(tk.Toplevel):
             ipadx=self._configs["padding"], ipady=self._configs["padding"], side="left"
         )
 
-        self.bind_all("<Button-1>", lambda e: self.destroy())
+        EventDispatcher.of(self).subscribe("<Button-1>", self, lambda e: self.destroy())
         self.after(10, self._set_geometry)
         self.after(7000, self.destroy)
 
@@ -387,6 +754,402 @@ class _MenuTheme(tk.Menu):
         return name
 
 
+class PrefixIndex:
+    """
+    A sorted-array index over a vocabulary used by EntryTheme autocomplete.
+
+    The index is built once and can be shared by any number of entries, see
+    PrefixIndex.shared. Prefix searches are a binary search plus a slice, so
+    they stay fast with vocabularies of millions of items.
+
+    Args:
+        items (iterable) The vocabulary, items are converted to str
+
+    Options:
+        ignore_case (bool) Match without case. Default True
+        ngram (int) Size of the n-grams indexed for 'substring' and 'fuzzy'
+            searches. None (default) builds only the prefix index
+        background (bool) Build the index in a thread. Searches return an
+            empty list until the index is ready. Default False
+    """
+
+    _shared = {}
+    # Items scored by a fuzzy search at most
+    fuzzy_candidates = 2000
+
+    def __init__(self, items, ignore_case=True, ngram=None, background=False):
+        self.ignore_case = ignore_case
+        self.ngram = ngram
+
+        self._keys = []
+        self._values = []
+        self._grams = {}
+        self._ready = threading.Event()
+
+        if background:
+            threading.Thread(target=self._build, args=(items,), daemon=True).start()
+        else:
+            self._build(items)
+
+    def __len__(self):
+        return len(self._keys)
+
+    @classmethod
+    def shared(cls, name, items=None, **kw):
+        """Return the index registered as name, building it with items the
+        first time it is requested. Options are the same as PrefixIndex."""
+        if name not in cls._shared:
+            if items == None:
+                raise (KeyError(f"index -{name} not built yet!"))
+            cls._shared[name] = cls(items, **kw)
+
+        return cls._shared[name]
+
+    def _normalize(self, text):
+        return text.lower() if self.ignore_case else text
+
+    def _build(self, items):
+        pairs = sorted({(self._normalize(str(item)), str(item)) for item in items})
+        keys = [key for key, _ in pairs]
+        values = [value for _, value in pairs]
+
+        grams = {}
+        if self.ngram:
+            n = self.ngram
+            for i, key in enumerate(keys):
+                for gram in {key[j : j + n] for j in range(max(len(key) - n + 1, 1))}:
+                    grams.setdefault(gram, []).append(i)
+
+        # Published at once so a search never sees a half built index
+        self._keys, self._values, self._grams = keys, values, grams
+        self._ready.set()
+
+    def _grams_of(self, key):
+        n = self.ngram
+        return {key[j : j + n] for j in range(len(key) - n + 1)}
+
+    def ready(self):
+        "Return True when the index can be searched"
+        return self._ready.is_set()
+
+    def wait(self, timeout=None):
+        "Block until the index is ready. Return False on timeout"
+        return self._ready.wait(timeout)
+
+    def search(self, text, limit=10, mode="prefix"):
+        """Return up to limit items matching text.
+
+        Args:
+            text (str)
+            limit (int) top-k items to return
+            mode (str) 'prefix', 'substring' or 'fuzzy'. 'substring' and
+                'fuzzy' need the ngram option, otherwise 'prefix' is used.
+        """
+        if not self._ready.is_set() or text == "":
+            return []
+
+        key = self._normalize(text)
+
+        if mode == "prefix" or not self.ngram or len(key) < self.ngram:
+            return self._search_prefix(key, limit)
+        elif mode == "substring":
+            return self._search_substring(key, limit)
+        elif mode == "fuzzy":
+            return self._search_fuzzy(key, limit)
+        else:
+            raise (AttributeError(f"mode -{mode} not valid!"))
+
+    def _search_prefix(self, key, limit):
+        keys = self._keys
+        start = bisect_left(keys, key)
+        result = []
+        for i in range(start, min(start + limit, len(keys))):
+            if not keys[i].startswith(key):
+                break
+            result.append(self._values[i])
+
+        return result
+
+    def _search_substring(self, key, limit):
+        postings = [self._grams.get(gram, ()) for gram in self._grams_of(key)]
+        keys = self._keys
+        result = []
+        # Candidates come from the rarest gram and are confirmed one by one
+        for i in min(postings, key=len):
+            if key in keys[i]:
+                result.append(self._values[i])
+                if len(result) >= limit:
+                    break
+
+        return result
+
+    def _search_fuzzy(self, key, limit):
+        postings = sorted(
+            (self._grams[gram] for gram in self._grams_of(key) if gram in self._grams),
+            key=len,
+        )
+
+        # Candidates come from the rarest grams, the items sharing most grams
+        # with the text are in them. The common grams only add to the scores.
+        candidates = set()
+        for posting in postings:
+            candidates.update(posting[: self.fuzzy_candidates - len(candidates)])
+            if len(candidates) >= self.fuzzy_candidates:
+                break
+
+        scores = Counter()
+        for posting in postings:
+            if len(posting) <= len(candidates):
+                scores.update(i for i in posting if i in candidates)
+                continue
+            # Postings are sorted, long ones are searched for each candidate
+            for i in candidates:
+                j = bisect_left(posting, i)
+                if j < len(posting) and posting[j] == i:
+                    scores[i] += 1
+
+        keys = self._keys
+        best = nlargest(
+            limit, scores.items(), key=lambda item: (item[1], -len(keys[item[0]]))
+        )
+        return [self._values[i] for i, _ in best]
+
+
+class MaskFormatter:
+    """
+    A compiled EntryTheme mask, usable alone to format or validate values.
+
+    Use '9' for numerical, 'a' for alpha and '*' for alphanumerical input,
+    other characters are written as they are. Ex.: '+ 99 (99) 99999-9999'.
+
+    Values are formatted like the EntryTheme would show them when typed: mask
+    characters in the value are ignored, invalid characters are skipped and
+    the result stops at the last input filled. format_many and validate_many
+    work on whole sequences and use NumPy, when it is installed, for the
+    values that fill every input of the mask.
+
+    Args:
+        mask (str)
+    """
+
+    _classes = {
+        "9": "0123456789",
+        "a": "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ",
+        "*": "0123456789abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ",
+    }
+    _cache = {}
+
+    def __init__(self, mask):
+        self.mask = mask
+        self.indexes = {}
+        self.slots = []
+
+        literals = set()
+        for i, c in enumerate(mask):
+            if c in self._classes:
+                self.indexes[i] = {
+                    "input": True,
+                    "pattern": re.compile(f"[{self._classes[c]}]"),
+                    "caractere": None,
+                }
+                self.slots.append(i)
+            else:
+                self.indexes[i] = {"input": False, "pattern": None, "caractere": c}
+                literals.add(c)
+
+        self.literals = literals
+        self.width = len(self.slots)
+
+        self._strip = str.maketrans("", "", "".join(literals))
+        self._allowed = [frozenset(self._classes[mask[i]]) for i in self.slots]
+
+        self._end = end = self.slots[-1] + 1 if self.slots else 0
+        self._template = "".join(
+            "{}" if c in self._classes else c.replace("{", "{{").replace("}", "}}")
+            for c in mask[:end]
+        )
+        self._raw = re.compile(
+            "".join(f"[{self._classes[mask[i]]}]" for i in self.slots)
+        )
+        self._formatted = re.compile(
+            "".join(
+                f"[{self._classes[c]}]" if c in self._classes else re.escape(c)
+                for c in mask[:end]
+            )
+        )
+
+    @classmethod
+    def of(cls, mask):
+        "Return the formatter compiled for mask, compiling it only once"
+        formatter = cls._cache.get(mask)
+        if formatter == None:
+            formatter = cls._cache[mask] = cls(mask)
+        return formatter
+
+    def format(self, value):
+        "Format value with the mask"
+        value = str(value).translate(self._strip)
+
+        if self._raw.fullmatch(value) != None:
+            return self._template.format(*value)
+
+        result = []
+        slot = 0
+        for c in value:
+            if slot >= self.width:
+                break
+            if c in self._allowed[slot]:
+                position = self.slots[slot]
+                start = self.slots[slot - 1] + 1 if slot else 0
+                result.append(self.mask[start:position])
+                result.append(c)
+                slot += 1
+
+        return "".join(result)
+
+    def validate(self, value):
+        "Return True if value is a complete value formatted with the mask"
+        return self._formatted.fullmatch(str(value)) != None
+
+    def format_many(self, values):
+        "Format a sequence of values. Return a list"
+        values = [v if isinstance(v, str) else str(v) for v in values]
+
+        if np != None and self.width and len(values) > 1:
+            return self._format_numpy(values)
+
+        return [self.format(value) for value in values]
+
+    def validate_many(self, values):
+        "Validate a sequence of values. Return a list of bool"
+        match = self._formatted.fullmatch
+        return [match(v if isinstance(v, str) else str(v)) != None for v in values]
+
+    def _valid_codes(self, codes):
+        """Internal function. Rows of a (n, width) array of unicode code
+        points with every column accepted by its input."""
+        valid = np.ones(len(codes), dtype=bool)
+        for column, position in enumerate(self.slots):
+            c = codes[:, column]
+            kind = self.mask[position]
+            digit = (c >= 48) & (c <= 57)
+            alpha = ((c >= 65) & (c <= 90)) | ((c >= 97) & (c <= 122))
+            if kind == "9":
+                valid &= digit
+            elif kind == "a":
+                valid &= alpha
+            else:
+                valid &= digit | alpha
+        return valid
+
+    def _format_numpy(self, values):
+        """Internal function. Values that fill exactly every input are
+        formatted at once, the others one by one."""
+        raw = [value.translate(self._strip) for value in values]
+        fast = np.fromiter(
+            (len(value) == self.width for value in raw), dtype=bool, count=len(raw)
+        )
+
+        codes = np.array(raw, dtype=f"<U{self.width}").view(np.uint32)
+        codes = codes.reshape(len(raw), self.width)
+        fast &= self._valid_codes(codes)
+
+        out = np.empty((len(raw), self._end), dtype=np.uint32)
+        out[:] = [ord(c) for c in self.mask[: self._end]]
+        out[:, self.slots] = codes
+
+        result = out.view(f"<U{self._end}").ravel().tolist()
+        for i in np.flatnonzero(~fast).tolist():
+            result[i] = self.format(values[i])
+
+        return result
+
+
+class _AutocompleteDropdown(tk.Toplevel):
+    """Internal class. A listbox popup shared by the autocomplete entries of a
+    toplevel. It is created on first use and only refilled and moved after."""
+
+    def __init__(self, master):
+        super(_AutocompleteDropdown, self).__init__(master)
+        self.overrideredirect(True)
+        self.transient(master)
+        self.withdraw()
+
+        self._entry = None
+
+        self.listbox = tk.Listbox(
+            self,
+            selectmode=tk.SINGLE,
+            exportselection=0,
+            takefocus=False,
+            activestyle="none",
+            bd=1,
+            relief=tk.SOLID,
+        )
+        self.listbox.pack(fill="both", expand=True)
+        self.listbox.bind("<ButtonRelease-1>", self._choose)
+
+    @classmethod
+    def of(cls, widget):
+        "Return the dropdown of the widget's toplevel"
+        top = widget.winfo_toplevel()
+        # Kept by the toplevel, it goes away with it
+        dropdown = getattr(top, "_autocomplete_dropdown", None)
+        if dropdown == None or not dropdown.winfo_exists():
+            dropdown = top._autocomplete_dropdown = cls(top)
+
+        return dropdown
+
+    def owner(self):
+        "The entry showing the dropdown or None when hidden"
+        return self._entry
+
+    def show(self, entry, items):
+        if not items:
+            self.hide()
+            return
+
+        self._entry = entry
+
+        self.listbox.delete(0, "end")
+        self.listbox.insert(0, *items)
+        self.listbox.configure(height=len(items), width=entry.cget("width"))
+
+        self.geometry(
+            "+{}+{}".format(
+                entry.winfo_rootx(), entry.winfo_rooty() + entry.winfo_height()
+            )
+        )
+        self.deiconify()
+        self.lift()
+
+    def hide(self, entry=None):
+        if entry != None and entry is not self._entry:
+            return
+        self._entry = None
+        self.withdraw()
+
+    def move(self, step):
+        size = self.listbox.size()
+        selection = self.listbox.curselection()
+        index = (selection[0] + step) if selection else (0 if step > 0 else size - 1)
+        index = max(0, min(index, size - 1))
+
+        self.listbox.select_clear(0, "end")
+        self.listbox.select_set(index)
+        self.listbox.activate(index)
+        self.listbox.see(index)
+
+    def _choose(self, *args):
+        selection = self.listbox.curselection()
+        if self._entry == None or not selection:
+            return False
+
+        self._entry.set_autocomplete(self.listbox.get(selection[0]))
+        self.hide()
+        return True
+
+
 class EntryTheme(ttk.Entry):
     """
     A custom ttk.Entry widget with pre implemented actions like upper, placeholder
@@ -405,6 +1168,10 @@ class EntryTheme(ttk.Entry):
         mask : Mask to write in entry. Use '9' for numerical ,'a' for alpha,
         '*' for alphanumerical. Exemplo : 99/99/9999.
         callback : A function to run and format entry content
+        autocomplete : A PrefixIndex (or a list of values) to suggest values from.
+        Share one PrefixIndex between entries with the same vocabulary.
+        autocomplete_mode : 'prefix', 'substring' or 'fuzzy'. Default 'prefix'
+        autocomplete_limit : Number of suggestions showed. Default 10
     """
 
     def __init__(self, master, *args, **kw):
@@ -417,17 +1184,27 @@ class EntryTheme(ttk.Entry):
             "mask": None,
             "maxlength": None,
             "callback": None,
+            "autocomplete": None,
+            "autocomplete_mode": "prefix",
+            "autocomplete_limit": 10,
         }
         self._configs_update(kw)
 
+        self._muted = False
+        self._missed = False
+
         vcmd = (master.register(self._on_validate), "%d", "%i", "%P", "%s", "%S")
 
+        # Variable of the text, traced by forms to follow the value
+        self.value = kw.pop("textvariable", None) or tk.StringVar(master)
+
         # Constructor of super class
         super(EntryTheme, self).__init__(
             master,
             font=self._configs["font"],
             validate="key",
             validatecommand=vcmd,
+            textvariable=self.value,
             *args,
             **kw,
         )
@@ -446,6 +1223,18 @@ class EntryTheme(ttk.Entry):
 
         self.bind("<KeyRelease>", self._all_upper)
 
+        if self._configs["autocomplete"] != None:
+            self._autocomplete_job = None
+            self._autocomplete_hide_job = None
+            self._autocomplete_text = None
+            self.bind("<KeyRelease>", self._autocomplete_schedule, True)
+            self.bind("<Down>", lambda e: self._autocomplete_move(1))
+            self.bind("<Up>", lambda e: self._autocomplete_move(-1))
+            self.bind("<Return>", self._autocomplete_choose, True)
+            self.bind("<Escape>", self._autocomplete_hide, True)
+            self.bind("<FocusOut>", self._autocomplete_hide, True)
+            self.bind("<Destroy>", self._autocomplete_cancel, True)
+
     def _configs_update(self, kw):
         # attributes
         self._index = 0
@@ -487,6 +1276,11 @@ class EntryTheme(ttk.Entry):
         if self._configs["mask"] != None:
             self._list_index()
 
+        if self._configs["autocomplete"] != None and not isinstance(
+            self._configs["autocomplete"], PrefixIndex
+        ):
+            self._configs["autocomplete"] = PrefixIndex(self._configs["autocomplete"])
+
         if self._configs["maxlength"] != None and not isinstance(
             self._configs["maxlength"], int
         ):
@@ -497,23 +1291,9 @@ class EntryTheme(ttk.Entry):
             )
 
     def _list_index(self):
-        for i in range(0, len(self._configs["mask"])):
-            temp = {}
-            if self._configs["mask"][i] == "9":
-                temp.update(input=True, pattern=r"[0-9]", caractere=None)
-                self._indexes[i] = temp
-            elif self._configs["mask"][i] == "a":
-                temp.update(input=True, pattern=r"[a-z,A-Z]", caractere=None)
-                self._indexes[i] = temp
-            elif self._configs["mask"][i] == "*":
-                temp.update(input=True, pattern=r"[a-z,A-Z,0-9]", caractere=None)
-                self._indexes[i] = temp
-            else:
-                temp.update(
-                    input=False, pattern=None, caractere=self._configs["mask"][i]
-                )
-                self._indexes[i] = temp
-                self._caracteres.add(self._configs["mask"][i])
+        self._formatter = MaskFormatter.of(self._configs["mask"])
+        self._indexes = self._formatter.indexes
+        self._caracteres = self._formatter.literals
 
     def _on_validate(self, d, i, P, s, S, *args):
         """
@@ -641,10 +1421,68 @@ class EntryTheme(ttk.Entry):
                 self.config(foreground="red")
                 if not self._by_char and self.get() != "":
                     self._by_char = True
-                    self.bind("<KeyRelease>", self._validate_pattern)
+                    self.bind("<KeyRelease>", self._validate_pattern, True)
             else:
                 self.config(foreground="")
 
+    def _autocomplete_schedule(self, *args):
+        # Keystrokes arriving together are answered with a single search
+        if self._autocomplete_job == None:
+            self._autocomplete_job = self.after_idle(self._autocomplete)
+
+    def _autocomplete(self):
+        self._autocomplete_job = None
+
+        text = self.get_value()
+        if text == self._autocomplete_text:
+            return
+        self._autocomplete_text = text
+
+        items = self._configs["autocomplete"].search(
+            text,
+            limit=self._configs["autocomplete_limit"],
+            mode=self._configs["autocomplete_mode"],
+        )
+        _AutocompleteDropdown.of(self).show(self, items)
+
+    def _autocomplete_move(self, step):
+        dropdown = _AutocompleteDropdown.of(self)
+        if dropdown.owner() is self:
+            dropdown.move(step)
+            return "break"
+
+    def _autocomplete_choose(self, *args):
+        dropdown = _AutocompleteDropdown.of(self)
+        if dropdown.owner() is self and dropdown._choose():
+            return "break"
+
+    def _autocomplete_hide(self, *args):
+        # Delayed, so a click in the dropdown is handled before it hides
+        if self._autocomplete_hide_job == None:
+            self._autocomplete_hide_job = self.after(150, self._autocomplete_hidden)
+
+    def _autocomplete_hidden(self):
+        self._autocomplete_hide_job = None
+        _AutocompleteDropdown.of(self).hide(self)
+
+    def _autocomplete_cancel(self, event):
+        if event.widget is not self:
+            return
+        for job in (self._autocomplete_job, self._autocomplete_hide_job):
+            if job != None:
+                self.after_cancel(job)
+        self._autocomplete_job = self._autocomplete_hide_job = None
+
+        dropdown = getattr(self.winfo_toplevel(), "_autocomplete_dropdown", None)
+        if dropdown != None and dropdown.winfo_exists():
+            dropdown.hide(self)
+
+    def set_autocomplete(self, value):
+        "Set a value chosen from the suggestions"
+        self._autocomplete_text = value
+        self.set_value(value)
+        self.icursor("end")
+
     def insert(self, index, text, validate=True):
         "Insert text at index validating when required"
         self._should_validate = validate
@@ -667,8 +1505,54 @@ class EntryTheme(ttk.Entry):
     def get_value(self):
         return self.get() if not self._has_placeholder else ""
 
+    def mute(self):
+        "Set values without validation and callback until unmute"
+        self._muted = True
+
+    def unmute(self):
+        "Run the callback once if values were set while muted"
+        self._muted = False
+        if self._missed:
+            self._missed = False
+            if self._configs["callback"] != None:
+                self._configs["callback"](self)
+
+    def _set_quiet(self, value):
+        "Internal function. Set value with the validation off"
+        self._missed = True
+        self.configure(validate="none")
+        try:
+            if self._has_placeholder:
+                self._remove_placeholder()
+            super().delete(0, "end")
+
+            if value != None and value != "":
+                if self._configs["mask"] != None:
+                    value = self._formatter.format(value)
+                    self._index = len(value)
+                super().insert(0, value)
+            elif self._configs["placeholder"] != None:
+                self._put_placeholder()
+        finally:
+            self._should_validate = True
+            self.configure(validate="key")
+
     def set_value(self, value):
+        if self._muted:
+            self._set_quiet(value)
+            return
+
         self.delete(0, "end")
+
+        if self._configs["mask"] != None and value != None and value != "":
+            # Formatted at once instead of character by character
+            if self._has_placeholder:
+                self._remove_placeholder()
+            value = self._formatter.format(value)
+            self.insert("0", value, False)
+            self._index = len(value)
+            return
+
         self.insert("0", value)
 
     def get_config(self, config):
@@ -794,6 +1678,8 @@ class OptionMenuTheme(ttk.OptionMenu):
         )
 
         self.command = callback
+        self._muted = False
+        self._missed = False
 
         ttk.Style(self).configure("MyTheme.TMenubutton", font=self._configs["font"])
         self.configure(
@@ -805,8 +1691,22 @@ class OptionMenuTheme(ttk.OptionMenu):
     def _call(self, *args):
         if self.value.get == "":
             return
+        if self._muted:
+            self._missed = True
+            return
         self.command()
 
+    def mute(self):
+        "Set values without callback until unmute"
+        self._muted = True
+
+    def unmute(self):
+        "Run the callback once if values were set while muted"
+        self._muted = False
+        if self._missed:
+            self._missed = False
+            self._call()
+
     def _populate(self, items):
         if isinstance(items, dict):
             if self._configs["upper"]:
@@ -927,6 +1827,8 @@ class CheckButtonTheme(ttk.Checkbutton):
 
         self.value = tk.BooleanVar(master)
         self._command = callback
+        self._muted = False
+        self._missed = False
         self.value.trace_variable("w", self._callback)
 
         super(CheckButtonTheme, self).__init__(
@@ -935,9 +1837,22 @@ class CheckButtonTheme(ttk.Checkbutton):
         self.active()
 
     def _callback(self, *args):
-        if self._command != None:
+        if self._muted:
+            self._missed = True
+        elif self._command != None:
             self._command(self)
 
+    def mute(self):
+        "Set values without callback until unmute"
+        self._muted = True
+
+    def unmute(self):
+        "Run the callback once if values were set while muted"
+        self._muted = False
+        if self._missed:
+            self._missed = False
+            self._callback()
+
     def set_style(self, bg, fg, name="CBT"):
         """
         Method for configure a basic Style
@@ -1142,225 +2057,1026 @@ class PickerTheme(ttk.Frame):
         root.mainloop()
 
 
-class SimpleCalendar(ttk.Entry):
-    """Simple calendar
+class TextareaTheme(ttk.Frame):
+    """
+    A multi line text field with a vertical scrollbar, made for big documents.
+
+    Files are inserted in chunks by idle callbacks, so the interface keeps
+    responding while tens of megabytes are loaded. Read only files are memory
+    mapped. The value is cached while the text is not modified, so get_value
+    does not copy the whole document on every call.
 
     Args:
-        master
+        master (tk.Widget)
 
     Options:
-        'name_buttons' (list) default == ['Ok', 'Cancel']
-        'name_head' (list) default == ['Day', 'Month', 'Year']
-        'font' (tuple) default == ("arial", 10, "normal") see tkinter fonts
-        'format' (str) Use 'yyyy' for year, 'mm' for month and 'dd' for day. Default == 'yyyy-mm-dd'
-        'first_year' (int) defaul == 1970
-        'last_year' (int) defaul == 2030
+        font (tuple) like ('arial', 10, 'normal')
+        width (int) width in characters
+        height (int) height in lines
+        wrap (str) 'none', 'char' or 'word'
+        chunk_size (int) characters inserted by each idle callback
+        encoding (str) encoding used to read files
     """
 
     def __init__(self, master, *args, **kw):
-        self._optns = {
-            "name_buttons": ["Ok", "Cancel"],
-            "name_head": ["Day", "Month", "Year"],
+        self._configs = {
             "font": ("arial", 10, "normal"),
-            "format": "yyyy-mm-dd",
-            "first_year": 1970,
-            "last_year": 2030,
+            "width": 40,
+            "height": 6,
+            "wrap": "word",
+            "chunk_size": 256 * 1024,
+            "encoding": "utf-8",
         }
-        for key in self._optns.keys():
-            if key in kw.keys():
-                self._optns[key] = kw.pop(key)
+        for key in list(kw.keys()):
+            if key in self._configs:
+                self._configs[key] = kw.pop(key)
 
-        self.value = tk.StringVar()
+        super(TextareaTheme, self).__init__(master, *args, **kw)
 
-        vcmd = (master.register(self._on_keypress), "%d")
+        self.text = tk.Text(
+            self,
+            font=self._configs["font"],
+            width=self._configs["width"],
+            height=self._configs["height"],
+            wrap=self._configs["wrap"],
+        )
+        self._vsb = ttk.Scrollbar(self, orient="vertical", command=self.text.yview)
+        self.text.configure(yscrollcommand=self._vsb.set)
+
+        self._vsb.pack(side="right", fill="y")
+        self.text.pack(side="left", fill="both", expand=True)
+
+        self._value = ""
+        self._dirty = False
+        self._readonly = False
+        self._disabled = False
+        self._source = None
+        self._chunks = None
+        self._loading = None
+
+        self.text.bind("<<Modified>>", self._on_modified)
+
+    def _on_modified(self, *args):
+        # Resetting the flag makes Tk report the next modification too
+        if self.text.edit_modified() and self._chunks == None:
+            self._dirty = True
+            self._value = None
+            self.text.edit_modified(False)
+
+    def _close_source(self):
+        if self._loading != None:
+            self.after_cancel(self._loading)
+            self._loading = None
+        if self._chunks != None:
+            self._chunks.close()
+            self._chunks = None
+        if self._source != None:
+            self._source.close()
+            self._source = None
+
+    def _read_mapped(self, source):
+        size = self._configs["chunk_size"]
+        decoder = io.IncrementalNewlineDecoder(
+            codecs.getincrementaldecoder(self._configs["encoding"])("replace"), True
+        )
+        for start in range(0, len(source), size):
+            yield decoder.decode(source[start : start + size])
+        yield decoder.decode(b"", final=True)
+
+    def _read_file(self, path):
+        size = self._configs["chunk_size"]
+        with open(path, encoding=self._configs["encoding"], errors="replace") as f:
+            chunk = f.read(size)
+            while chunk:
+                yield chunk
+                chunk = f.read(size)
+
+    def _load_chunk(self):
+        self._loading = None
+        try:
+            chunk = next(self._chunks)
+        except StopIteration:
+            self._chunks = None
+            self._show_state()
+            self.text.edit_modified(False)
+            self.event_generate("<<Loaded>>")
+            return
 
-        super(SimpleCalendar, self).__init__(
-            master,
-            font=self._optns["font"],
-            textvariable=self.value,
-            validatecommand=vcmd,
-            validate="key",
-            *args,
-            **kw,
+        self.text.configure(state=tk.NORMAL)
+        self.text.insert("end-1c", chunk)
+        # Not editable until the end, edits would be mixed with the chunks
+        self.text.configure(state=tk.DISABLED)
+        self._loading = self.after_idle(self._load_chunk)
+
+    def _show_state(self):
+        editable = not (self._readonly or self._disabled or self.loading())
+        self.text.configure(
+            state=tk.NORMAL if editable else tk.DISABLED,
+            cursor="xterm" if editable else "arrow",
         )
 
-        self._date = date.today()
-        self._calendar = None
-        self._calendar_monted = False
+    def load(self, path, readonly=None):
+        """Load a file in chunks during idle time. A virtual event <<Loaded>>
+        is generated when all the file is in the widget, the text can not be
+        edited before.
 
-        self.bind("<Button>", lambda e: self._build(e))
-        self.bind_all("<Configure>", lambda e: self._position(e))
+        Args:
+            path (str) file path
+            readonly (bool) Memory map the file and disable editing. Default
+                None that means True when the file can not be written.
+        """
+        self._close_source()
 
-    def _on_keypress(self, *args):
-        self.icursor(0)
-        return False
+        if readonly == None:
+            readonly = not os.access(path, os.W_OK)
+        self._readonly = readonly
 
-    def _position(self, e=None):
-        if self._calendar_monted:
-            try:
-                self._calendar.geometry(
-                    "+{}+{}".format(
-                        self.winfo_rootx(), self.winfo_rooty() + self.winfo_height()
-                    )
-                )
-            except:
-                pass
+        self.text.configure(state=tk.NORMAL)
+        self.text.delete("1.0", "end")
 
-    def _close_or_not(self, e):
-        if not self._calendar_monted:
-            return
+        if readonly and os.path.getsize(path) > 0:
+            with open(path, "rb") as f:
+                self._source = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self._chunks = self._read_mapped(self._source)
         else:
-            x1 = self._calendar.winfo_rootx()
-            y1 = self._calendar.winfo_rooty()
-            x2 = x1 + self._calendar.winfo_width()
-            y2 = y1 + self._calendar.winfo_height()
-            if not (
-                (e.x_root > x1)
-                and (e.x_root < x2)
-                and (e.y_root > y1)
-                and (e.y_root < y2)
-            ):
-                self._calendar.destroy()
-                self._calendar.unbind_all("<Button>")
-                self._calendar_monted = False
+            self._chunks = self._read_file(path)
 
-        self.icursor(0)
-        self.focus_displayof()
+        self._value = None
+        self._dirty = False
+        self._load_chunk()
 
-    def _build(self, e):
-        if str(self["state"]) == tk.DISABLED:
-            return
+    def finish_loading(self):
+        "Insert at once what is still waiting to be loaded"
+        while self._chunks != None:
+            if self._loading != None:
+                self.after_cancel(self._loading)
+            self._load_chunk()
 
-        if self._calendar_monted:
-            self.icursor(0)
-            self._calendar.lift()
-            return
+    def loading(self):
+        "Return True while a file is being loaded"
+        return self._chunks != None
 
-        self._calendar = tk.Toplevel(self)
+    def is_dirty(self):
+        "Return True if the text was edited since the last load or set_value"
+        return self._dirty
 
-        self._calendar.overrideredirect(True)
-        self._calendar.bind_all("<Button>", lambda e: self._close_or_not(e))
+    def mark_clean(self):
+        self._dirty = False
 
-        frame_with_border = FrameTheme(self._calendar, relief=tk.RIDGE, borderwidth=2)
-        frame_with_border.pack()
+    def get_value(self):
+        if self._value == None:
+            if self._source != None and not self._dirty:
+                self._value = "".join(self._read_mapped(self._source))
+            else:
+                self.finish_loading()
+                self._value = self.text.get("1.0", "end-1c")
+
+        return self._value
+
+    def set_value(self, value):
+        self._close_source()
+        self._readonly = False
+
+        value = "" if value == None else str(value)
+
+        self.text.configure(state=tk.NORMAL)
+        self.text.delete("1.0", "end")
+        self.text.insert("1.0", value)
+        self.text.edit_modified(False)
+        self._show_state()
+
+        self._value = value
+        self._dirty = False
+
+    def active(self):
+        self._disabled = False
+        self._show_state()
+
+    def disable(self):
+        self._disabled = True
+        self._show_state()
+
+    def destroy(self):
+        self._close_source()
+        super().destroy()
+
+    @staticmethod
+    def how_it_works():
+        root = tk.Tk()
+        textarea = TextareaTheme(root, height=30, width=100)
+        textarea.pack(fill="both", expand=True)
+        textarea.load(__file__, readonly=True)
+        textarea.bind(
+            "<<Loaded>>", lambda e: print(len(textarea.get_value()), "characters")
+        )
+        root.mainloop()
+
+
+class LogConsoleTheme(ttk.Frame):
+    """
+    A read only console that shows the last lines of a log.
 
-        frame_with_border.bind("<Configure>", lambda e: self._position(e))
+    Lines are kept in a ring buffer and written to the screen with a single
+    insert per frame, whatever the number of lines appended in between. The
+    oldest lines are trimmed in bulk and a file can be followed by a reader
+    thread.
+
+    Args:
+        master (tk.Widget)
+
+    Options:
+        font (tuple) like ('courier', 9, 'normal')
+        width (int) width in characters
+        height (int) height in lines
+        max_lines (int) lines kept in the console. Default 5000
+        frame_ms (int) time in ms between two screen updates. Default 16
+        idle_ms (int) time in ms between two checks for new lines when none
+            came in the last frame. Default 100
+        levels (dict) level name: color used to show lines of that level
+        detect_level (bool) find the level in the text of lines appended
+            without one. Default True
+    """
+
+    _level_pattern = re.compile(r"\b(DEBUG|INFO|WARNING|ERROR|CRITICAL)\b")
+
+    def __init__(self, master, *args, **kw):
+        self._configs = {
+            "font": ("courier", 9, "normal"),
+            "width": 80,
+            "height": 15,
+            "max_lines": 5000,
+            "frame_ms": 16,
+            "idle_ms": 100,
+            "levels": {
+                "DEBUG": "gray",
+                "INFO": "black",
+                "WARNING": "dark orange",
+                "ERROR": "red",
+                "CRITICAL": "red3",
+            },
+            "detect_level": True,
+        }
+        for key in list(kw.keys()):
+            if key in self._configs:
+                self._configs[key] = kw.pop(key)
+
+        super(LogConsoleTheme, self).__init__(master, *args, **kw)
+
+        self.text = tk.Text(
+            self,
+            font=self._configs["font"],
+            width=self._configs["width"],
+            height=self._configs["height"],
+            wrap="none",
+            state=tk.DISABLED,
+        )
+        self._vsb = ttk.Scrollbar(self, orient="vertical", command=self.text.yview)
+        self.text.configure(yscrollcommand=self._vsb.set)
+
+        self._vsb.pack(side="right", fill="y")
+        self.text.pack(side="left", fill="both", expand=True)
+
+        for level, color in self._configs["levels"].items():
+            self.text.tag_configure(level, foreground=color)
+
+        self._pending = deque(maxlen=self._configs["max_lines"])
+        self._lines = 0
+        self._follower = None
+        self._following = None
+        self._stop = threading.Event()
+        # Set by append, from any thread
+        self._queued = threading.Event()
+
+        # Lines of every thread are written by this loop, Tk is not thread safe
+        self._flush_job = self.after(self._configs["idle_ms"], self._poll)
+
+    def _level_of(self, line):
+        if self._configs["detect_level"]:
+            found = self._level_pattern.search(line)
+            if found != None:
+                return found.group(1)
+        return None
+
+    def _poll(self):
+        "Internal function. Write the lines appended, checking often while they come"
+        if self._queued.is_set():
+            self._queued.clear()
+            self._flush()
+            delay = self._configs["frame_ms"]
+        else:
+            delay = self._configs["idle_ms"]
+        self._flush_job = self.after(delay, self._poll)
+
+    def _flush(self):
+        pending = self._pending
+        count = len(pending)
+        if count == 0:
+            return
+
+        args = []
+        new_lines = 0
+        for _ in range(count):
+            line, level = pending.popleft()
+            new_lines += line.count("\n") + 1
+            args.append(line + "\n")
+            args.append(level if level != None else ())
+
+        at_bottom = self.text.yview()[1] >= 1.0
+
+        self.text.configure(state=tk.NORMAL)
+        self.text.insert("end-1c", *args)
+
+        self._lines += new_lines
+        excess = self._lines - self._configs["max_lines"]
+        if excess > 0:
+            self.text.delete("1.0", f"{excess + 1}.0")
+            self._lines -= excess
+
+        self.text.configure(state=tk.DISABLED)
+
+        if at_bottom:
+            self.text.see("end")
+
+    def append(self, line, level=None):
+        """Append a line to the console. Safe to call from any thread.
+
+        Args:
+            line (str)
+            level (str) one of the levels option keys. Default None that
+                means the level found in line, if detect_level is set.
+        """
+        line = line.rstrip("\n")
+        self._pending.append((line, level if level != None else self._level_of(line)))
+        self._queued.set()
+
+    def extend(self, lines, level=None):
+        "Append many lines at once"
+        for line in lines:
+            self.append(line, level)
+
+    def clear(self):
+        self._pending.clear()
+        self._lines = 0
+        self.text.configure(state=tk.NORMAL)
+        self.text.delete("1.0", "end")
+        self.text.configure(state=tk.DISABLED)
+
+    def _read(self, path, from_end, interval):
+        f = None
+        position = 0
+        rest = ""
+        while not self._stop.is_set():
+            try:
+                if f == None:
+                    f = open(path, encoding="utf-8", errors="replace")
+                    if from_end:
+                        f.seek(0, os.SEEK_END)
+                    position = f.tell()
+                    from_end = False
+                elif os.path.getsize(path) < position:
+                    # Truncated or rotated, start over
+                    f.close()
+                    f, rest = None, ""
+                    continue
+            except OSError:
+                self._stop.wait(interval)
+                continue
+
+            chunk = f.read()
+            if chunk == "":
+                self._stop.wait(interval)
+                continue
+
+            position = f.tell()
+            lines = (rest + chunk).split("\n")
+            rest = lines.pop()
+            for line in lines:
+                self.append(line)
+
+        if f != None:
+            f.close()
+
+    def follow(self, path, from_end=True, interval=0.2):
+        """Follow a file, appending lines written to it, like tail -f.
+
+        Args:
+            path (str) file path
+            from_end (bool) skip the content already in the file. Default True
+            interval (float) seconds between two reads when nothing changed
+
+        Following the file already followed does nothing.
+        """
+        if self._follower != None and self._following == path:
+            return
+
+        self.stop_following()
+        self._stop.clear()
+        self._following = path
+        self._follower = threading.Thread(
+            target=self._read, args=(path, from_end, interval), daemon=True
+        )
+        self._follower.start()
+
+    def stop_following(self):
+        if self._follower != None:
+            self._stop.set()
+            self._follower.join()
+            self._follower = None
+            self._following = None
+
+    def get_value(self):
+        return self.text.get("1.0", "end-1c")
+
+    def destroy(self):
+        self.stop_following()
+        self.after_cancel(self._flush_job)
+        super().destroy()
+
+    @staticmethod
+    def how_it_works():
+        root = tk.Tk()
+        console = LogConsoleTheme(root, max_lines=1000)
+        console.pack(fill="both", expand=True)
+
+        def burst(start=0):
+            levels = ["DEBUG", "INFO", "WARNING", "ERROR"]
+            for i in range(start, start + 200):
+                console.append(f"{levels[i % 4]} line {i}")
+            root.after(100, lambda: burst(start + 200))
+
+        burst()
+        root.mainloop()
+
+
+class DateFormat:
+    """
+    A SimpleCalendar date format compiled to parse and format functions.
+
+    Use 'yyyy' for year, 'yy' for a two digits year, 'mm' for month and 'dd'
+    for day. Other characters are written as they are. Ex.: 'dd/mm/yyyy'.
+    A format is compiled only once, get it with DateFormat.of(format).
+
+    Parsing is strict by default: the text must be exactly like the format.
+    Lenient parsing accepts one digit days and months and spaces around the
+    separators. Fields missing in the format are parsed as 1 (day and month)
+    or as the current year.
+
+    Args:
+        format (str)
+    """
+
+    _cache = {}
+    _tokens = re.compile(r"yyyy|yy|mm|dd")
+    _fields = {"yyyy": "{0:04}", "yy": "{3:02}", "mm": "{1:02}", "dd": "{2:02}"}
+
+    def __init__(self, format):
+        self.format_string = format
+
+        template, strict, lenient = [], [], []
+        self._order = []
+
+        position = 0
+        for token in self._tokens.finditer(format):
+            literal = format[position : token.start()]
+            position = token.end()
+
+            template.append(literal.replace("{", "{{").replace("}", "}}"))
+            template.append(self._fields[token.group()])
+
+            strict.append(re.escape(literal))
+            lenient.append(
+                r"\s*" + re.escape(literal.strip()) + r"\s*" if literal else ""
+            )
+
+            digits = {"yyyy": 4, "yy": 2}.get(token.group(), 2)
+            strict.append(f"([0-9]{{{digits}}})")
+            lenient.append(f"([0-9]{{{digits}}})" if digits == 4 else r"([0-9]{1,2})")
+            self._order.append(token.group())
+
+        literal = format[position:]
+        template.append(literal.replace("{", "{{").replace("}", "}}"))
+        strict.append(re.escape(literal))
+        lenient.append(r"\s*" + re.escape(literal.strip()) if literal else "")
+
+        self._template = "".join(template).format
+        self._strict = re.compile("".join(strict)).fullmatch
+        self._lenient = re.compile(r"\s*" + "".join(lenient) + r"\s*").fullmatch
+
+    @classmethod
+    def of(cls, format):
+        "Return the compiled format, compiling it only once"
+        compiled = cls._cache.get(format)
+        if compiled == None:
+            compiled = cls._cache[format] = cls(format)
+        return compiled
+
+    def format(self, value):
+        "Format a datetime.date (or an ISO date str). None is formatted as ''"
+        if value == None or value == "":
+            return ""
+        if isinstance(value, str):
+            value = date.fromisoformat(value)
+        return self._template(value.year, value.month, value.day, value.year % 100)
+
+    def parse(self, text, strict=True):
+        "Return the datetime.date in text. Raise ValueError if it does not match"
+        found = (self._strict if strict else self._lenient)(text)
+        if found == None:
+            raise (ValueError(f"-{text} does not match -{self.format_string}"))
+
+        fields = {"yyyy": None, "yy": None, "mm": 1, "dd": 1}
+        for token, value in zip(self._order, found.groups()):
+            fields[token] = int(value)
+
+        year = fields["yyyy"]
+        if year == None and fields["yy"] != None:
+            # Same pivot as time.strptime
+            year = fields["yy"] + (1900 if fields["yy"] >= 69 else 2000)
+        elif year == None:
+            year = date.today().year
+
+        return date(year, fields["mm"], fields["dd"])
+
+    def format_many(self, values):
+        "Format a sequence of dates. None is formatted as ''"
+        template = self._template
+        result = []
+        for value in values:
+            if value == None or isinstance(value, str):
+                result.append(self.format(value))
+            else:
+                result.append(
+                    template(value.year, value.month, value.day, value.year % 100)
+                )
+        return result
+
+    def parse_many(self, texts, strict=True, errors="raise"):
+        """Parse a sequence of texts. Return a list of datetime.date.
+
+        Args:
+            strict (bool) see parse
+            errors (str) 'raise' a ValueError or 'ignore' that gives None for
+                texts that does not match
+        """
+        parse = self.parse
+        if errors == "raise":
+            return [parse(text, strict) for text in texts]
+
+        result = []
+        for text in texts:
+            try:
+                result.append(parse(text, strict))
+            except ValueError:
+                result.append(None)
+        return result
+
+
+class _CalendarPopup(tk.Toplevel):
+    """Internal class. A date picker shared by every SimpleCalendar of a
+    toplevel. It is built on first use, then only refilled, moved and
+    withdrawn. Subclasses build the content and confirm the choice."""
+
+    def __init__(self, master):
+        super(_CalendarPopup, self).__init__(master)
+        self.overrideredirect(True)
+        self.withdraw()
+
+        self._calendar = None
+
+        frame_with_border = FrameTheme(self, relief=tk.RIDGE, borderwidth=2)
+        frame_with_border.pack()
 
         frame_top = FrameTheme(frame_with_border)
         frame_top.pack(side="top", fill="x")
         frame_bottom = FrameTheme(frame_with_border)
         frame_bottom.pack(side="bottom", fill="x")
 
-        for i in range(len(self._optns["name_head"])):
-            LabelTheme(frame_top, text=self._optns["name_head"][i]).grid(
-                row=0, column=i
-            )
+        self._build_content(frame_top)
 
-        self.day = tk.Listbox(
-            frame_top,
-            selectmode=tk.SINGLE,
-            exportselection=0,
-            width=15,
-            takefocus=False,
-            selectborderwidth=0,
-            bd=0,
-            relief=tk.FLAT,
-        )
-        self.month = tk.Listbox(
-            frame_top,
-            selectmode=tk.SINGLE,
-            exportselection=0,
-            width=15,
-            takefocus=False,
-            selectborderwidth=0,
-            bd=0,
-            relief=tk.FLAT,
+        self.button_ok = ttk.Button(frame_bottom, command=self.confirm, takefocus=False)
+        self.button_cancel = ttk.Button(
+            frame_bottom, command=self.cancel, takefocus=False
         )
-        self.year = tk.Listbox(
-            frame_top,
-            selectmode=tk.SINGLE,
-            exportselection=0,
-            width=15,
-            takefocus=False,
-            selectborderwidth=0,
-            bd=0,
-            relief=tk.FLAT,
+        self.button_ok.pack(expand=True, fill="x", side="left")
+        self.button_cancel.pack(expand=True, fill="x", side="left")
+
+        # Follows the window when it moves, whatever the number of calendars
+        EventDispatcher.of(self).subscribe_toplevel(
+            "<Configure>", master, self.position
         )
 
-        self.day.grid(row=1, column=0)
-        self.month.grid(row=1, column=1)
-        self.year.grid(row=1, column=2)
+    @classmethod
+    def find(cls, widget):
+        "Return the popup of the widget's toplevel or None if not built"
+        # Kept by the toplevel, it goes away with it
+        popups = getattr(widget.winfo_toplevel(), "_calendar_popups", {})
+        popup = popups.get(cls)
+        if popup != None and popup.winfo_exists():
+            return popup
+        return None
+
+    @classmethod
+    def of(cls, widget):
+        "Return the popup of the widget's toplevel"
+        popup = cls.find(widget)
+        if popup == None:
+            top = widget.winfo_toplevel()
+            if not hasattr(top, "_calendar_popups"):
+                top._calendar_popups = {}
+            popup = top._calendar_popups[cls] = cls(top)
+
+        return popup
+
+    def _build_content(self, frame):
+        raise (NotImplementedError)
 
-        for i in range(31):
-            self.day.insert(i + 1, i + 1)
+    def _select_date(self, calendar):
+        raise (NotImplementedError)
 
-        for i in range(12):
-            self.month.insert(i + 1, i + 1)
+    def owner(self):
+        "The SimpleCalendar showing the popup or None when hidden"
+        return self._calendar
 
-        for i in range(self._optns["first_year"] - 1, self._optns["last_year"]):
-            self.year.insert(i + 1, i + 1)
+    def open(self, calendar):
+        self._calendar = calendar
+        options = calendar._optns
 
-        self.year.see(date.today().year - self._optns["first_year"])
+        self.button_ok.configure(text=options["name_buttons"][0])
+        self.button_cancel.configure(text=options["name_buttons"][1])
 
-        if self.get() == "":
-            self.set_today()
+        if calendar.get() == "":
+            calendar.set_today()
 
-        to_activate = [
-            self._date.day - 1,
-            self._date.month - 1,
-            self._date.year - self._optns["first_year"],
-        ]
+        self._select_date(calendar)
+
+        self.position()
+        self.deiconify()
+        self.lift()
+        EventDispatcher.of(self).subscribe("<Button>", self, self._close_or_not)
+
+    def position(self, *args):
+        calendar = self._calendar
+        if calendar == None:
+            return
+        try:
+            self.geometry(
+                "+{}+{}".format(
+                    calendar.winfo_rootx(),
+                    calendar.winfo_rooty() + calendar.winfo_height(),
+                )
+            )
+        except tk.TclError:
+            pass
+
+    def hide(self):
+        calendar, self._calendar = self._calendar, None
+        EventDispatcher.of(self).unsubscribe("<Button>", self)
+        self.withdraw()
+        if calendar != None:
+            calendar.icursor(0)
+            calendar.focus_displayof()
+
+    def _close_or_not(self, e):
+        if self._calendar == None or e.widget is self._calendar:
+            return
+
+        x1, y1 = self.winfo_rootx(), self.winfo_rooty()
+        x2, y2 = x1 + self.winfo_width(), y1 + self.winfo_height()
+        if not (x1 < e.x_root < x2 and y1 < e.y_root < y2):
+            self.hide()
+
+    def confirm(self):
+        raise (NotImplementedError)
+
+    def cancel(self):
+        self.hide()
 
-        self.day.see(to_activate[0] - 3)
-        self.month.see(to_activate[1] - 3)
-        self.year.see(to_activate[2] - 3)
 
-        self.day.select_set(to_activate[0])
-        self.month.select_set(to_activate[1])
-        self.year.select_set(to_activate[2])
+class _ListsPopup(_CalendarPopup):
+    """Internal class. Day, month and year listboxes."""
 
-        self.day.activate(to_activate[0])
-        self.month.activate(to_activate[1])
-        self.year.activate(to_activate[2])
+    def _build_content(self, frame):
+        self._years = None
 
-        def confirm():
-            date = "{:04}-{:02}-{:02}".format(
-                self.year.get(tk.ACTIVE),
-                self.month.get(tk.ACTIVE),
-                self.day.get(tk.ACTIVE),
+        self.heads = [LabelTheme(frame) for i in range(3)]
+        self.day, self.month, self.year = [
+            tk.Listbox(
+                frame,
+                selectmode=tk.SINGLE,
+                exportselection=0,
+                width=15,
+                takefocus=False,
+                selectborderwidth=0,
+                bd=0,
+                relief=tk.FLAT,
             )
-            self.set_value(date)
-            self._calendar.unbind_all("<Button>")
-            self.focus_displayof()
-            self._calendar.destroy()
-            self._calendar_monted = False
+            for i in range(3)
+        ]
 
-        def cancel():
-            self._calendar.unbind_all("<Button>")
-            self._calendar_monted = False
-            self.focus_displayof()
-            self._calendar.destroy()
+        for i, listbox in enumerate([self.day, self.month, self.year]):
+            self.heads[i].grid(row=0, column=i)
+            listbox.grid(row=1, column=i)
+
+        self.day.insert(0, *range(1, 32))
+        self.month.insert(0, *range(1, 13))
+
+    def _set_years(self, first, last):
+        if self._years != (first, last):
+            self._years = (first, last)
+            self.year.delete(0, "end")
+            self.year.insert(0, *range(first, last + 1))
+
+    def _select(self, listbox, index):
+        listbox.select_clear(0, "end")
+        listbox.see(max(index - 3, 0))
+        listbox.select_set(index)
+        listbox.activate(index)
+
+    def _select_date(self, calendar):
+        options = calendar._optns
+
+        for label, text in zip(self.heads, options["name_head"]):
+            if label.cget("text") != text:
+                label.configure(text=text)
+
+        self._set_years(options["first_year"], options["last_year"])
+
+        selected = calendar._date
+        self._select(self.day, selected.day - 1)
+        self._select(self.month, selected.month - 1)
+        self._select(self.year, selected.year - options["first_year"])
+
+    def confirm(self):
+        year = int(self.year.get(tk.ACTIVE))
+        month = int(self.month.get(tk.ACTIVE))
+        day = min(int(self.day.get(tk.ACTIVE)), monthrange(year, month)[1])
+
+        calendar = self._calendar
+        self.hide()
+        calendar.set_value(date(year, month, day))
+
+
+@lru_cache(maxsize=64)
+def _month_layout(year, month, firstweekday):
+    """Internal function. The 42 dates (6 weeks x 7 days) showed in the grid
+    of a month, computed once per month."""
+    weeks = Calendar(firstweekday).monthdatescalendar(year, month)
+    days = [day for week in weeks for day in week]
+    while len(days) < 42:
+        days.append(days[-1] + timedelta(days=1))
+
+    return tuple(days)
+
+
+class _MonthGridPopup(_CalendarPopup):
+    """Internal class. A month drawn on a single canvas. Paging months only
+    changes the text and tags of the items created with the popup."""
+
+    cell = (30, 22)
+    colors = {
+        "day": "black",
+        "other_month": "gray",
+        "selected": "#3874d8",
+        "selected_text": "white",
+        "range": "#c6d8f5",
+        "today": "#3874d8",
+    }
+
+    def _build_content(self, frame):
+        width, height = self.cell
+        self._month = None
+        self._layout = ()
+        self._start = None
+        self._end = None
+        self._picking = False
+
+        canvas = self.canvas = tk.Canvas(
+            frame,
+            width=7 * width,
+            height=8 * height,
+            highlightthickness=0,
+            bg=TKINTER_COLOR_DEFAULT,
+        )
+        canvas.pack()
 
-        self.button_ok = ttk.Button(
-            frame_bottom,
-            text=self._optns["name_buttons"][0],
-            command=confirm,
-            takefocus=False,
+        canvas.create_text(width // 2, height // 2, text="<", tags=("previous",))
+        canvas.create_text(
+            7 * width - width // 2, height // 2, text=">", tags=("next",)
         )
-        self.button_cancel = ttk.Button(
-            frame_bottom,
-            text=self._optns["name_buttons"][1],
-            command=cancel,
-            takefocus=False,
+        canvas.create_text(7 * width // 2, height // 2, tags=("title",))
+        canvas.tag_bind("previous", "<Button-1>", lambda e: self._page(-1))
+        canvas.tag_bind("next", "<Button-1>", lambda e: self._page(1))
+
+        for column in range(7):
+            canvas.create_text(
+                column * width + width // 2,
+                height + height // 2,
+                tags=("weekday", f"w{column}"),
+            )
+
+        for i in range(42):
+            row, column = divmod(i, 7)
+            x, y = column * width, (row + 2) * height
+            canvas.create_rectangle(
+                x + 1,
+                y + 1,
+                x + width - 1,
+                y + height - 1,
+                outline="",
+                tags=("cell", "box", f"b{i}"),
+            )
+            canvas.create_text(
+                x + width // 2, y + height // 2, tags=("cell", "day", f"d{i}")
+            )
+
+        canvas.tag_bind("cell", "<Button-1>", self._click)
+
+    def _select_date(self, calendar):
+        options = calendar._optns
+
+        first = options["firstweekday"]
+        names = options["name_days"] or [day_abbr[i][:2] for i in range(7)]
+        for column in range(7):
+            self.canvas.itemconfigure(f"w{column}", text=names[(first + column) % 7])
+
+        self._start = calendar._date
+        self._end = calendar._end
+        self._picking = False
+        self._month = None
+        self._show_month(self._start.year, self._start.month)
+
+    def _show_month(self, year, month):
+        canvas = self.canvas
+        first = self._calendar._optns["firstweekday"]
+
+        if self._month != (year, month, first):
+            self._month = (year, month, first)
+            self._layout = _month_layout(year, month, first)
+            canvas.itemconfigure("title", text=f"{month_name[month]} {year}")
+            for i, day in enumerate(self._layout):
+                canvas.itemconfigure(
+                    f"d{i}",
+                    text=day.day,
+                    tags=(
+                        "cell",
+                        "day",
+                        f"d{i}",
+                        "in" if day.month == month else "out",
+                    ),
+                )
+
+        self._paint()
+
+    def _paint(self):
+        "Internal function. Color the cells from their tags and the selection."
+        canvas = self.canvas
+        colors = self.colors
+
+        canvas.itemconfigure("box", fill="", outline="")
+        canvas.itemconfigure("in", fill=colors["day"])
+        canvas.itemconfigure("out", fill=colors["other_month"])
+
+        layout = self._layout
+        start, end = self._start, self._end or self._start
+        if start != None and layout and start <= layout[-1] and end >= layout[0]:
+            for i, day in enumerate(layout):
+                if day == start or day == end:
+                    canvas.itemconfigure(f"b{i}", fill=colors["selected"])
+                    canvas.itemconfigure(f"d{i}", fill=colors["selected_text"])
+                elif start < day < end:
+                    canvas.itemconfigure(f"b{i}", fill=colors["range"])
+
+        today = date.today()
+        if layout and layout[0] <= today <= layout[-1]:
+            canvas.itemconfigure(f"b{layout.index(today)}", outline=colors["today"])
+
+    def _page(self, step):
+        year, month, first = self._month
+        month += step
+        if month < 1:
+            year, month = year - 1, 12
+        elif month > 12:
+            year, month = year + 1, 1
+        self._show_month(year, month)
+
+    def _click(self, event):
+        for tag in self.canvas.gettags("current"):
+            if tag[0] in "bd" and tag[1:].isdigit():
+                day = self._layout[int(tag[1:])]
+                break
+        else:
+            return
+
+        if self._picking:
+            self._start, self._end = min(self._start, day), max(self._start, day)
+            self._picking = False
+        else:
+            self._start, self._end = day, None
+            self._picking = self._calendar._optns["select"] == "range"
+
+        if day.month != self._month[1]:
+            self._show_month(day.year, day.month)
+        else:
+            self._paint()
+
+    def confirm(self):
+        calendar = self._calendar
+        start, end = self._start, self._end
+        self.hide()
+
+        if calendar._optns["select"] == "range":
+            calendar.set_range(start, end or start)
+        else:
+            calendar.set_value(start)
+
+
+class SimpleCalendar(ttk.Entry):
+    """Simple calendar
+
+    Args:
+        master
+
+    Options:
+        'name_buttons' (list) default == ['Ok', 'Cancel']
+        'name_head' (list) default == ['Day', 'Month', 'Year']
+        'font' (tuple) default == ("arial", 10, "normal") see tkinter fonts
+        'format' (str) Use 'yyyy' for year, 'mm' for month and 'dd' for day. Default == 'yyyy-mm-dd'
+        'first_year' (int) defaul == 1970
+        'last_year' (int) defaul == 2030
+        'mode' (str) 'lists' for day, month and year lists or 'grid' for a
+            month grid. Default == 'lists'
+        'select' (str) 'single' or 'range' (grid mode only). Default == 'single'
+        'firstweekday' (int) first column of the grid, 0 is monday. Default == 0
+        'name_days' (list) seven names of the grid columns from monday.
+            Default == None, the locale abbreviations
+    """
+
+    def __init__(self, master, *args, **kw):
+        self._optns = {
+            "name_buttons": ["Ok", "Cancel"],
+            "name_head": ["Day", "Month", "Year"],
+            "font": ("arial", 10, "normal"),
+            "format": "yyyy-mm-dd",
+            "first_year": 1970,
+            "last_year": 2030,
+            "mode": "lists",
+            "select": "single",
+            "firstweekday": 0,
+            "name_days": None,
+        }
+        for key in self._optns.keys():
+            if key in kw.keys():
+                self._optns[key] = kw.pop(key)
+
+        self.value = tk.StringVar()
+
+        vcmd = (master.register(self._on_keypress), "%d")
+
+        super(SimpleCalendar, self).__init__(
+            master,
+            font=self._optns["font"],
+            textvariable=self.value,
+            validatecommand=vcmd,
+            validate="key",
+            *args,
+            **kw,
         )
 
-        self.button_ok.pack(expand=True, fill="x", side="left")
-        self.button_cancel.pack(expand=True, fill="x", side="left")
+        if self._optns["mode"] not in ["lists", "grid"]:
+            raise (AttributeError(f"mode -{self._optns['mode']} not valid!"))
+        if self._optns["select"] not in ["single", "range"]:
+            raise (AttributeError(f"select -{self._optns['select']} not valid!"))
 
-        self._calendar_monted = True
-        self._position()
+        self._date = date.today()
+        self._end = None
+        self._date_format = DateFormat.of(self._optns["format"])
+
+        self.bind("<Button>", lambda e: self._build(e))
+
+    def _on_keypress(self, *args):
+        self.icursor(0)
+        return False
+
+    def _popup_class(self):
+        return _MonthGridPopup if self._optns["mode"] == "grid" else _ListsPopup
+
+    def _position(self, e=None):
+        popup = self._popup_class().find(self)
+        if popup != None and popup.owner() is self:
+            popup.position()
+
+    def _build(self, e):
+        if str(self["state"]) == tk.DISABLED:
+            return
+
+        popup = self._popup_class().of(self)
+        if popup.owner() is self:
+            self.icursor(0)
+            popup.lift()
+            return
+
+        popup.open(self)
         self.after(100, lambda: self.icursor(0))
-        self.active()
 
     def active(self):
         self.configure(state=tk.NORMAL, cursor="hand2")
@@ -1373,9 +3089,15 @@ class SimpleCalendar(ttk.Entry):
         return self.value.get()
 
     def get_value(self):
-        "Iso date value"
+        "Iso date value. A range is returned like an ISO interval 'start/end'"
+        if self._end != None:
+            return f"{self._date.isoformat()}/{self._end.isoformat()}"
         return self._date.isoformat()
 
+    def get_range(self):
+        "The (start, end) datetime.date objects. Both are the date if not a range"
+        return self._date, self._end if self._end != None else self._date
+
     def get_date(self):
         "The datetime.date object"
         return date(self._date.year, self._date.month, self._date.day)
@@ -1390,50 +3112,81 @@ class SimpleCalendar(ttk.Entry):
                 if date object it will be set like format. Default format == ISO 8601 - Date '2012-02-28'.
                 if dict it will need have the follow keys: 'day', 'month' and 'year'
                 if str date it will be need like ISO 8601 - Date '2012-02-28'
+                if str ISO interval like '2012-02-28/2012-03-05' a range is set
 
             format_show (str) -- Use 'dd' for day 'mm' for month and 'yyyy' for year. (default: None)
         """
 
+        if (
+            isinstance(value, str)
+            and re.match(r"^[0-9]{4}-[0-9]{1,2}-[0-9]{1,2}/[0-9]{4}-", value) != None
+        ):
+            # ISO interval, a range
+            start, end = value.split("/")
+            self.set_range(self._parse(start), self._parse(end), format_show)
+            return
+
+        self._date = self._parse(value)
+        self._end = None
+
+        if format_show != None:
+            self._optns["format"] = format_show
+            self._date_format = DateFormat.of(format_show)
+
+        self._show()
+
+    def _parse(self, value):
+        """Internal function. The date from a value accepted by set_value."""
         if isinstance(value, date):
-            self._date = value
+            return value
 
         elif isinstance(value, dict):
-            self._date = date(value["year"], value["month"], value["day"])
+            return date(value["year"], value["month"], value["day"])
 
         elif isinstance(value, str):
-            if (
-                re.match(r"^([0-9]{2}|[0-9]{1})\/([0-9]{2}|[0-9]{1})\/[0-9]{4}$", value)
-                != None
-            ):
-                # Exception not documented date input like "yyyy/mm/dd"
-                value = value.split("/")
-                self._date = date(int(value[2]), int(value[1]), int(value[0]))
-
-            elif (
-                re.match(r"^[0-9]{4}\-([0-9]{2}|[0-9]{1})\-([0-9]{2}|[0-9]{1})$", value)
-                != None
-            ):
+            try:
                 # ISO Date
-                self._date = date.fromisoformat(value)
-
-            else:
+                return DateFormat.of("yyyy-mm-dd").parse(value, strict=False)
+            except ValueError:
+                pass
+            try:
+                # Exception not documented date input like "dd/mm/yyyy"
+                return DateFormat.of("dd/mm/yyyy").parse(value, strict=False)
+            except ValueError:
                 # Not Aceptec format
                 raise (ValueError('value str not match iso date "yyyy-mm-dd"'))
 
         elif value == None:
-            self._date = date.today()
+            return date.today()
 
         else:
             raise (ValueError(f"value {type(value)} != valid!"))
 
+    def _show(self):
+        format = self._date_format.format
+        if self._end != None:
+            self.value.set(f"{format(self._date)} - {format(self._end)}")
+        else:
+            self.value.set(format(self._date))
+
+    def set_range(self, start, end, format_show=None):
+        """Set a range of dates to be showed
+
+        Arguments:
+            start, end (datetime.date, str or dict) -- Same as set_value value.
+                The same date for both sets a single date.
+            format_show (str) -- Same as set_value format_show
+        """
+        start, end = self._parse(start), self._parse(end)
+        self._date, self._end = min(start, end), max(start, end)
+        if self._end == self._date:
+            self._end = None
+
         if format_show != None:
             self._optns["format"] = format_show
+            self._date_format = DateFormat.of(format_show)
 
-        to_show = str(self._optns["format"])
-        to_show = to_show.replace("dd", f"{self._date.day:02}")
-        to_show = to_show.replace("mm", f"{self._date.month:02}")
-        to_show = to_show.replace("yyyy", f"{self._date.year:04}")
-        self.value.set(to_show)
+        self._show()
 
     def set_today(self):
         self.set_value()
@@ -1673,6 +3426,117 @@ class ButtonTheme(ttk.Button):
         self.config(state=tk.NORMAL, cursor="hand2")
 
 
+class _ScrollRouter:
+    """Internal class. Sends the mouse wheel of an application to the
+    ScrollFrameTheme under the pointer.
+
+    The geometry of the registered frames is measured once per wheel burst
+    (or after they move) instead of on every wheel tick. The innermost frame
+    under the pointer scrolls first, when it is at its edge the wheel is
+    handed to the frame around it."""
+
+    _sequences = [
+        "<MouseWheel>",
+        "<Shift-MouseWheel>",
+        "<Button-4>",
+        "<Button-5>",
+        "<Shift-Button-4>",
+        "<Shift-Button-5>",
+    ]
+
+    # Seconds without wheel events that end a burst
+    burst = 0.3
+
+    def __init__(self, root):
+        self._root = root
+        self._frames = {}
+        self._rects = None
+        self._last = 0
+        self._aqua = root.tk.call("tk", "windowingsystem") == "aqua"
+
+        dispatcher = EventDispatcher.of(root)
+        for sequence in self._sequences:
+            dispatcher.subscribe(sequence, root, self._wheel)
+
+    @classmethod
+    def of(cls, widget):
+        root = widget._root()
+        # Kept by the root, it goes away with it
+        router = getattr(root, "_tktwid_scroll_router", None)
+        if router == None:
+            router = root._tktwid_scroll_router = cls(root)
+
+        return router
+
+    def register(self, frame):
+        if str(frame) not in self._frames:
+            self._frames[str(frame)] = weakref.ref(frame)
+            EventDispatcher.of(frame).subscribe_toplevel(
+                "<Configure>", frame, self.invalidate
+            )
+            self.invalidate()
+
+    def unregister(self, frame):
+        if self._frames.pop(str(frame), None) != None:
+            self.invalidate()
+
+    def invalidate(self, *args):
+        self._rects = None
+
+    def moved(self, frame):
+        "Forget the geometry of the frames inside frame, that scrolled"
+        if self._rects != None:
+            inside = str(frame) + "."
+            if any(rect[4].startswith(inside) for rect in self._rects):
+                self._rects = None
+
+    def _measure(self):
+        rects = []
+        for path, reference in list(self._frames.items()):
+            frame = reference()
+            try:
+                if frame == None or not frame.winfo_viewable():
+                    continue
+                x, y = frame.winfo_rootx(), frame.winfo_rooty()
+                w, h = frame.winfo_width(), frame.winfo_height()
+            except tk.TclError:
+                del self._frames[path]
+                continue
+            rects.append((x, y, x + w, y + h, path, reference))
+
+        # Innermost frames first
+        rects.sort(key=lambda rect: rect[4].count("."), reverse=True)
+        return rects
+
+    def pixels(self, event):
+        "Pixels to scroll for a wheel event, negative is up or left"
+        if event.num == 4:
+            return -ScrollFrameTheme.wheel_step
+        elif event.num == 5:
+            return ScrollFrameTheme.wheel_step
+        elif self._aqua:
+            # Small deltas of touchpads and precise mouses on macOS
+            return -event.delta * 4
+        else:
+            return -event.delta * ScrollFrameTheme.wheel_step / 120
+
+    def _wheel(self, event):
+        now = time.monotonic()
+        if self._rects == None or now - self._last > self.burst:
+            self._rects = self._measure()
+        self._last = now
+
+        pixels = self.pixels(event)
+        horizontal = bool(event.state & 0x0001)
+        x, y = event.x_root, event.y_root
+
+        for x1, y1, x2, y2, path, reference in self._rects:
+            if x1 <= x < x2 and y1 <= y < y2:
+                frame = reference()
+                if frame != None and frame.scroll_by(pixels, horizontal):
+                    return
+
+
 class ScrollFrameTheme(FrameTheme):
     """
     Th== widget make a frame with a Scroolbar
@@ -1684,9 +3548,29 @@ class ScrollFrameTheme(FrameTheme):
 
     label = Label(scroll.viewPort, text='scroll.viewPort == the frame with scroll')
 
+    For thousands of similar rows use set_virtual instead of the viewPort,
+    only the visible rows will be widgets. For a large grid scrolled in both
+    directions use set_tiles, only the tiles in the view will be shown.
+
+    The mouse wheel is accumulated and applied once per frame. Nested scroll
+    frames hand the wheel to the one around them when at their edge.
+
+    Options:
+        smooth (bool) ease the scroll over some frames. Default True
+        frame_ms (int) minimum time in ms between two scroll steps. Default 16
     """
 
+    # Pixels scrolled by a wheel notch
+    wheel_step = 48
+    # Part of the remaining distance scrolled in each frame when smooth
+    easing = 0.35
+
     def __init__(self, master, *args, **kw):
+        self._configs = {"smooth": True, "frame_ms": 16}
+        for key in list(kw.keys()):
+            if key in self._configs:
+                self._configs[key] = kw.pop(key)
+
         super(ScrollFrameTheme, self).__init__(
             master, *args, **kw
         )  # create a frame (self)
@@ -1694,10 +3578,29 @@ class ScrollFrameTheme(FrameTheme):
         self._canvas = tk.Canvas(self)
 
         self._vsb = ttk.Scrollbar(self, orient="vertical", command=self._canvas.yview)
+        self._hsb = ttk.Scrollbar(self, orient="horizontal", command=self._canvas.xview)
 
         self.viewPort = FrameTheme(self._canvas)
 
-        self._canvas.configure(yscrollcommand=self._vsb.set)
+        self._virtual = None
+        self._rows = {}
+        self._pool = []
+
+        self._tiles = None
+        self._shown = {}
+        self._parked = OrderedDict()
+
+        self._resize_job = None
+        self._batch_depth = 0
+        self._batch_job = None
+        self._vsb_shown = False
+        self._hsb_shown = False
+
+        self._pending = [0.0, 0.0]
+        self._scroll_job = None
+
+        self._canvas.configure(yscrollcommand=self._on_yscroll)
+        self._canvas.configure(xscrollcommand=self._on_xscroll)
         self._canvas.configure(highlightcolor=TKINTER_COLOR_DEFAULT)
 
         self._canvas_frame = self._canvas.create_window((0, 0), window=self.viewPort)
@@ -1711,45 +3614,521 @@ class ScrollFrameTheme(FrameTheme):
         self.bind("<Map>", self._bind_scroll)
         self.bind("<Unmap>", self._unbind_scroll)
 
+        self.bind("<Configure>", lambda e: _ScrollRouter.of(self).invalidate(), True)
+
     def _bind_scroll(self, *argv):
-        # with Windows OS
-        self.viewPort.bind_all("<MouseWheel>", self.mouse_wheel)
-        # with Linux OS
-        self.viewPort.bind_all("<Button-4>", self.mouse_wheel)
-        self.viewPort.bind_all("<Button-5>", self.mouse_wheel)
+        # The wheel is routed to the scroll frame under the pointer
+        _ScrollRouter.of(self).register(self)
 
     def _unbind_scroll(self, *argv):
-        # with Windows OS
-        self.viewPort.unbind_all("<MouseWheel>")
+        _ScrollRouter.of(self).unregister(self)
 
-        # with Linux OS
-        self.viewPort.unbind_all("<Button-4>")
-        self.viewPort.unbind_all("<Button-5>")
+    def destroy(self):
+        for job in (self._scroll_job, self._resize_job, self._batch_job):
+            if job != None:
+                self.after_cancel(job)
+        self._scroll_job = self._resize_job = self._batch_job = None
+        self._unbind_scroll()
+        super().destroy()
 
     def _resize_canvas(self, event):
         canvas_width = self._canvas.winfo_width()
         self._canvas.itemconfig(self._canvas_frame, width=canvas_width)
 
+        if self._virtual != None:
+            for row, item in list(self._rows.values()) + self._pool:
+                self._canvas.itemconfig(item, width=canvas_width)
+            self._update_virtual_region()
+        elif self._tiles != None:
+            self._update_tiles_region()
+            self._realize_tiles()
+
+    def _scrollable(self):
+        "Internal function. Return True if the content is higher than the frame"
+        if self._virtual != None:
+            height = self._virtual["count"] * self._virtual["row_height"]
+            return height > self._canvas.winfo_height()
+        elif self._tiles != None:
+            height = self._tiles["rows"] * self._tiles["height"]
+            return height > self._canvas.winfo_height()
+
+        return self.winfo_height() <= self.viewPort.winfo_height()
+
+    def _on_yscroll(self, first, last):
+        self._vsb.set(first, last)
+        if self._virtual != None:
+            self._realize()
+        elif self._tiles != None:
+            self._realize_tiles()
+
+    def _on_xscroll(self, first, last):
+        self._hsb.set(first, last)
+        if self._tiles != None:
+            self._realize_tiles()
+
     def _resize_window(self, *argv):
-        """Reset the scroll region to encompass the inner frame"""
+        """Reset the scroll region to encompass the inner frame, once per idle
+        pass whatever the number of <Configure> events in between."""
+        if self._virtual != None or self._tiles != None:
+            return
+        if self._batch_depth > 0 or self._batch_job != None:
+            return
+
+        if self._resize_job == None:
+            self._resize_job = self.after_idle(self._update_region)
+
+    def _update_region(self):
+        self._resize_job = None
+        if self._virtual != None or self._tiles != None:
+            return
+
         self._canvas.configure(scrollregion=self._canvas.bbox("all"))
+        self._show_scrollbar(self._scrollable())
+
+        if not self._canvas.winfo_ismapped():
+            self._canvas.yview_moveto("0.0")
 
-        if self.winfo_height() <= self.viewPort.winfo_height():
+    def _show_scrollbar(self, show):
+        """Internal function. Pack or unpack the scrollbar only when it
+        changes, each pack makes more <Configure> events."""
+        if show and not self._vsb_shown:
             # pack scrollbar to right of self
             self._vsb.pack(side="right", fill="y")
             self._bind_scroll()
-        else:
+        elif not show and self._vsb_shown:
             self._vsb.pack_forget()
             self._unbind_scroll()
+        self._vsb_shown = show
+
+    def _show_hscrollbar(self, show):
+        if show and not self._hsb_shown:
+            self._hsb.pack(side="bottom", fill="x", before=self._canvas)
+        elif not show and self._hsb_shown:
+            self._hsb.pack_forget()
+            self._canvas.xview_moveto(0)
+        self._hsb_shown = show
+
+    @contextmanager
+    def batch(self):
+        """Suspend the scroll region updates while many children are added.
+        The region is computed once, in the idle pass after the end, when the
+        children packed are arranged.
+
+        with scroll.batch() as viewPort:
+            for i in range(1000):
+                LabelTheme(viewPort, text=i).pack()
+        """
+        self._batch_depth += 1
+        try:
+            yield self.viewPort
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0 and self._batch_job == None:
+                self._batch_job = self.after_idle(self._end_batch)
+
+    def _end_batch(self):
+        # The <Configure> of the arrangement are ignored while it is done
+        self.update_idletasks()
+        self._batch_job = None
+        if self._resize_job != None:
+            self.after_cancel(self._resize_job)
+        self._update_region()
+
+    def _new_row(self):
+        "Internal function. Create a hidden row for the virtual list"
+        row = self._virtual["factory"](self._canvas)
+        item = self._canvas.create_window(
+            0,
+            0,
+            window=row,
+            anchor="nw",
+            width=self._canvas.winfo_width(),
+            state="hidden",
+        )
+        return row, item
+
+    def _update_virtual_region(self):
+        virtual = self._virtual
+        height = virtual["count"] * virtual["row_height"]
+        self._canvas.configure(scrollregion=(0, 0, self._canvas.winfo_width(), height))
+
+        self._show_scrollbar(self._scrollable())
+
+    def _realize(self):
+        """Internal function. Bind rows to the indexes in the view, reusing
+        the rows that left it."""
+        virtual = self._virtual
+        height = virtual["row_height"]
+
+        top = self._canvas.canvasy(0)
+        first = max(0, int(top // height) - virtual["overscan"])
+        last = min(
+            virtual["count"],
+            int((top + self._canvas.winfo_height()) // height)
+            + 1
+            + virtual["overscan"],
+        )
 
-        if not self._canvas.winfo_ismapped():
-            self._canvas.yview_moveto("0.0")
+        for index in [i for i in self._rows if not first <= i < last]:
+            row, item = self._rows.pop(index)
+            self._canvas.itemconfigure(item, state="hidden")
+            self._pool.append((row, item))
+
+        for index in range(first, last):
+            if index not in self._rows:
+                row, item = self._pool.pop() if self._pool else self._new_row()
+                virtual["bind"](row, index)
+                self._canvas.coords(item, 0, index * height)
+                self._canvas.itemconfigure(item, state="normal")
+                self._rows[index] = (row, item)
+
+    def set_virtual(self, count, factory, bind, row_height=None, overscan=2):
+        """
+        Show count rows built on demand instead of the viewPort children.
+
+        Only the rows in the view, plus overscan rows on each side, are
+        widgets. Rows are created by factory and bound again to other indexes
+        while scrolling. The scrollbar behaves as if every row existed.
+
+        Args:
+            count (int) number of rows
+            factory (function) factory(master) returns a new row widget
+            bind (function) bind(row, index) shows the item index in row
+            row_height (int) height in pixels of every row. Default None that
+                means the requested height of the first row created
+            overscan (int) rows kept ready out of the view on each side
+        """
+        self.clear_virtual()
+        self.clear_tiles()
+        self._canvas.itemconfigure(self._canvas_frame, state="hidden")
+
+        self._virtual = {
+            "count": count,
+            "factory": factory,
+            "bind": bind,
+            "row_height": row_height,
+            "overscan": overscan,
+        }
+
+        if row_height == None:
+            row, item = self._new_row()
+            row.update_idletasks()
+            self._virtual["row_height"] = max(row.winfo_reqheight(), 1)
+            self._pool.append((row, item))
+
+        self._update_virtual_region()
+        self._canvas.yview_moveto(0)
+        self._realize()
+
+    def set_count(self, count):
+        "Change the number of rows of the virtual list"
+        if self._virtual == None:
+            raise (AttributeError("no virtual list, call set_virtual first!"))
+
+        self._virtual["count"] = count
+        self._update_virtual_region()
+        self.refresh()
+
+    def refresh(self):
+        """Bind again the rows of the virtual list, after its items changed.
+        Without a virtual list it does nothing."""
+        if self._virtual == None:
+            return
+
+        for index in list(self._rows):
+            if index >= self._virtual["count"]:
+                row, item = self._rows.pop(index)
+                self._canvas.itemconfigure(item, state="hidden")
+                self._pool.append((row, item))
+            else:
+                self._virtual["bind"](self._rows[index][0], index)
+        self._realize()
+
+    def clear_virtual(self):
+        "Destroy the virtual list rows and show the viewPort again"
+        if self._virtual == None:
+            return
+
+        for row, item in list(self._rows.values()) + self._pool:
+            self._canvas.delete(item)
+            row.destroy()
+
+        self._rows, self._pool, self._virtual = {}, [], None
+        self._canvas.itemconfigure(self._canvas_frame, state="normal")
+        self._resize_window()
+
+    def _update_tiles_region(self):
+        tiles = self._tiles
+        width = tiles["columns"] * tiles["width"]
+        height = tiles["rows"] * tiles["height"]
+        self._canvas.configure(scrollregion=(0, 0, width, height))
+
+        self._show_scrollbar(self._scrollable())
+        self._show_hscrollbar(width > self._canvas.winfo_width())
+
+    def _tiles_in_view(self):
+        "Internal function. Return the ranges of rows and columns in the view"
+        tiles = self._tiles
+        canvas = self._canvas
+        overscan = tiles["overscan"]
+
+        left, top = canvas.canvasx(0), canvas.canvasy(0)
+        right = left + canvas.winfo_width()
+        bottom = top + canvas.winfo_height()
+
+        rows = range(
+            max(0, int(top // tiles["height"]) - overscan),
+            min(tiles["rows"], int(bottom // tiles["height"]) + 1 + overscan),
+        )
+        columns = range(
+            max(0, int(left // tiles["width"]) - overscan),
+            min(tiles["columns"], int(right // tiles["width"]) + 1 + overscan),
+        )
+        return rows, columns
+
+    def _park(self, key):
+        tile, item = self._shown.pop(key)
+        self._canvas.itemconfigure(item, state="hidden")
+        self._parked[key] = (tile, item)
+
+    def _take_tile(self, key):
+        """Internal function. Return a tile for key, the one parked for it, a
+        parked one bound again or a new one."""
+        tiles = self._tiles
+        if key in self._parked:
+            return self._parked.pop(key)
+
+        if tiles["bind"] != None and self._parked:
+            tile, item = self._parked.popitem(last=False)[1]
+            tiles["bind"](tile, *key)
+            return tile, item
+
+        tile = tiles["factory"](self._canvas, *key)
+        item = self._canvas.create_window(
+            0,
+            0,
+            window=tile,
+            anchor="nw",
+            width=tiles["width"],
+            height=tiles["height"],
+            state="hidden",
+        )
+        return tile, item
+
+    def _realize_tiles(self):
+        """Internal function. Show the tiles that intersect the view and park
+        the others, destroying the oldest parked ones above the budget."""
+        tiles = self._tiles
+        rows, columns = self._tiles_in_view()
+
+        for key in [k for k in self._shown if k[0] not in rows or k[1] not in columns]:
+            self._park(key)
+
+        for row in rows:
+            for column in columns:
+                key = (row, column)
+                if key not in self._shown:
+                    tile, item = self._take_tile(key)
+                    self._canvas.coords(
+                        item, column * tiles["width"], row * tiles["height"]
+                    )
+                    self._canvas.itemconfigure(item, state="normal")
+                    self._shown[key] = (tile, item)
+
+        budget = tiles["budget"]
+        if budget != None:
+            while self._parked and len(self._shown) + len(self._parked) > budget:
+                tile, item = self._parked.popitem(last=False)[1]
+                self._canvas.delete(item)
+                tile.destroy()
+
+    def set_tiles(
+        self,
+        rows,
+        columns,
+        factory,
+        tile_width,
+        tile_height,
+        bind=None,
+        overscan=1,
+        budget=None,
+    ):
+        """
+        Show a grid of rows x columns tiles, scrolled in both directions,
+        instead of the viewPort children.
+
+        Only the tiles that intersect the view, plus overscan tiles on each
+        side, are shown. The tiles that leave the view are parked hidden and
+        shown again when they come back. With bind, a parked tile may be bound
+        to another position instead of creating a new one.
+
+        Args:
+            rows (int) number of rows of tiles
+            columns (int) number of columns of tiles
+            factory (function) factory(master, row, column) returns a new tile
+            tile_width (int) width in pixels of every tile
+            tile_height (int) height in pixels of every tile
+            bind (function) bind(tile, row, column) shows the position in a
+                reused tile. Default None, tiles are never reused
+            overscan (int) tiles kept ready out of the view on each side
+            budget (int) maximum number of tiles alive, the parked tiles not
+                used for longer are destroyed above it. Default None, without
+                limit
+        """
+        self.clear_virtual()
+        self.clear_tiles()
+        self._canvas.itemconfigure(self._canvas_frame, state="hidden")
+
+        self._tiles = {
+            "rows": rows,
+            "columns": columns,
+            "factory": factory,
+            "bind": bind,
+            "width": tile_width,
+            "height": tile_height,
+            "overscan": overscan,
+            "budget": budget,
+        }
+
+        self._update_tiles_region()
+        self._canvas.xview_moveto(0)
+        self._canvas.yview_moveto(0)
+        self._realize_tiles()
+
+    def set_grid_size(self, rows, columns):
+        "Change the number of rows and columns of tiles"
+        if self._tiles == None:
+            raise (AttributeError("no tiles, call set_tiles first!"))
+
+        self._tiles["rows"], self._tiles["columns"] = rows, columns
+        for key in [k for k in self._parked if k[0] >= rows or k[1] >= columns]:
+            tile, item = self._parked.pop(key)
+            self._canvas.delete(item)
+            tile.destroy()
+
+        self._update_tiles_region()
+        self._realize_tiles()
+
+    def refresh_tiles(self):
+        "Bind again the tiles, after the items changed. Without tiles it does nothing"
+        if self._tiles == None:
+            return
+
+        bind = self._tiles["bind"]
+        for tiles in (self._shown, self._parked):
+            for key, (tile, item) in list(tiles.items()):
+                if bind != None:
+                    bind(tile, *key)
+                else:
+                    # Without bind a tile can only be built again
+                    self._canvas.delete(item)
+                    tile.destroy()
+                    del tiles[key]
+        self._realize_tiles()
+
+    def clear_tiles(self):
+        "Destroy the tiles and show the viewPort again"
+        if self._tiles == None:
+            return
+
+        for tile, item in list(self._shown.values()) + list(self._parked.values()):
+            self._canvas.delete(item)
+            tile.destroy()
+
+        self._shown, self._parked, self._tiles = {}, OrderedDict(), None
+        self._show_hscrollbar(False)
+        self._canvas.itemconfigure(self._canvas_frame, state="normal")
+        self._resize_window()
+
+    def _view(self, horizontal):
+        return self._canvas.xview() if horizontal else self._canvas.yview()
+
+    def scroll_by(self, pixels, horizontal=False):
+        """Scroll by pixels in the next frames. Return False, doing nothing,
+        if the view is already at the edge in that direction."""
+        first, last = self._view(horizontal)
+        pending = self._pending[horizontal] + pixels
+
+        if (pending < 0 and first <= 0) or (pending > 0 and last >= 1):
+            self._pending[horizontal] = 0.0
+            return False
+
+        self._pending[horizontal] = pending
+        if self._scroll_job == None:
+            self._scroll_job = self.after(self._configs["frame_ms"], self._scroll_frame)
+        return True
+
+    def _scroll_frame(self):
+        self._scroll_job = None
+        canvas = self._canvas
+
+        for horizontal in (False, True):
+            pending = self._pending[horizontal]
+            if pending == 0:
+                continue
+
+            step = pending
+            if self._configs["smooth"] and abs(pending * self.easing) >= 1:
+                step = pending * self.easing
+
+            first, last = self._view(horizontal)
+            size = (canvas.winfo_width() if horizontal else canvas.winfo_height()) / (
+                (last - first) or 1
+            )
+            first = min(max(first + step / size, 0.0), 1.0 - (last - first))
+
+            if horizontal:
+                canvas.xview_moveto(first)
+            else:
+                canvas.yview_moveto(first)
+
+            at_edge = first <= 0.0 or first >= 1.0 - (last - first)
+            self._pending[horizontal] = 0.0 if at_edge else pending - step
+
+        _ScrollRouter.of(self).moved(self)
+
+        if self._pending[0] or self._pending[1]:
+            self._scroll_job = self.after(self._configs["frame_ms"], self._scroll_frame)
+
+    def mouse_wheel(self, event):
+        if self._scrollable():
+            self.scroll_by(
+                _ScrollRouter.of(self).pixels(event), bool(event.state & 0x0001)
+            )
 
-        # whenever the size of the frame changes, alter the scroll region respectively
+    @staticmethod
+    def how_it_works():
+        def factory(master):
+            row = FrameTheme(master, padding=2)
+            row.label = LabelTheme(row, width=30)
+            row.label.pack(side="left")
+            row.button = ButtonTheme(row, "Open", width=5)
+            row.button.pack(side="right")
+            return row
+
+        def bind(row, index):
+            row.label.set_text(f"Row {index:06}")
+            row.button.configure(command=lambda: print("open", index))
+
+        def tile(master, row, column):
+            tile = FrameTheme(master, padding=4, relief="ridge")
+            tile.label = LabelTheme(tile)
+            tile.label.pack(expand=True)
+            bind_tile(tile, row, column)
+            return tile
+
+        def bind_tile(tile, row, column):
+            tile.label.set_text(f"Tile {row}x{column}")
 
-    def mouse_wheel(self, event):
-        if self.winfo_height() <= self.viewPort.winfo_height() and self.is_inside():
-            self._canvas.yview_scroll(int(-1 * (event.delta / 120)), "units")
+        root = tk.Tk()
+        scroll = ScrollFrameTheme(root)
+        scroll.pack(fill="both", expand=True)
+        scroll.set_virtual(100000, factory, bind)
+
+        tiles = ScrollFrameTheme(tk.Toplevel(root))
+        tiles.pack(fill="both", expand=True)
+        tiles.set_tiles(1000, 1000, tile, 160, 90, bind_tile, budget=200)
+        root.mainloop()
 
 
 class PreLoadAplication(tk.Tk):
@@ -1857,6 +4236,7 @@ class TableTheme(ttk.Treeview):
         super().__init__(master, cursor="hand2", takefocus=False, **kw)
 
         self._columns = []
+        self._formatters = {}
         self._menu_to_show = False
 
         if heads != None:
@@ -1915,14 +4295,47 @@ class TableTheme(ttk.Treeview):
 
         self._menu.add_command(label, lambda: command(self.get_selected()), **kw)
 
+    def _column_index(self, column):
+        """Internal function. Index in rows of a column given by index or head."""
+        if isinstance(column, int):
+            return column
+        return self._columns.index(column)
+
+    def set_formatter(self, column, formatter):
+        """Format the values of a column when rows are added.
+
+        Args:
+            column (int or str): index of the value in rows or the head text
+            formatter (MaskFormatter, DateFormat or str): a formatter or an
+                EntryTheme mask
+        """
+        if isinstance(formatter, str):
+            formatter = MaskFormatter.of(formatter)
+
+        self._formatters[self._column_index(column)] = formatter
+
     def add_row(self, row, iid=None, parent=None, **kw):
+        if self._formatters:
+            row = list(row)
+            for index, formatter in self._formatters.items():
+                row[index] = formatter.format(row[index])
+
         self.insert(
             "" if parent == None else parent, "end", iid, text=row[0], values=row[1:]
         )
 
     def add_rows(self, rows, parent=None):
+        if self._formatters:
+            rows = [list(row) for row in rows]
+            # A whole column is formatted at once
+            for index, formatter in self._formatters.items():
+                column = formatter.format_many([row[index] for row in rows])
+                for row, value in zip(rows, column):
+                    row[index] = value
+
+        parent = "" if parent == None else parent
         for row in rows:
-            self.add_row(row)
+            self.insert(parent, "end", text=row[0], values=row[1:])
 
     def add_column(self, head):
         self.column(head)
@@ -1932,6 +4345,7 @@ class TableTheme(ttk.Treeview):
         self.column("#0")
         self.heading("#0", text=heads[0])
         self["columns"] = heads[1:]
+        self._columns = list(heads)
         for head in heads[1:]:
             self.add_column(head)
 
@@ -1971,6 +4385,291 @@ class TableTheme(ttk.Treeview):
         root.mainloop()
 
 
+class FormSchema:
+    """
+    A declarative FormTheme layout, validated and compiled once into a build
+    plan. Plans are cached by the schema, so building the same form again
+    only replays the plan. Callbacks and other values out of JSON are not
+    part of the cache key, a schema with new lambdas uses the same plan.
+
+    schema = {
+        'configs': {'width_label': 20},
+        'items': [
+            {'type': 'title', 'text': 'Client'},
+            {'type': 'entry', 'name': 'name', 'label': 'Name: ', 'required': True},
+            {'type': 'field', 'text': 'Address', 'items': [
+                {'type': 'entry', 'name': 'city', 'label': 'City: '},
+            ]},
+            {'type': 'button', 'name': 'submit', 'text': 'Submit', 'command': submit},
+        ],
+        'states': {
+            'reading': {'elements': {'name': 'disabled'}, 'buttons': {'submit': 'disabled'}}
+        },
+    }
+
+    form = FormTheme.from_schema(master, schema)
+
+    The type of an item is the name of the FormTheme method without 'add_',
+    'field' starts a field with its own items. The other keys are the
+    arguments of the method. The schema may be a JSON string, callbacks can
+    only be given in a dict.
+
+    Args:
+        schema (dict or str)
+    """
+
+    # type: (method, positional arguments, required arguments)
+    _types = {
+        "line": ("add_line", (), 0),
+        "spacer": ("add_spacer", ("plane", "padding"), 2),
+        "line_buttons": ("add_line_buttons", (), 0),
+        "title": ("add_title", ("text",), 1),
+        "subtitle": ("add_subtitle", ("text",), 1),
+        "info": ("add_info", ("text",), 1),
+        "image": ("add_image", ("image", "size"), 2),
+        "entry": ("add_entry", ("name", "label"), 1),
+        "textarea": ("add_textarea", ("name", "label"), 1),
+        "log": ("add_log", ("label",), 0),
+        "calendar": ("add_calendar", ("name", "label"), 1),
+        "picker": ("add_picker", ("name", "label", "picker"), 1),
+        "check": ("add_check", ("name", "label", "callback"), 2),
+        "option": ("add_option", ("name", "label", "items", "callback"), 1),
+        "radio": ("add_radio", ("name", "label", "items", "callback"), 1),
+        "separator": ("add_separator", (), 0),
+        "button": ("add_button", ("name", "text", "command"), 3),
+        "link": ("add_link", ("text", "command"), 1),
+    }
+    _elements = ("entry", "textarea", "calendar", "picker", "check", "option", "radio")
+    _cache = OrderedDict()
+    # Plans kept, the least used are compiled again when needed
+    cache_size = 128
+    # Place of a value out of JSON in a cached plan
+    _slot = "__formschema_slot__"
+
+    def __init__(self, schema):
+        if isinstance(schema, str):
+            schema = json.loads(schema)
+
+        unknown = set(schema) - {"configs", "items", "states"}
+        if unknown:
+            raise ValueError(f"schema keys -{sorted(unknown)} not valid!")
+
+        self.configs = dict(schema.get("configs", {}))
+        self.elements = []
+        self.buttons = []
+        self.steps = []
+
+        self._compile(schema.get("items", []), "items")
+        self.steps = tuple(self.steps)
+        self._values = ()
+
+        self.states = {}
+        for name, state_map in schema.get("states", {}).items():
+            self.states[name] = self._compile_state(name, state_map)
+
+    @classmethod
+    def of(cls, schema):
+        "Return the plan compiled for schema, compiling it only once"
+        if isinstance(schema, cls):
+            return schema
+
+        values = []
+        if isinstance(schema, str):
+            key = schema
+        else:
+            # The values out of JSON, like callbacks, are left in slots
+            key = json.dumps(
+                schema,
+                sort_keys=True,
+                default=lambda value: {
+                    cls._slot: values.append(value) or len(values) - 1
+                },
+            )
+
+        plan = cls._cache.get(key)
+        if plan == None:
+            plan = cls._cache[key] = cls(key)
+            if len(cls._cache) > cls.cache_size:
+                cls._cache.popitem(last=False)
+        else:
+            cls._cache.move_to_end(key)
+
+        if not values:
+            return plan
+
+        # The cached plan with the values of this schema
+        bound = object.__new__(cls)
+        bound.__dict__.update(plan.__dict__)
+        bound._values = tuple(values)
+        bound.configs = bound._fill(plan.configs)
+        return bound
+
+    def _fill(self, value):
+        "Internal function. Put the values of the schema in their slots"
+        if isinstance(value, dict):
+            if len(value) == 1 and self._slot in value:
+                return self._values[value[self._slot]]
+            return {key: self._fill(item) for key, item in value.items()}
+        elif isinstance(value, (list, tuple)):
+            return type(value)(self._fill(item) for item in value)
+        return value
+
+    def calls(self):
+        "Return the (method, args, kw) of the plan with the values of its schema"
+        if not self._values:
+            return [(method, args, dict(kw)) for method, args, kw in self.steps]
+        return [
+            (method, self._fill(args), self._fill(kw))
+            for method, args, kw in self.steps
+        ]
+
+    def _compile(self, items, where):
+        for i, item in enumerate(items):
+            item = dict(item)
+            place = f"{where}[{i}]"
+            kind = item.pop("type", None)
+
+            if kind == "field":
+                if "text" not in item:
+                    raise ValueError(f"{place}: field needs a 'text'")
+                children = item.pop("items", [])
+                self.steps.append(("start_field", (item.pop("text"),), item))
+                self._compile(children, place + ".items")
+                self.steps.append(("close_field", (), {}))
+                continue
+
+            if kind not in self._types:
+                raise ValueError(f"{place}: type -{kind} not valid!")
+
+            method, positional, required = self._types[kind]
+            missing = [key for key in positional[:required] if key not in item]
+            if missing:
+                raise ValueError(f"{place}: {kind} needs {missing}")
+
+            args = []
+            for key in positional:
+                if key not in item:
+                    break
+                args.append(item.pop(key))
+
+            if kind in self._elements:
+                self._add_name(self.elements, args[0], place)
+            elif kind == "button":
+                self._add_name(self.buttons, args[0], place)
+
+            self.steps.append((method, tuple(args), item))
+
+    def _add_name(self, names, name, place):
+        if name in self.elements or name in self.buttons:
+            raise ValueError(f"{place}: name -{name} already used!")
+        names.append(name)
+
+    def _compile_state(self, name, state_map):
+        for group, states in state_map.items():
+            if group not in ("elements", "buttons"):
+                raise ValueError(
+                    f"state -{name}: -{group} not valid! Use 'elements' or 'buttons'"
+                )
+            names = self.elements if group == "elements" else self.buttons
+            for item, state in states.items():
+                if item not in names:
+                    raise ValueError(f"state -{name}: item -{item} not defined!")
+                if state not in ("active", "disabled"):
+                    raise ValueError(f"state -{name}: -{state} for -{item} is wrong!")
+
+        return {group: dict(states) for group, states in state_map.items()}
+
+    def build(self, form):
+        "Add the compiled layout and states to form"
+        for method, args, kw in self.calls():
+            getattr(form, method)(*args, **kw)
+
+        for name, state_map in self.states.items():
+            form._states[name] = state_map
+        form._forget_transitions()
+
+        return form
+
+    @staticmethod
+    def benchmark(n=20, fields=40):
+        """Compare n builds of a form with fields entries made with the
+        FormTheme methods against compiling its schema once and building it
+        n times. Print and return the times in seconds."""
+        root = tk.Tk()
+        root.withdraw()
+
+        def imperative():
+            form = FormTheme(root)
+            form.add_title("Benchmark")
+            for i in range(fields):
+                form.add_entry(f"field{i}", f"Field {i}: ", required=i % 2 == 0)
+            form.add_button("submit", "Submit", lambda: None)
+            form.new_state("reading", {"buttons": {"submit": "disabled"}})
+            return form
+
+        schema = {
+            "items": [{"type": "title", "text": "Benchmark"}]
+            + [
+                {
+                    "type": "entry",
+                    "name": f"field{i}",
+                    "label": f"Field {i}: ",
+                    "required": i % 2 == 0,
+                }
+                for i in range(fields)
+            ]
+            + [
+                {"type": "button", "name": "submit", "text": "Submit", "command": print}
+            ],
+            "states": {"reading": {"buttons": {"submit": "disabled"}}},
+        }
+
+        times = {}
+
+        start = time.perf_counter()
+        for i in range(n):
+            imperative().destroy()
+        times["imperative"] = time.perf_counter() - start
+
+        FormSchema._cache.clear()
+        start = time.perf_counter()
+        FormSchema.of(schema)
+        times["compile"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for i in range(n):
+            FormTheme.from_schema(root, schema).destroy()
+        times["schema"] = time.perf_counter() - start
+
+        root.destroy()
+
+        for key, value in times.items():
+            print(f"{key:>10}: {value * 1000:9.2f} ms")
+        return times
+
+
+def _recordable(group=None):
+    """Internal decorator. While a lazy FormTheme section is being declared,
+    record the call of the decorated add_* method in the section instead of
+    creating its widgets. group is 'elements' or 'buttons' when the method
+    creates one."""
+
+    def decorator(method):
+        @wraps(method)
+        def wrapper(self, *args, **kw):
+            section = self._recording
+            if section == None:
+                return method(self, *args, **kw)
+
+            section["specs"].append((method.__name__, args, dict(kw)))
+            if group != None:
+                self._record(group, method.__name__, section, args, kw)
+
+        return wrapper
+
+    return decorator
+
+
 class FormTheme(FrameTheme):
     """
     self._configs = {
@@ -1999,10 +4698,30 @@ class FormTheme(FrameTheme):
             'width_entry' : 15,
 
             'message_require' : "Fill th== field!",
-            'padding' : 2
+            'padding' : 2,
+
+            'lazy' : False,
+            'frame_ms' : 16,
+            'layout' : 'pack'
         }
+
+    With layout 'flat' the labels and fields are placed in one grid in the
+    form or field, instead of a frame for each line with a label for the
+    required mark, which is added to the label text. The methods are the
+    same, add_line returns the grid frame.
+
+    With lazy True the items added inside start_field and close_field are
+    recorded and only created when the field is visible or expanded, or when
+    one of its widgets is requested with form[name], element or button. The
+    add_* methods return None for them. Values and states set meanwhile are
+    kept and applied when they are created.
     """
 
+    # Pools of the submit buttons, created when first used
+    _executors = {"thread": None, "process": None}
+    # Time between two checks of a running submit
+    _submit_poll_ms = 20
+
     def __init__(self, master, *args, **kw):
         self._configs = {
             #'color' : '',
@@ -2028,22 +4747,85 @@ class FormTheme(FrameTheme):
             "require_blank_fields": True,
             "message_require": "Fill this field!",
             "padding": 2,
+            "lazy": False,
+            "frame_ms": 16,
+            "layout": "pack",
         }
         self._update(self._configs, kw)
 
+        if self._configs["layout"] not in ["pack", "flat"]:
+            raise (AttributeError(f"layout -{self._configs['layout']} not valid!"))
+
         self._master = master
         self._sections = {}
         self._elements = {}
         self._buttons = {}
         self._states = {}
+        self._submit_configs = {}
+        self._submits = {}
+        # States to give back when the last submit running ends
+        self._busy = None
 
         self._field = False
         self._frame_field = None
+        self._line = None
+        self._line_buttons = None
+
+        # Flat layout, next row of each grid and place in the row
+        self._grid_rows = {}
+        self._row = 0
+        self._column = 0
+        self._buttons_line = None
+
+        # Values of the elements, followed by traces of the widgets
+        self._model = {}
+        self._baseline = {}
+        self._dirty = set()
+        self._stale = set()
+        # TextareaTheme elements loading their file, it is their baseline
+        self._loading = set()
+
+        # Batches of values and listeners of the changes
+        self._listeners = []
+        self._batch_depth = 0
+        self._batch_old = {}
+        self._touched = set()
+        self._muted_widgets = {}
+        self._muted = 0
+
+        # Computed elements
+        self._computed = {}
+        self._dependents = {}
+        self._compute_order = {}
+        self._closures = {}
+        self._compute_pending = set()
+        self._compute_job = None
+        self._computing = False
+
+        # Lazy sections
+        self._pending_states = {}
+
+        # Known state of each widget and changes between named states
+        self._widget_states = {}
+        self._compiled_states = {}
+        self._transitions = {}
+        self._current_state = None
+        self._recording = None
+        self._realizing = False
+        self._visible_job = None
 
         super().__init__(master, padding=10, *args, **kw)
 
+        if self._configs["lazy"]:
+            self.bind("<Map>", self._watch_visibility, True)
+            self.bind("<Configure>", self._watch_visibility, True)
+            EventDispatcher.of(self).subscribe_toplevel(
+                "<Configure>", self, self._watch_visibility
+            )
+
     def __getitem__(self, key):
         try:
+            self._realize_element(key)
             return self._elements[key]
         except KeyError:
             raise (KeyError("Element -" + key + "not found!"))
@@ -2067,26 +4849,485 @@ class FormTheme(FrameTheme):
             "widget": widget,
         }
 
-        assert name not in self._elements, f"Element -{name} already created!"
+        recorded = self._elements.get(name)
+        if recorded != None and recorded["widget"] == None:
+            # A lazy element realized, with the value and state it got meanwhile
+            recorded["widget"] = widget
+            element = recorded
+            clean = name not in self._dirty
+            value = self._model[name]
+            built = recorded["value"]
+            if built == None:
+                kind = self._sections[recorded["section"]]["kinds"][name]
+                built = self._empty_value(kind)
+            # Built with its default value, the one set meanwhile is applied
+            if value != None and value != built:
+                widget.set_value(value)
+            self._take_value(name, widget, clean=clean)
+            self._apply_pending_state("elements", name)
+        else:
+            assert name not in self._elements, f"Element -{name} already created!"
+            self._forget_transitions()
+            self._take_value(name, widget, clean=True)
+
+        self._watch(name, widget)
 
         if element["help_text"] != None:
             HelpTheme(widget, text=element["help_text"])
 
         self._elements[name] = element
 
+    def _take_value(self, name, widget, clean):
+        """Internal function. Take the value of a new widget in the model, as
+        the widget formats it. If clean it is the unchanged value too."""
+        if isinstance(widget, TextareaTheme) and widget.loading():
+            # Read only when requested, the file is still loading
+            self._model[name] = self._baseline[name] = None
+            self._stale.add(name)
+            self._loading.add(name)
+            return
+
+        self._model[name] = widget.get_value()
+        if clean:
+            self._baseline[name] = self._model[name]
+        if self._model[name] != self._baseline[name]:
+            self._dirty.add(name)
+        else:
+            self._dirty.discard(name)
+
     def _append_button(self, name, widget):
         """Append button in form's buttons."""
 
-        assert name not in self._buttons, f"Button -{name} already created!"
+        assert self._buttons.get(name, None) == None, f"Button -{name} already created!"
 
+        if name not in self._buttons:
+            self._forget_transitions()
         self._buttons[name] = widget
+        self._apply_pending_state("buttons", name)
+
+    def _record(self, group, method, section, args, kw):
+        """Internal function. Keep the place of an element or button of a lazy
+        section, with its value in the model until it is realized."""
+        name = args[0] if args else kw["name"]
+        self._forget_transitions()
+
+        if group == "buttons":
+            assert name not in self._buttons, f"Button -{name} already created!"
+            self._buttons[name] = None
+            section["kinds"][name] = method
+            return
+
+        assert name not in self._elements, f"Element -{name} already created!"
+        section["kinds"][name] = method
+        value = kw.get("value", None)
+        self._elements[name] = {
+            "required": kw.get("required", False),
+            "help_text": kw.get("help_text", None),
+            "value": value,
+            "widget": None,
+            "section": section["name"],
+        }
+        value = value if value != None else self._empty_value(method)
+        self._model[name] = self._baseline[name] = value
+
+        if method == "add_textarea" and kw.get("file") != None:
+            # Its value is the file, read by the widget when requested
+            self._elements[name]["file"] = kw["file"]
+            self._model[name] = self._baseline[name] = None
+            self._stale.add(name)
+
+    @staticmethod
+    def _empty_value(method):
+        "Internal function. The value of an element created without value"
+        if method == "add_check":
+            return False
+        elif method == "add_calendar":
+            return date.today().isoformat()
+        return ""
+
+    def _apply_pending_state(self, group, name):
+        state = self._pending_states.pop((group, name), None)
+        if state != None:
+            self._set_widget_state(group, name, state)
+
+    def _set_widget_state(self, group, name, state):
+        """Internal function. Set 'active' or 'disabled' to an element or a
+        button, keeping it for when it is realized in lazy sections."""
+        if group == "elements":
+            widget = self._elements[name]["widget"]
+        else:
+            widget = self._buttons[name]
+
+        if state not in ("active", "disabled"):
+            kind = "" if group == "elements" else "button "
+            raise (AttributeError(f"state -{state} set for {kind}-{name} == wrong!"))
+
+        if widget == None:
+            self._pending_states[(group, name)] = state
+        elif state == "active":
+            widget.active()
+        else:
+            widget.disable()
+
+        self._widget_states[(group, name)] = state
+
+    def _watch(self, name, widget):
+        """Internal function. Follow the value of the widget in the model by
+        the trace of its variable, or the modifications of a TextareaTheme."""
+        if isinstance(widget, TextareaTheme):
+            # Reading a big text on every key would be slow, it is read by get
+            widget.text.bind("<<Modified>>", lambda e: self._stale.add(name), True)
+            widget.bind("<<Loaded>>", lambda e: self._file_loaded(name), True)
+        else:
+            widget.value.trace_add("write", lambda *args: self._on_trace(name))
+
+    def _on_trace(self, name):
+        if self._muted > 0:
+            # Read now, out of the changes of the batch around
+            self._store(name, self._elements[name]["widget"].get_value())
+        elif self._batch_depth > 0:
+            # Read once at the end of the batch
+            self._touched.add(name)
+        else:
+            self._store(name, self._elements[name]["widget"].get_value())
+
+    def _store(self, name, value):
+        "Internal function. Update the model and the dirty elements"
+        old = self._model[name]
+        self._model[name] = value
+        if value != self._baseline[name]:
+            self._dirty.add(name)
+        else:
+            self._dirty.discard(name)
+        self._changed(name, old)
+
+    def _changed(self, name, old):
+        """Internal function. Tell the listeners that name changed, or keep its
+        first value to summarize the batch"""
+        if self._muted > 0:
+            # Not an edit, but the elements computed from it change
+            if old != self._model[name]:
+                self._compute_later([name])
+            return
+        elif self._batch_depth > 0:
+            self._batch_old.setdefault(name, old)
+        elif old != self._model[name]:
+            self._notify({name: (old, self._model[name])})
+
+    def _notify(self, changes):
+        for listener in list(self._listeners):
+            listener(changes)
+
+    def add_listener(self, callback):
+        """
+        Call callback(changes) when values change. changes is a dict like
+        {'element_name': (old_value, new_value)}, with every element changed
+        by a batch or set_values at once.
+
+        TextareaTheme edits are not followed key by key, they are reported
+        by the batches that set them.
+        """
+        self._listeners.append(callback)
+
+    def remove_listener(self, callback):
+        self._listeners.remove(callback)
+
+    @contextmanager
+    def batch(self):
+        """Apply many values at once. The validation and the callbacks of the
+        widgets and the traces of the form are suspended until the end, then
+        the widgets changed run their callback once and the listeners get one
+        summary of the changes.
+
+        with form.batch():
+            form.set_default_values('name', 'Ana')
+            form.reset()
+        """
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0:
+                self._end_batch()
+
+    @contextmanager
+    def muted(self):
+        """A batch of values set by the program, like the records of a
+        RecordNavigator or the computed elements. The model and the dirty
+        elements are updated, but the listeners are not told, so the values
+        are not taken as edits of the user.
+
+        with form.muted():
+            form.set_values(record)
+        """
+        self._muted += 1
+        try:
+            with self.batch():
+                yield self
+        finally:
+            self._muted -= 1
+
+    def _end_batch(self):
+        # The widgets set are read as part of the batch, for one summary
+        touched, self._touched = self._touched, set()
+        self._batch_depth += 1
+        try:
+            for name in touched:
+                self._store(name, self._elements[name]["widget"].get_value())
+        finally:
+            self._batch_depth -= 1
+
+        muted, self._muted_widgets = self._muted_widgets, {}
+        for widget in muted.values():
+            widget.unmute()
+
+        old, self._batch_old = self._batch_old, {}
+        changes = {
+            name: (value, self._model[name])
+            for name, value in old.items()
+            if value != self._model[name]
+        }
+        if changes:
+            self._notify(changes)
+
+    def compute(self, name, formula, depends):
+        """
+        Compute the value of element name from other elements.
+
+        form.compute('total', lambda price, qty: price * qty, ['price', 'qty'])
+
+        formula gets the values of depends in order. When some of them
+        change, only the computed elements depending on them, directly or
+        not, are computed again, once per frame and in the order of their
+        dependencies.
+
+        Args:
+            name (str) element that shows the value
+            formula (function) formula(*values) returns the value
+            depends (list) names of the elements used, computed or not
+        """
+        for item in [name] + list(depends):
+            if item not in self._elements:
+                raise (KeyError(f"Element -{item} not found!"))
+
+        graph = dict(self._computed)
+        graph[name] = (formula, tuple(depends))
+        dependents, order = self._sort_computed(graph)
+
+        self._computed, self._dependents = graph, dependents
+        self._compute_order = {item: i for i, item in enumerate(order)}
+        self._closures = {}
+
+        if len(graph) == 1:
+            self.add_listener(self._on_compute_change)
+
+        self._compute_pending.add(name)
+        self._schedule_compute()
+
+    @staticmethod
+    def _sort_computed(graph):
+        """Internal function. The computed elements of each element and the
+        order to compute them, dependencies first"""
+        dependents = {}
+        waiting = {}
+        for name, (formula, depends) in graph.items():
+            waiting[name] = sum(1 for item in depends if item in graph)
+            for item in depends:
+                dependents.setdefault(item, []).append(name)
+
+        ready = [name for name, count in waiting.items() if count == 0]
+        order = []
+        while ready:
+            name = ready.pop()
+            order.append(name)
+            for item in dependents.get(name, []):
+                waiting[item] -= 1
+                if waiting[item] == 0:
+                    ready.append(item)
+
+        if len(order) != len(graph):
+            cycle = sorted(name for name in graph if name not in order)
+            raise (ValueError(f"computed elements -{cycle} depend on each other!"))
+
+        return dependents, order
+
+    def _closure(self, name):
+        "Internal function. Every computed element depending on name"
+        closure = self._closures.get(name)
+        if closure == None:
+            closure = set()
+            stack = [name]
+            while stack:
+                for item in self._dependents.get(stack.pop(), []):
+                    if item not in closure:
+                        closure.add(item)
+                        stack.append(item)
+            self._closures[name] = closure = frozenset(closure)
+        return closure
+
+    def _on_compute_change(self, changes):
+        self._compute_later(changes)
+
+    def _compute_later(self, names):
+        "Internal function. Compute in the next frame the elements using names"
+        if self._computing or not self._computed:
+            return
+        for name in names:
+            self._compute_pending |= self._closure(name)
+        if self._compute_pending:
+            self._schedule_compute()
+
+    def _schedule_compute(self):
+        if self._compute_job == None:
+            self._compute_job = self.after(self._configs["frame_ms"], self.recompute)
+
+    def recompute(self, names=None):
+        """Compute now the elements waiting for it, or names (every computed
+        element if names is True)"""
+        if self._compute_job != None:
+            self.after_cancel(self._compute_job)
+            self._compute_job = None
+
+        if names == True:
+            names = self._computed
+        for name in names or []:
+            if name not in self._computed:
+                raise (KeyError(f"Element -{name} not computed!"))
+        pending = self._compute_pending | set(names or [])
+        self._compute_pending = set()
+
+        # Values computed in the batch, the model is updated at its end
+        values = {}
+        self._computing = True
+        try:
+            # Computed values are not edits of the user, for the listeners
+            with self.muted():
+                for name in sorted(pending, key=self._compute_order.get):
+                    formula, depends = self._computed[name]
+                    arguments = [
+                        (
+                            values[item]
+                            if item in values
+                            else self._get_element_value(item)
+                        )
+                        for item in depends
+                    ]
+                    try:
+                        values[name] = formula(*arguments)
+                    except Exception as e:
+                        self._root().report_callback_exception(
+                            type(e), e, e.__traceback__
+                        )
+                        continue
+                    clean = name not in self._dirty
+                    self._set_element_value(name, values[name])
+                    if clean:
+                        # Computed from clean values, it is clean too
+                        self._baseline[name] = self._model[name]
+                        self._dirty.discard(name)
+        finally:
+            self._computing = False
+
+    def set_values(self, values):
+        """
+        Set the values of many elements in one batch, see batch.
+
+        Args:
+            values (dict) like {'element_name':'element_value'}
+        """
+        with self.batch():
+            for name, value in values.items():
+                self._set_element_value(name, value)
+
+    def _file_loaded(self, name):
+        "Internal function. The file of a TextareaTheme is the unchanged value"
+        if name in self._loading:
+            self._loading.discard(name)
+            self._stale.discard(name)
+            self._dirty.discard(name)
+            value = self._elements[name]["widget"].get_value()
+            self._model[name] = self._baseline[name] = value
+
+    def _load_file(self, name):
+        """Internal function. Load the file of a TextareaTheme element again,
+        when it is realized in a lazy section"""
+        element = self._elements[name]
+        self._dirty.discard(name)
+        self._stale.add(name)
+        self._loading.add(name)
+        if element["widget"] != None:
+            element["widget"].load(element["file"])
+
+    def _read_stale(self, name):
+        """Internal function. Read the value of a TextareaTheme, edited since
+        it was read."""
+        if self._elements[name]["widget"] == None:
+            # The file of a lazy section, it is read by the widget
+            self._realize_element(name)
+        self._stale.discard(name)
+        widget = self._elements[name]["widget"]
+        self._model[name] = widget.get_value()
+        if name in self._loading:
+            # Still loading and not editable, the value is the file
+            self._loading.discard(name)
+            self._baseline[name] = self._model[name]
+        if self._model[name] != self._baseline[name]:
+            self._dirty.add(name)
+        else:
+            self._dirty.discard(name)
+
+    def _refresh_stale(self):
+        for name in list(self._stale):
+            self._read_stale(name)
 
-    def _require_value(self, name):
+    def _get_element_value(self, name):
+        if name in self._stale:
+            self._read_stale(name)
+        return self._model[name]
+
+    def _set_element_value(self, name, value):
+        widget = self._elements[name]["widget"]
+        if widget != None:
+            if (
+                self._batch_depth > 0
+                and hasattr(widget, "mute")
+                and str(widget) not in self._muted_widgets
+            ):
+                widget.mute()
+                self._muted_widgets[str(widget)] = widget
+
+            widget.set_value(value)
+
+            if isinstance(widget, TextareaTheme):
+                # Not traced, its value is cached after set_value
+                self._stale.discard(name)
+                self._loading.discard(name)
+                self._store(name, widget.get_value())
+            return
+
+        # A lazy element, the value given replaces the file of a textarea
+        self._stale.discard(name)
+        self._loading.discard(name)
+        if value == None:
+            self._store(
+                name,
+                self._empty_value(
+                    self._sections[self._elements[name]["section"]]["kinds"][name]
+                ),
+            )
+        else:
+            self._store(name, value)
+
+    def _require_value(self, name, message=None):
         """Internal function. If value in name input == empty"""
         if not self._configs["require_blank_fields"]:
             return
 
-        message = self._configs["message_require"]
+        self._realize_element(name)
+
+        if message == None:
+            message = self._configs["message_require"]
         if self._elements[name]["help_text"] != None:
             message += "\n  " + self._elements[name]["help_text"]
 
@@ -2097,11 +5338,57 @@ class FormTheme(FrameTheme):
             background="cornsilk2",
         )
 
+    def _place(self, widget, kind="field", **kw):
+        """Internal function. Pack widget in the line, or in the flat layout
+        grid it in the row: 'label' in the first column, 'field' from the
+        second on and 'full' over the rest of the row. kw are options of
+        pack."""
+        if self._configs["layout"] != "flat":
+            widget.pack(**kw)
+            return
+
+        grid = {key: kw[key] for key in ("padx", "pady", "ipadx", "ipady") if key in kw}
+        fill = kw.get("fill", None)
+        sticky = {"x": "we", "y": "ns", "both": "nsew"}.get(fill, "w")
+
+        if kind == "full":
+            # From its place in the row to the last column of the grid
+            span = max(self._line.grid_size()[0] - self._column, 2 - self._column, 1)
+            widget.grid(
+                row=self._row,
+                column=self._column,
+                columnspan=span,
+                sticky=sticky,
+                **grid,
+            )
+            self._column += span
+            return
+
+        column = self._column if kind == "label" else max(self._column, 1)
+        widget.grid(row=self._row, column=column, sticky=sticky, **grid)
+        self._column = column + 1
+
+        if fill == "both" and kw.get("expand", False):
+            self._line.rowconfigure(self._row, weight=1)
+
     def _add_label(self, label, options, *args):
         """Internal function. Alocate label left size in actual frame."""
         if options["new_line"]:
             self.add_line()
 
+        if self._configs["layout"] == "flat":
+            # The required mark is in the label, without labels for spaces
+            if label != None or options["required"]:
+                mark = "* " if options["required"] else ""
+                widget = LabelTheme(
+                    self._line,
+                    text=mark + (label if label != None else ""),
+                    width=self._configs["width_label"],
+                    font=self._configs["font_label"],
+                )
+                self._place(widget, "label")
+            return
+
         if options["required"]:
             LabelTheme(self._line, text="*", width=1, foreground="red").pack(
                 side="left"
@@ -2117,6 +5404,7 @@ class FormTheme(FrameTheme):
                 font=self._configs["font_label"],
             ).pack(side="left")
 
+    @_recordable()
     def add_line(self, *args, **kw):
         """
         Add a new line to form
@@ -2128,6 +5416,16 @@ class FormTheme(FrameTheme):
         options = {}
         self._update(options, kw)
 
+        if self._configs["layout"] == "flat":
+            # A new row of the grid, not a frame
+            master = self._frame_field if self._field else self
+            row = self._grid_rows.get(str(master), 0)
+            if row == 0:
+                master.columnconfigure(1, weight=1)
+            self._grid_rows[str(master)] = row + 1
+            self._line, self._row, self._column = master, row, 0
+            return self._line
+
         self._line = FrameTheme(
             master=self._frame_field if self._field else self,
             padding=self._configs["padding"],
@@ -2138,6 +5436,7 @@ class FormTheme(FrameTheme):
 
         return self._line
 
+    @_recordable()
     def add_spacer(self, plane, padding, *args, **kw):
         """Add padding between widgets
 
@@ -2151,15 +5450,18 @@ class FormTheme(FrameTheme):
         if plane == "vertical":
             self.add_line()
             widget = LabelTheme(self._line, text=" ")
-            widget.pack(pady=padding, side="left", fill="y", expand=True)
+            self._place(
+                widget, "full", pady=padding, side="left", fill="y", expand=True
+            )
         elif plane == "horizontal":
             widget = LabelTheme(self._line, text=" ")
-            widget.pack(padx=padding, side="left", fill="x", expand=True)
+            self._place(widget, padx=padding, side="left", fill="x", expand=True)
         else:
             raise (AttributeError("plane -" + plane + " not valid!"))
 
         return widget
 
+    @_recordable()
     def add_line_buttons(self, *args, **kw):
         """
         Add a line for buttons.
@@ -2175,38 +5477,219 @@ class FormTheme(FrameTheme):
         }
         self._update(options, kw)
 
+        master = self._frame_field if options["in_field"] and self._field else self
+        if self._configs["layout"] == "flat":
+            # Its own row in the grid of master
+            field, self._field = self._field, master is not self
+            self.add_line()
+            self._field = field
+
         self._line_buttons = FrameTheme(
-            master=self._frame_field if options["in_field"] and self._field else self,
+            master=master,
             padding=self._configs["padding"],
             *args,
             **kw,
         )
 
-        self._line_buttons.pack(fill="x", side="top")
+        self._place(self._line_buttons, "full", fill="x", side="top")
 
         return self._line_buttons
 
+    @_recordable()
     def start_field(self, text, *args, **kw):
         """
         Start a Field.
         Args:
             text (str) Text to show in field
+
+        Options:
+            name (str) name of the section. Default text
+            collapsed (bool) show a toggle to expand and collapse the field,
+                starting collapsed if True. Default None, without toggle
+
+        In a lazy form the items of the field are only created when it is
+        visible or expanded, or when one of its widgets is requested.
         Return
             A LabelFrameTheme
         """
+        options = {"name": text, "collapsed": None}
+        self._update(options, kw)
+
         self.add_line()
         self._field = True
         self._frame_field = LabelFrameTheme(
             master=self._line, text=text, padding=self._configs["padding"], *args, **kw
         )
-        self._frame_field.pack(fill="x", side="top")
+        self._place(self._frame_field, "full", fill="x", side="top")
+
+        if self._realizing or (
+            not self._configs["lazy"] and options["collapsed"] == None
+        ):
+            return self._field
+
+        assert (
+            options["name"] not in self._sections
+        ), f"Section -{options['name']} already created!"
+
+        section = {
+            "name": options["name"],
+            "frame": self._frame_field,
+            "body": self._frame_field,
+            "specs": [],
+            "kinds": {},
+            "realized": not self._configs["lazy"],
+            "collapsed": bool(options["collapsed"]),
+        }
+        self._sections[options["name"]] = section
+
+        if options["collapsed"] != None:
+            toggle = LabelTheme(
+                self._frame_field,
+                text=text,
+                cursor="hand2",
+                font=self._configs["font_label"],
+            )
+            toggle.bind("<Button-1>", lambda e: self.toggle_field(options["name"]))
+            self._frame_field.configure(labelwidget=toggle)
+            section["toggle"] = toggle
+            section["text"] = text
+
+            section["body"] = FrameTheme(self._frame_field)
+            if not section["collapsed"]:
+                section["body"].pack(fill="x", side="top")
+            self._frame_field = section["body"]
+            self._show_toggle(section)
+
+        # Where the items go, restored to realize them later
+        section["cursors"] = self._save_cursors()
+        if not section["realized"]:
+            self._recording = section
+
         return self._field
 
     def close_field(self):
+        self._recording = None
         self._field = False
         self._frame_field = None
         self.add_line()
 
+    def _show_toggle(self, section):
+        sign = "+" if section["collapsed"] else "-"
+        section["toggle"].configure(text=f"{sign} {section['text']}")
+
+    def expand_field(self, name):
+        "Expand a collapsible field, creating its items in a lazy form"
+        section = self._sections[name]
+        if section["collapsed"]:
+            section["collapsed"] = False
+            section["body"].pack(fill="x", side="top")
+            self._show_toggle(section)
+            self.event_generate("<<FieldToggled>>")
+        self._realize_section(section)
+
+    def collapse_field(self, name):
+        section = self._sections[name]
+        if not section["collapsed"] and "toggle" in section:
+            section["collapsed"] = True
+            section["body"].pack_forget()
+            self._show_toggle(section)
+            self.event_generate("<<FieldToggled>>")
+
+    def toggle_field(self, name):
+        if self._sections[name]["collapsed"]:
+            self.expand_field(name)
+        else:
+            self.collapse_field(name)
+
+    def _realize_section(self, section):
+        """Internal function. Create the recorded items of a lazy section in
+        its frame, like they were added when it was declared."""
+        if section["realized"]:
+            return
+        section["realized"] = True
+
+        saved = self._save_cursors()
+        self._restore_cursors(section["cursors"])
+        self._realizing = True
+        try:
+            for method, args, kw in section["specs"]:
+                getattr(self, method)(*args, **dict(kw))
+        finally:
+            self._realizing = False
+            self._restore_cursors(saved)
+
+        section["specs"] = []
+
+    # Where the next items are placed
+    _cursors = (
+        "_field",
+        "_frame_field",
+        "_line",
+        "_line_buttons",
+        "_row",
+        "_column",
+        "_buttons_line",
+        "_recording",
+    )
+
+    def _save_cursors(self):
+        return {name: getattr(self, name) for name in self._cursors}
+
+    def _restore_cursors(self, cursors):
+        for name, value in cursors.items():
+            setattr(self, name, value)
+
+    def _realize_element(self, name):
+        element = self._elements.get(name)
+        if element != None and element["widget"] == None:
+            self._realize_section(self._sections[element["section"]])
+
+    def realize(self, name=None):
+        """Create the items of the lazy section name, or of every section if
+        name is None"""
+        sections = [self._sections[name]] if name != None else self._sections.values()
+        for section in list(sections):
+            self._realize_section(section)
+
+    def _watch_visibility(self, *args):
+        "Internal function. Look for lazy sections in the view once per idle pass"
+        if self._visible_job == None and self._recording == None:
+            self._visible_job = self.after_idle(self._realize_visible)
+
+    def _realize_visible(self):
+        """Internal function. Realize the first lazy section in the view. It is
+        called again after the new widgets are arranged, the other sections may
+        have been pushed out of the view."""
+        self._visible_job = None
+
+        # The view is the canvas of a ScrollFrameTheme or the window
+        inner, clip = self, self.master
+        while clip != None and not isinstance(clip, tk.Canvas):
+            inner, clip = clip, clip.master
+        if clip == None:
+            clip = self.winfo_toplevel()
+        elif not getattr(inner, "_form_watched", False):
+            # The window in the canvas is moved when it scrolls
+            inner._form_watched = True
+            inner.bind("<Configure>", self._watch_visibility, True)
+        top = clip.winfo_rooty()
+        bottom = top + clip.winfo_height()
+
+        for section in self._sections.values():
+            if section["realized"] or section["collapsed"]:
+                continue
+
+            frame = section["frame"]
+            if not frame.winfo_ismapped():
+                continue
+
+            y = frame.winfo_rooty()
+            if y < bottom and y + frame.winfo_height() > top:
+                self._realize_section(section)
+                self._visible_job = self.after_idle(self._realize_visible)
+                return
+
+    @_recordable()
     def add_title(self, text, *args, **kw):
         """
         Add a Label with a text.
@@ -2236,9 +5719,10 @@ class FormTheme(FrameTheme):
             padding=self._configs["padding"] * args,
             **kw,
         )
-        widget.pack(fill="x", side="left")
+        self._place(widget, "full", fill="x", side="left")
         return widget
 
+    @_recordable()
     def add_subtitle(self, text, *args, **kw):
         """
         Add a Label with a text.
@@ -2258,10 +5742,11 @@ class FormTheme(FrameTheme):
         if options["new_line"]:
             self.add_line()
         widget = LabelTheme(self._line, text=text, font=("Marsek Demi", 12, "bold"))
-        widget.pack(fill="x", padx=self._configs["padding"])
+        self._place(widget, "full", fill="x", padx=self._configs["padding"])
 
         return widget
 
+    @_recordable()
     def add_info(self, text, *args, **kw):
         """
         Add a Label with a text.
@@ -2291,10 +5776,11 @@ class FormTheme(FrameTheme):
         widget = LabelTheme(
             master=self._line, text=text, font=options["font"], *args, **kw
         )
-        widget.pack(fill="x", padx=self._configs["padding"])
+        self._place(widget, "full", fill="x", padx=self._configs["padding"])
 
         return widget
 
+    @_recordable()
     def add_image(self, image, size, *args, **kw):
         "Add a image with size (width, height) dimensions on side."
         options = {"new_line": True, "side": "right"}
@@ -2305,10 +5791,11 @@ class FormTheme(FrameTheme):
 
         widget = LabelTheme(self._line, padding=5)
         widget.set_image(image, size)
-        widget.pack(side="left", expand=True)
+        self._place(widget, "full", side="left", expand=True)
 
         return widget
 
+    @_recordable("elements")
     def add_entry(self, name, label=None, *args, **kw):
         """
         Add a Entry field with a label left.
@@ -2346,7 +5833,7 @@ class FormTheme(FrameTheme):
         widget = EntryTheme(
             master=self._line, width=options["width"], font=options["font"], *args, **kw
         )
-        widget.pack(fill="x", expand=options["expand"], ipady=1, side="left")
+        self._place(widget, fill="x", expand=options["expand"], ipady=1, side="left")
 
         if options["value"] != None:
             widget.set_value(options["value"])
@@ -2361,9 +5848,110 @@ class FormTheme(FrameTheme):
 
         return widget
 
+    @_recordable("elements")
     def add_textarea(self, name, label=None, *args, **kw):
-        raise (NotImplementedError)
+        """
+        Add a TextareaTheme field with a label left.
+
+        Args:
+            name (str)
+            label (str) text in label. If none label will not create.
+
+        Options:
+            add_textarea:
+                'new_line', 'expand', 'required', 'help_text', 'value', 'file',
+                'font', 'width', 'height'
+
+            TextareaTheme:
+                'wrap', 'chunk_size', 'encoding'
+        """
+        options = {
+            "new_line": True,
+            "expand": True,
+            "required": False,
+            "help_text": None,
+            "value": None,
+            "file": None,
+            "font": self._configs["font_entry"],
+            "width": self._configs["width_entry"],
+            "height": 6,
+        }
+        self._update(options, kw)
+
+        self._add_label(label=label, options=options)
+
+        widget = TextareaTheme(
+            master=self._line,
+            font=options["font"],
+            width=options["width"],
+            height=options["height"],
+            *args,
+            **kw,
+        )
+        self._place(widget, fill="both", expand=options["expand"], side="left")
+
+        if options["file"] != None:
+            widget.load(options["file"])
+        elif options["value"] != None:
+            widget.set_value(options["value"])
+
+        self._append_element(
+            name=name,
+            required=options["required"],
+            help_text=options["help_text"],
+            value=options["value"],
+            widget=widget,
+        )
+        # The default value, loaded again by reset
+        self._elements[name]["file"] = options["file"]
+
+        return widget
+
+    @_recordable()
+    def add_log(self, label=None, *args, **kw):
+        """
+        Add a LogConsoleTheme with a label left.
+
+        Args:
+            label (str) text in label. If none label will not create.
+
+        Options:
+            add_log:
+                'new_line', 'expand', 'follow', 'font', 'width', 'height'
+
+            LogConsoleTheme:
+                'max_lines', 'frame_ms', 'levels', 'detect_level'
 
+        Return:
+            A LogConsoleTheme widget
+        """
+        options = {
+            "new_line": True,
+            "expand": True,
+            "required": False,
+            "follow": None,
+            "width": self._configs["width_entry"],
+            "height": 10,
+        }
+        self._update(options, kw)
+
+        self._add_label(label=label, options=options)
+
+        widget = LogConsoleTheme(
+            master=self._line,
+            width=options["width"],
+            height=options["height"],
+            *args,
+            **kw,
+        )
+        self._place(widget, fill="both", expand=options["expand"], side="left")
+
+        if options["follow"] != None:
+            widget.follow(options["follow"])
+
+        return widget
+
+    @_recordable("elements")
     def add_calendar(self, name, label=None, *args, **kw):
         options = {
             "new_line": True,
@@ -2389,7 +5977,7 @@ class FormTheme(FrameTheme):
             *args,
             **kw,
         )
-        widget.pack(fill="x", expand=options["expand"], ipady=1, side="left")
+        self._place(widget, fill="x", expand=options["expand"], ipady=1, side="left")
 
         if options["value"] != None:
             widget.set_value(options["value"])
@@ -2404,6 +5992,7 @@ class FormTheme(FrameTheme):
 
         return widget
 
+    @_recordable("elements")
     def add_picker(self, name, label=None, picker="color", *args, **kw):
         options = {
             "new_line": True,
@@ -2425,7 +6014,7 @@ class FormTheme(FrameTheme):
             **kw,
         )
 
-        widget.pack(fill="x", expand=options["expand"], side="left")
+        self._place(widget, fill="x", expand=options["expand"], side="left")
         if options["value"] != None:
             widget.set_value(options["value"])
 
@@ -2439,6 +6028,7 @@ class FormTheme(FrameTheme):
 
         return widget
 
+    @_recordable("elements")
     def add_check(self, name, label, callback=None, *args, **kw):
         options = {
             "new_line": True,
@@ -2453,12 +6043,13 @@ class FormTheme(FrameTheme):
         if options["new_line"]:
             self.add_line()
 
-        LabelTheme(self._line, text=" ", width=1).pack(side="left")
+        if self._configs["layout"] != "flat":
+            LabelTheme(self._line, text=" ", width=1).pack(side="left")
 
         widget = CheckButtonTheme(
             master=self._line, text=label, callback=callback, *args, **kw
         )
-        widget.pack(fill="x", expand=options["expand"], side="left")
+        self._place(widget, fill="x", expand=options["expand"], side="left")
 
         if options["value"] != None:
             widget.set_value(options["value"])
@@ -2476,6 +6067,7 @@ class FormTheme(FrameTheme):
 
         return widget
 
+    @_recordable("elements")
     def add_option(self, name, label=None, items=None, callback=None, *args, **kw):
         options = {
             "new_line": True,
@@ -2502,7 +6094,7 @@ class FormTheme(FrameTheme):
             **kw,
         )
 
-        widget.pack(fill="x", expand=options["expand"], ipady=1, side="left")
+        self._place(widget, fill="x", expand=options["expand"], ipady=1, side="left")
 
         if options["value"] != None:
             widget.set_value(options["value"])
@@ -2517,6 +6109,7 @@ class FormTheme(FrameTheme):
 
         return widget
 
+    @_recordable("elements")
     def add_radio(self, name, label=None, items=None, callback=None, *args, **kw):
         options = {
             "new_line": True,
@@ -2540,7 +6133,7 @@ class FormTheme(FrameTheme):
             *args,
             **kw,
         )
-        widget.pack(fill="x", expand=options["expand"], side="left")
+        self._place(widget, fill="x", expand=options["expand"], side="left")
 
         if options["value"] != None:
             widget.set_value(options["value"])
@@ -2555,17 +6148,53 @@ class FormTheme(FrameTheme):
 
         return widget
 
+    @_recordable()
     def add_separator(self, *args, **kw):
-        "Add a Separator in form."
+        """Add a Separator in form. With orient 'vertical' it is added in the
+        line, between the elements side by side."""
+        options = {"orient": "horizontal"}
+        self._update(options, kw)
+
+        if options["orient"] == "vertical":
+            widget = ttk.Separator(self._line, orient="vertical", *args, **kw)
+            self._place(widget, fill="y", side="left", padx=self._configs["padding"])
+            return widget
+
         self.add_line()
 
         widget = ttk.Separator(self._line, orient="horizontal", *args, **kw)
-        widget.pack(fill="x", expand=True, padx=self._configs["padding"])
+        self._place(
+            widget, "full", fill="x", expand=True, padx=self._configs["padding"]
+        )
         self.add_line()
 
         return widget
 
+    @_recordable("buttons")
     def add_button(self, name, text, command, *args, **kw):
+        """
+        Add a button.
+
+        Options:
+            add_button:
+                'icon', 'side', 'new_line', 'width', 'size', 'padding'
+
+            submit:
+                'submit' (str) 'thread' or 'process' to run command(values)
+                    with the values of get() out of the Tk thread. Default None,
+                    command() runs in the Tk thread
+                'busy_state' (str) state set while command runs.
+                    Default 'all_disabled'
+                'on_result' (function) on_result(result) runs in the Tk thread
+                'on_error' (function) on_error(exception) runs in the Tk
+                    thread. Default None, the error is reported like the
+                    errors of Tk callbacks
+                'resubmit' (str) when pressed again while running, 'ignore'
+                    or 'cancel' the running one if the values changed.
+                    Default 'ignore'
+
+            With 'process' command and its result must be picklable.
+        """
         options = {
             "name": name,
             "text": text,
@@ -2575,14 +6204,46 @@ class FormTheme(FrameTheme):
             "width": self._configs["btn_width"],
             "size": self._configs["btn_size"],
             "padding": self._configs["btn_padding"],
+            "submit": None,
+            "busy_state": "all_disabled",
+            "on_result": None,
+            "on_error": None,
+            "resubmit": "ignore",
         }
         self._update(options, kw)
 
+        if options["submit"] != None:
+            if options["submit"] not in self._executors:
+                raise (
+                    AttributeError(
+                        f"submit -{options['submit']} not valid! Use 'thread' or 'process'"
+                    )
+                )
+            self._submit_configs[name] = {
+                "command": command,
+                "executor": options["submit"],
+                "busy_state": options["busy_state"],
+                "on_result": options["on_result"],
+                "on_error": options["on_error"],
+                "resubmit": options["resubmit"],
+            }
+            command = lambda: self.submit(name)
+
         if options["new_line"]:
             self.add_line()
 
+        master = self._line
+        if self._configs["layout"] == "flat":
+            # The buttons of a row are packed in one frame over the row
+            row = (str(self._line), self._row)
+            if self._buttons_line == None or self._buttons_line[0] != row:
+                frame = FrameTheme(self._line)
+                self._place(frame, "full", fill="x")
+                self._buttons_line = (row, frame)
+            master = self._buttons_line[1]
+
         widget = ButtonTheme(
-            master=self._line,
+            master=master,
             text=text,
             command=command,
             icon=options["icon"],
@@ -2600,6 +6261,106 @@ class FormTheme(FrameTheme):
 
         return widget
 
+    @classmethod
+    def _executor(cls, kind):
+        "Internal function. The pool of kind, shared by every form"
+        if cls._executors[kind] == None:
+            if kind == "thread":
+                cls._executors[kind] = ThreadPoolExecutor(thread_name_prefix="tktwid")
+            else:
+                cls._executors[kind] = ProcessPoolExecutor()
+        return cls._executors[kind]
+
+    def submit(self, name):
+        """
+        Run the command of the submit button name with the values of the
+        form, see add_button. Return False if the values are not valid or the
+        same values are already being submitted.
+        """
+        config = self._submit_configs[name]
+        values = self.get()
+        if values == {} and self._elements:
+            return False
+
+        running = self._submits.get(name)
+        if running != None:
+            if config["resubmit"] == "ignore" or running["values"] == values:
+                return False
+            # The running one is cancelled, or its result ignored if started
+            running["future"].cancel()
+            del self._submits[name]
+
+        # The submits running share the busy states, the widgets they change
+        # go back when the last one ends
+        if not self._submits:
+            self._busy = {"restore": {}, "previous": self._current_state}
+        if self._busy != None:
+            restore = self._busy["restore"]
+            for item in self._compile_state(config["busy_state"]):
+                restore.setdefault(item, self._widget_states.get(item, "active"))
+
+        busy, self._busy = self._busy, None
+        self.set_state(config["busy_state"])
+        self._busy = busy
+
+        future = self._executor(config["executor"]).submit(config["command"], values)
+        submit = {"future": future, "values": values}
+        self._submits[name] = submit
+        self.after(self._submit_poll_ms, lambda: self._poll_submit(name, submit))
+        return True
+
+    def _poll_submit(self, name, submit):
+        "Internal function. Wait in the Tk thread the end of a submit"
+        if self._submits.get(name) is not submit or not self.winfo_exists():
+            # Cancelled by a new submit, or the form was closed
+            return
+
+        future = submit["future"]
+        if not future.done():
+            self.after(self._submit_poll_ms, lambda: self._poll_submit(name, submit))
+            return
+
+        self._end_submit(name, submit)
+
+        config = self._submit_configs[name]
+        try:
+            result = future.result()
+        except Exception as e:
+            if config["on_error"] != None:
+                config["on_error"](e)
+            else:
+                self._root().report_callback_exception(type(e), e, e.__traceback__)
+            return
+
+        if config["on_result"] != None:
+            config["on_result"](result)
+
+    def _end_submit(self, name, submit):
+        """Internal function. Give back the states changed by the busy states
+        after the last submit, unless set_state was called meanwhile"""
+        del self._submits[name]
+        if self._submits or self._busy == None:
+            return
+
+        busy, self._busy = self._busy, None
+        for (group, state_name), state in busy["restore"].items():
+            if self._widget_states.get((group, state_name)) != state:
+                self._set_widget_state(group, state_name, state)
+        self._current_state = busy["previous"]
+
+    def cancel_submit(self, name):
+        """Cancel the submit of button name. A command already running is not
+        stopped, its result is ignored."""
+        submit = self._submits.get(name)
+        if submit != None:
+            submit["future"].cancel()
+            self._end_submit(name, submit)
+
+    def submitting(self, name=None):
+        "Return True if the button name, or any button, is submitting"
+        return name in self._submits if name != None else bool(self._submits)
+
+    @_recordable()
     def add_link(self, text, command=None, *args, **kw):
         """
         Add a Label with a link.
@@ -2633,7 +6394,9 @@ class FormTheme(FrameTheme):
             justify=options["align"],
             cursor="hand2",
         )
-        widget.pack(side=options["side"], fill="x", expand=options["expand"])
+        self._place(
+            widget, "full", side=options["side"], fill="x", expand=options["expand"]
+        )
 
         if command != None:
             widget.bind("<Button-1>", lambda e: command())
@@ -2669,6 +6432,98 @@ class FormTheme(FrameTheme):
                 ), f"item -{subitem} != defined!"
 
         self._states[state_name] = state_map
+        self._forget_transitions()
+
+    def build(self, schema):
+        """
+        Add the items and states of a declarative schema to the form. The
+        schema is compiled only the first time it is used, see FormSchema.
+
+        Args:
+            schema (dict, str or FormSchema)
+
+        Return:
+            The form
+        """
+        return FormSchema.of(schema).build(self)
+
+    @classmethod
+    def from_schema(cls, master, schema, *args, **kw):
+        """
+        Create a form from a declarative schema, see FormSchema. The configs
+        of the schema are used as options of the form, kw overrides them.
+        """
+        plan = FormSchema.of(schema)
+        form = cls(master, *args, **{**plan.configs, **kw})
+        return plan.build(form)
+
+    def _compile_state(self, state_name):
+        """Internal function. The state of each widget in state_name, like
+        {('elements', 'name'): 'active'}. Computed once per state."""
+        compiled = self._compiled_states.get(state_name)
+        if compiled != None:
+            return compiled
+
+        predefined = {
+            "all_active": ("active", "active"),
+            "all_disabled": ("disabled", "disabled"),
+            "only_buttons": ("disabled", "active"),
+            "only_elements": ("active", "disabled"),
+        }
+        if state_name in predefined:
+            elements, buttons = predefined[state_name]
+            compiled = {("elements", name): elements for name in self._elements}
+            compiled.update({("buttons", name): buttons for name in self._buttons})
+        else:
+            compiled = {}
+            state_map = self._states.get(state_name, {})
+            for group in ("elements", "buttons"):
+                for name, state in state_map.get(group, {}).items():
+                    if state not in ("active", "disabled"):
+                        kind = "" if group == "elements" else "button "
+                        raise (
+                            AttributeError(
+                                f"state -{state} set for {kind}-{name} == wrong!"
+                            )
+                        )
+                    compiled[(group, name)] = state
+
+        self._compiled_states[state_name] = compiled
+        return compiled
+
+    def _forget_transitions(self):
+        "Internal function. The widgets or the states changed"
+        self._compiled_states.clear()
+        self._transitions.clear()
+        self._current_state = None
+        if self._busy != None:
+            self._busy["previous"] = None
+
+    def _needs_focus(self, changes):
+        """Internal function. Return True if the widget with the focus is in
+        one of the widgets just disabled"""
+        try:
+            focus = self.focus_get()
+        except KeyError:
+            # Focus in a popup menu
+            return False
+        if focus == None:
+            return False
+
+        path = str(focus)
+        for (group, name), state in changes:
+            if state != "disabled":
+                continue
+            widget = (
+                self._elements[name]["widget"]
+                if group == "elements"
+                else self._buttons[name]
+            )
+            if widget != None and (
+                path == str(widget) or path.startswith(str(widget) + ".")
+            ):
+                return True
+        return False
 
     def set_state(self, state_name):
         """
@@ -2676,79 +6531,48 @@ class FormTheme(FrameTheme):
 
         predefineds are: 'all_active', 'all_disabled', 'only_buttons',
         'only_elements'
+
+        Only the widgets whose state differs are changed. The changes from a
+        state to another are computed once, and the focus is only taken back
+        when the widget with it is disabled. The submits running keep this
+        state when they end.
         """
-        if state_name not in [
-            "all_active",
-            "all_disabled",
-            "only_buttons",
-            "only_elements",
-        ]:
-            try:
-                elements = self._states[state_name]["elements"]
-            except KeyError:
-                elements = {}
-            try:
-                buttons = self._states[state_name]["buttons"]
-            except KeyError:
-                buttons = {}
-
-            for name, state in elements.items():
-                widget = self._elements[name]["widget"]
-                if state == "active":
-                    widget.active()
-                elif state == "disabled":
-                    widget.disable()
-                else:
-                    raise (AttributeError(f"state -{state} set for -{name} == wrong!"))
-
-            for name, state in buttons.items():
-                widget = self._buttons[name]
-                if state == "active":
-                    widget.active()
-                elif state == "disabled":
-                    widget.disable()
-                else:
-                    raise (
-                        AttributeError(
-                            f"state -{state} set for button -{name} == wrong!"
-                        )
-                    )
-        else:
-            # Disable all
-            if (
-                state_name == "all_disabled"
-                or state_name == "only_elements"
-                or state_name == "only_buttons"
-            ):
-                for name in self._elements.keys():
-                    widget = self._elements[name]["widget"]
-                    widget.disable()
+        self._busy = None
+
+        target = self._compile_state(state_name)
+        key = (self._current_state, state_name)
+
+        changes = self._transitions.get(key)
+        if changes == None:
+            changes = [
+                (item, state)
+                for item, state in target.items()
+                if self._widget_states.get(item) != state
+            ]
+            # Valid from the last state only if it sets every widget changed
+            previous = self._compiled_states.get(self._current_state)
+            if previous != None and all(item in previous for item in target):
+                self._transitions[key] = changes
 
-                for name in self._buttons.keys():
-                    widget = self._buttons[name]
-                    widget.disable()
+        focus = self._needs_focus(changes)
 
-            # Active all elements
-            if state_name == "all_active" or state_name == "only_elements":
-                for name in self._elements.keys():
-                    widget = self._elements[name]["widget"]
-                    widget.active()
+        for (group, name), state in changes:
+            self._set_widget_state(group, name, state)
 
-            # Active all buttons
-            if state_name == "all_active" or state_name == "only_buttons":
-                for name in self._buttons.keys():
-                    widget = self._buttons[name]
-                    widget.active()
+        self._current_state = state_name
 
-        self.focus_force()
+        if focus:
+            self.focus_force()
 
     def reset(self, default_values=True):
-        for name, element in self._elements.items():
-            widget = element["widget"]
-            if default_values:
-                widget.set_value(element["value"])
-            else:
-                widget.set_value(None)
+        with self.batch():
+            for name, element in self._elements.items():
+                if default_values and element.get("file") != None:
+                    self._load_file(name)
+                elif default_values:
+                    self._set_element_value(name, element["value"])
+                else:
+                    self._set_element_value(name, None)
 
     def get_default_values(self):
         """returns the default values ​​of the form
@@ -2764,29 +6588,139 @@ class FormTheme(FrameTheme):
 
     def set_default_values(self, name=None, value=None):
         if name != None and value != None:
-            self._elements[name]["widget"].set_value(value)
+            self._set_element_value(name, value)
         elif name != None and value == None:
             raise (ValueError("value cannot be none!"))
         elif name == None and value != None:
             raise (ValueError("name cannot be none!"))
         elif name == None and value == None:
-            values = self.get()
-            for name, value in values.items():
-                self._elements[name]["widget"].set_value(value)
+            self.set_values(self.get())
         else:
             raise (Exception(f"Error!"))
 
     def get(self):
-        """Return values from form like {'element_name':'element_value'}"""
-        submit = {}
+        """Return values from form like {'element_name':'element_value'}.
+        If some element is not valid every one is shown and {} returned."""
+        errors = self.validate()
+        if errors:
+            for name, message in errors.items():
+                self._require_value(name, message)
+            return {}
+
+        return dict(self._model)
+
+    def validate(self):
+        """Check every element in one pass.
+
+        Return:
+            A dict {'element_name': 'message'} of the elements not valid, empty
+            when the form can be submitted
+        """
+        self._refresh_stale()
+
+        errors = {}
         for name, element in self._elements.items():
-            if element["widget"].get_value() == "" and element["required"]:
-                self._require_value(name)
-                return {}
-            else:
-                submit[name] = element["widget"].get_value()
+            value = self._model[name]
+            if value == "" and element["required"]:
+                errors[name] = self._configs["message_require"]
+
+        return errors
+
+    def dirty_fields(self):
+        """Names of the elements whose value is not the one they had when the
+        form was clean, see mark_clean. Setting the clean value back, by the
+        user or by set_values, makes an element clean again."""
+        self._refresh_stale()
+        return list(self._dirty)
+
+    def mark_clean(self):
+        "Take the current values as the unchanged ones"
+        self._refresh_stale()
+        self._baseline.update(self._model)
+        self._dirty.clear()
+
+        for element in self._elements.values():
+            if isinstance(element["widget"], TextareaTheme):
+                element["widget"].mark_clean()
+
+    def navigate(self, records, prefetch=2, cache_size=64):
+        """
+        Show records one at a time in the form, see RecordNavigator. The
+        first record is shown.
+
+        Return:
+            A RecordNavigator
+        """
+        navigator = RecordNavigator(self, records, prefetch, cache_size)
+        if len(navigator) > 0:
+            navigator.go(0)
+        return navigator
+
+    def history(self, budget=1 << 20, compact_ms=1000):
+        """
+        Follow the changes of the form to undo and redo them, see FormHistory.
+
+        Return:
+            A FormHistory
+        """
+        return FormHistory(self, budget, compact_ms)
 
-        return submit
+    def persist(self, path, key="form", restore=True):
+        """
+        Save the values and the collapsed fields of the form in the file path
+        while they change, see FormCache. The state saved before is restored
+        in one batch, the elements that no longer exist are ignored.
+
+        Args:
+            path (str) JSON lines file, many forms can share it
+            key (str) name of the form in the file
+            restore (bool) show the state saved. Default True
+
+        Return:
+            The FormCache
+        """
+        cache = FormCache.of(path)
+
+        if restore:
+            values, sections = cache.load(key)
+            self.set_values(
+                {
+                    name: value
+                    for name, value in values.items()
+                    if name in self._elements
+                }
+            )
+            for name, collapsed in sections.items():
+                if name in self._sections:
+                    if collapsed:
+                        self.collapse_field(name)
+                    else:
+                        self.expand_field(name)
+
+        def save_values(changes):
+            cache.write(key, "set", {name: new for name, (old, new) in changes.items()})
+
+        def save_sections(event):
+            cache.write(
+                key,
+                "sections",
+                {
+                    name: section["collapsed"]
+                    for name, section in self._sections.items()
+                    if "toggle" in section
+                },
+            )
+
+        # The first line keeps every value, then only the changes are written
+        self._refresh_stale()
+        cache.write(key, "values", self._model)
+        self.add_listener(save_values)
+        self.bind("<<FieldToggled>>", save_sections, add="+")
+        # The last changes are written before the form goes away
+        self.bind(
+            "<Destroy>", lambda e: cache.flush() if e.widget is self else None, True
+        )
+        return cache
 
     def pack_widget(self, **kw):
         self.pack(fill="both", expand=True)
@@ -2798,16 +6732,23 @@ class FormTheme(FrameTheme):
         return list(self._elements.keys())
 
     def element(self, name):
+        self._realize_element(name)
         return self._elements[name]
 
     def buttons(self):
         return list(self._buttons.keys())
 
     def button(self, name):
+        if self._buttons[name] == None:
+            for section in list(self._sections.values()):
+                if name in section["kinds"]:
+                    self._realize_section(section)
         return self._buttons[name]
 
     def changed(self):
-        return self.values() == self.get()
+        "Return True if some element changed since the form was clean"
+        self._refresh_stale()
+        return bool(self._dirty)
 
     def keys(self):
         return list(self._configs.keys())
@@ -2855,6 +6796,835 @@ class FormTheme(FrameTheme):
         root.mainloop()
 
 
+class RecordNavigator:
+    """
+    Show many records in one FormTheme, one at a time.
+
+    Moving to another record only sets the elements whose value differs from
+    the record shown, in one batch. The records around the current one are
+    loaded in a thread while the user works. The edits of each record are
+    kept in a change log with only the values that differ from the record,
+    so they come back when the user returns to it.
+
+    navigator = form.navigate(records)
+    navigator.next()
+    navigator.changes()  # {index: {'element_name': 'edited value'}}
+
+    Args:
+        form (FormTheme)
+        records a sequence of dicts, or any object with __len__ and
+            __getitem__ (index) returning a dict. It is read from a thread
+            when prefetch is not 0
+        prefetch (int) records loaded ahead on each side. Default 2
+        cache_size (int) records kept loaded. Default 64
+    """
+
+    def __init__(self, form, records, prefetch=2, cache_size=64):
+        self.form = form
+        self.index = None
+
+        self._records = records
+        self._prefetch = prefetch
+        self._cache_size = max(cache_size, 2 * prefetch + 1)
+        self._cache = OrderedDict()
+        self._log = {}
+        self._shown = {}
+        self._waiting = None
+        self._poll_job = None
+
+        form.add_listener(self._on_change)
+
+    def __len__(self):
+        return len(self._records)
+
+    @staticmethod
+    def _same(a, b):
+        "Internal function. Empty values of the widgets are the same as None"
+        return a == b or (a in (None, "") and b in (None, ""))
+
+    def _load(self, index):
+        "Internal function. A future of the record index, loading it if needed"
+        future = self._cache.get(index)
+        if future == None:
+            future = Future()
+            future.set_result(self._records[index])
+            self._keep(index, future)
+        else:
+            self._cache.move_to_end(index)
+        return future
+
+    def _keep(self, index, future):
+        self._cache[index] = future
+        while len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
+
+    def _prefetch_around(self, index):
+        if self._prefetch <= 0:
+            return
+
+        executor = FormTheme._executor("thread")
+        for step in range(1, self._prefetch + 1):
+            for i in (index + step, index - step):
+                if 0 <= i < len(self._records) and i not in self._cache:
+                    self._keep(i, executor.submit(self._records.__getitem__, i))
+
+    def record(self, index):
+        "The record index with its edits"
+        values = dict(self._load(index).result())
+        values.update(self._log.get(index, {}))
+        return values
+
+    def go(self, index):
+        """Show the record index, setting only the elements that differ from
+        the record shown.
+
+        Return:
+            The record, or None if it is still loaded by the prefetch thread.
+            Then it is shown when loaded, without blocking the interface.
+        """
+        if not 0 <= index < len(self._records):
+            raise (IndexError(f"record -{index} out of range!"))
+
+        if not self._load(index).done():
+            self._waiting = index
+            if self._poll_job == None:
+                self._poll_job = self.form.after(FormTheme._submit_poll_ms, self._poll)
+            return None
+
+        self._waiting = None
+        return self._show(index)
+
+    def _poll(self):
+        "Internal function. Wait in the Tk thread the record to show"
+        self._poll_job = None
+        if self._waiting == None or not self.form.winfo_exists():
+            return
+        self.go(self._waiting)
+
+    def _show(self, index):
+        # Edits of a TextareaTheme are read now to reach the log
+        self.form._refresh_stale()
+
+        original = self._load(index).result()
+        edits = self._log.get(index, {})
+        edited = set(self._log.get(self.index, {})) | set(edits)
+        values = {}
+        for name in self.form._elements:
+            value = original.get(name)
+            if name in edited or not self._same(self._shown.get(name), value):
+                values[name] = value
+            self._shown[name] = value
+
+        # Not edits of the user, for the log and the other listeners. The
+        # record is the clean state of the form, its edits are dirty.
+        with self.form.muted():
+            self.form.set_values(values)
+        self.form.mark_clean()
+        with self.form.muted():
+            self.form.set_values(
+                {name: value for name, value in edits.items() if name in values}
+            )
+
+        self.index = index
+        self._prefetch_around(index)
+        return self.record(index)
+
+    def _current(self):
+        "Internal function. The record shown, or the one waited"
+        return self._waiting if self._waiting != None else self.index
+
+    def next(self):
+        "Show the next record, if any. Return its index"
+        current = self._current()
+        if current == None:
+            self.go(0)
+        elif current + 1 < len(self._records):
+            self.go(current + 1)
+        return self._current()
+
+    def previous(self):
+        "Show the previous record, if any. Return its index"
+        current = self._current()
+        if current == None:
+            self.go(0)
+        elif current > 0:
+            self.go(current - 1)
+        return self._current()
+
+    def _on_change(self, changes):
+        "Internal function. Log the edits of the user in the record shown"
+        if self.index == None:
+            return
+
+        original = self._load(self.index).result()
+        edits = self._log.setdefault(self.index, {})
+        for name, (old, new) in changes.items():
+            if self._same(new, original.get(name)):
+                edits.pop(name, None)
+            else:
+                edits[name] = new
+
+        if not edits:
+            del self._log[self.index]
+
+    def changes(self):
+        "The edits of every record like {index: {'element_name': value}}"
+        self.form._refresh_stale()
+        return {index: dict(edits) for index, edits in self._log.items()}
+
+    def dirty_records(self):
+        "Indexes of the records edited"
+        self.form._refresh_stale()
+        return sorted(self._log)
+
+    def revert(self, index=None):
+        "Forget the edits of record index, or of every record if None"
+        self.form._refresh_stale()
+        if index == None:
+            self._log.clear()
+        else:
+            self._log.pop(index, None)
+
+        if self.index != None and (index == None or index == self.index):
+            current, self.index = self.index, None
+            self._shown = {name: object() for name in self._shown}
+            self.go(current)
+
+
+class FormHistory:
+    """
+    Undo, redo and named snapshots of the values of a FormTheme.
+
+    Each change is kept as a delta of the elements changed, not a copy of
+    the form. Consecutive changes of the same element within compact_ms,
+    like keystrokes, are merged in one step. The oldest steps are dropped
+    when the values kept use more than budget bytes. Snapshots keep only
+    the values that differ from the previous snapshot and share the others.
+    Values are restored in one batch of set_values.
+
+    history = form.history()
+    history.undo()
+    history.snapshot('before import')
+    history.restore('before import')
+
+    TextareaTheme edits are recorded when the form reads them, by get or
+    another batch, not key by key.
+
+    Args:
+        form (FormTheme)
+        budget (int) bytes of values kept by the steps. Default 1 MiB
+        compact_ms (int) time to merge changes of an element. Default 1000
+    """
+
+    # Snapshots kept as deltas of another one before a complete copy
+    max_depth = 16
+
+    def __init__(self, form, budget=1 << 20, compact_ms=1000):
+        self.form = form
+        self.budget = budget
+        self.compact_ms = compact_ms
+
+        self._undo = deque()
+        self._redo = []
+        self._size = 0
+        self._sealed = True
+        self._replaying = False
+
+        self._snapshots = {}
+        self._last_snapshot = None
+
+        form.add_listener(self._on_change)
+
+    @staticmethod
+    def _sizeof(changes):
+        return sum(
+            sys.getsizeof(old) + sys.getsizeof(new) for old, new in changes.values()
+        )
+
+    def _on_change(self, changes):
+        "Internal function. Keep the changes of the user as a step"
+        if self._replaying:
+            return
+
+        now = time.monotonic()
+        self._redo.clear()
+
+        last = self._undo[-1] if self._undo else None
+        if (
+            not self._sealed
+            and last != None
+            and len(changes) == 1
+            and list(changes) == list(last["changes"])
+            and (now - last["time"]) * 1000 < self.compact_ms
+        ):
+            # One more keystroke in the same element
+            name = next(iter(changes))
+            old = last["changes"][name][0]
+            new = changes[name][1]
+            self._size -= last["size"]
+            if old == new:
+                self._undo.pop()
+                self._sealed = True
+                return
+            last["changes"][name] = (old, new)
+            last["size"] = self._sizeof(last["changes"])
+            last["time"] = now
+            self._size += last["size"]
+        else:
+            step = {"changes": dict(changes), "time": now}
+            step["size"] = self._sizeof(step["changes"])
+            self._undo.append(step)
+            self._size += step["size"]
+            self._sealed = len(changes) != 1
+
+        while self._size > self.budget and len(self._undo) > 1:
+            self._size -= self._undo.popleft()["size"]
+
+    def _apply(self, values):
+        self._replaying = True
+        try:
+            self.form.set_values(values)
+        finally:
+            self._replaying = False
+
+    def can_undo(self):
+        return bool(self._undo)
+
+    def can_redo(self):
+        return bool(self._redo)
+
+    def undo(self):
+        "Go back one step. Return False if there is none"
+        self.form._refresh_stale()
+        if not self._undo:
+            return False
+
+        step = self._undo.pop()
+        self._size -= step["size"]
+        self._redo.append(step)
+        self._sealed = True
+        self._apply({name: old for name, (old, new) in step["changes"].items()})
+        return True
+
+    def redo(self):
+        "Apply again the last step undone. Return False if there is none"
+        if not self._redo:
+            return False
+
+        step = self._redo.pop()
+        self._undo.append(step)
+        self._size += step["size"]
+        self._sealed = True
+        self._apply({name: new for name, (old, new) in step["changes"].items()})
+        return True
+
+    def clear(self):
+        "Forget the steps, snapshots are kept"
+        self._undo.clear()
+        self._redo.clear()
+        self._size = 0
+        self._sealed = True
+
+    def _resolve(self, name):
+        "Internal function. The values of snapshot name"
+        chain = []
+        seen = set()
+        while name != None:
+            if name in seen:
+                raise (RuntimeError(f"Snapshot -{name} made from itself!"))
+            seen.add(name)
+            parent, delta, depth = self._snapshots[name]
+            chain.append(delta)
+            name = parent
+
+        values = {}
+        for delta in reversed(chain):
+            values.update(delta)
+        return values
+
+    def snapshot(self, name):
+        """Keep the values of the form as snapshot name, replacing the one
+        with the same name"""
+        self.form._refresh_stale()
+        values = dict(self.form._model)
+        self._sealed = True
+
+        if name in self._snapshots:
+            # The ones made from it are kept whole, it can't be its own parent
+            self.remove_snapshot(name)
+
+        parent = self._last_snapshot
+        if parent != None and self._snapshots[parent][2] < self.max_depth:
+            base = self._resolve(parent)
+            delta = {
+                key: value
+                for key, value in values.items()
+                if key not in base or base[key] != value
+            }
+            self._snapshots[name] = (parent, delta, self._snapshots[parent][2] + 1)
+        else:
+            self._snapshots[name] = (None, values, 0)
+
+        self._last_snapshot = name
+
+    def restore(self, name):
+        """Set the values of snapshot name, only the ones that differ. It can
+        be undone like any change."""
+        self.form._refresh_stale()
+        values = self._resolve(name)
+        model = self.form._model
+        self.form.set_values(
+            {
+                key: value
+                for key, value in values.items()
+                if key in model and model[key] != value
+            }
+        )
+        self._sealed = True
+
+    def snapshots(self):
+        return list(self._snapshots)
+
+    def remove_snapshot(self, name):
+        "Forget snapshot name, the ones made from it keep its values"
+        values = self._resolve(name)
+        for key, (parent, delta, depth) in list(self._snapshots.items()):
+            if parent == name:
+                children = dict(values)
+                children.update(delta)
+                self._snapshots[key] = (None, children, 0)
+        del self._snapshots[name]
+        if self._last_snapshot == name:
+            self._last_snapshot = None
+
+
+class FormCache:
+    """
+    A JSON lines file keeping the values and the fields collapsed of forms,
+    to show them again like they were when the application starts.
+
+    Every change is appended as a short line by a thread, so the Tk thread
+    does not wait for the disk and a crash loses at most the last changes.
+    The changes waiting are written when the application exits, see close.
+    When the file has more than compact_lines lines it is written again with
+    one line per form.
+
+    cache = form.persist('forms.jsonl', key='client')
+
+    Lines are like {"form": "client", "set": {"name": "Ana"}} or
+    {"form": "client", "sections": {"Address": true}}. Values that are not
+    JSON are saved as str.
+
+    Args:
+        path (str) file path
+    """
+
+    _instances = {}
+    compact_lines = 1000
+    # Put in the queue to end the writer thread
+    _end = None
+
+    def __init__(self, path):
+        self.path = path
+        self._queue = queue.Queue()
+        self._writer = None
+        self._lines = None
+
+    @classmethod
+    def of(cls, path):
+        "Return the cache of path, one for every form saved in it"
+        path = os.path.abspath(path)
+        cache = cls._instances.get(path)
+        if cache == None:
+            if not cls._instances:
+                atexit.register(cls.close_all)
+            cache = cls._instances[path] = cls(path)
+        return cache
+
+    @classmethod
+    def close_all(cls):
+        "Close every cache, called when the application exits"
+        for cache in list(cls._instances.values()):
+            cache.close()
+
+    def _fold(self):
+        """Internal function. The state of each form in the file and the
+        number of lines read"""
+        states = {}
+        lines = 0
+        try:
+            with open(self.path, encoding="utf-8") as file:
+                for line in file:
+                    lines += 1
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        # A line cut by a crash
+                        continue
+                    if record.get("clear"):
+                        states.pop(record.get("form"), None)
+                        continue
+                    state = states.setdefault(
+                        record.get("form"), {"values": {}, "sections": {}}
+                    )
+                    if "values" in record:
+                        state["values"] = dict(record["values"])
+                    state["values"].update(record.get("set", {}))
+                    state["sections"].update(record.get("sections", {}))
+        except FileNotFoundError:
+            pass
+
+        return states, lines
+
+    def load(self, key):
+        """
+        Read the state saved for form key.
+
+        Return:
+            A tuple (values, sections) of dicts like {'element_name': value}
+            and {'section_name': collapsed}
+        """
+        self.flush()
+        state = self._fold()[0].get(key, {"values": {}, "sections": {}})
+        return state["values"], state["sections"]
+
+    def write(self, key, kind, data):
+        """Save data for form key in a thread. kind is 'values' for every
+        value, 'set' for values changed or 'sections'."""
+        self._put({"form": key, kind: dict(data)})
+
+    def _put(self, record):
+        self._queue.put(record)
+        if self._writer == None or not self._writer.is_alive():
+            self._writer = threading.Thread(target=self._write, daemon=True)
+            self._writer.start()
+
+    def _write(self):
+        "Internal function. Append the lines waiting, in the writer thread"
+        if self._lines == None:
+            self._lines = self._fold()[1]
+
+        while True:
+            records = [self._queue.get()]
+            while not self._queue.empty():
+                records.append(self._queue.get())
+
+            ends = records.count(self._end)
+            if ends:
+                records = [record for record in records if record != self._end]
+                for i in range(ends):
+                    self._queue.task_done()
+
+            try:
+                with open(self.path, "a", encoding="utf-8") as file:
+                    for record in records:
+                        file.write(json.dumps(record, default=str) + "\n")
+                self._lines += len(records)
+
+                if self._lines > self.compact_lines:
+                    self._compact()
+            finally:
+                for record in records:
+                    self._queue.task_done()
+
+            if ends and self._queue.empty():
+                return
+
+    def _compact(self):
+        "Internal function. Write the file again with a line per form"
+        states, lines = self._fold()
+        temporary = self.path + ".tmp"
+        with open(temporary, "w", encoding="utf-8") as file:
+            for key, state in states.items():
+                record = {"form": key, "values": state["values"]}
+                if state["sections"]:
+                    record["sections"] = state["sections"]
+                file.write(json.dumps(record, default=str) + "\n")
+        os.replace(temporary, self.path)
+        self._lines = len(states)
+
+    def flush(self):
+        "Wait until the changes are written"
+        if self._writer != None and self._writer.is_alive():
+            self._queue.join()
+
+    def close(self):
+        """Write the changes waiting and end the writer thread. A new write
+        starts it again."""
+        writer = self._writer
+        if writer != None and writer.is_alive():
+            self._queue.put(self._end)
+            writer.join()
+        self._writer = None
+
+    def clear(self, key=None):
+        "Forget the state of form key, or of every form"
+        self.flush()
+        if key == None:
+            if os.path.exists(self.path):
+                os.remove(self.path)
+            self._lines = 0
+            return
+
+        self._put({"form": key, "clear": True})
+
+
+class FormWizard(FrameTheme):
+    """
+    A form split in pages shown one at a time, with Back, Next and Finish
+    buttons.
+
+    The values of every page are kept in one model, but only the cache_pages
+    pages used last are kept as widgets. The others are destroyed and built
+    again from their spec when shown, and the next page is built while the
+    application is idle.
+
+    wizard = FormWizard(master, on_finish=print)
+    wizard.add_page('Client', client_schema)
+    wizard.add_page('Address', lambda form: form.add_entry('city', 'City: '))
+    wizard.show(0)
+
+    Args:
+        master (tk.Widget)
+
+    Options:
+        cache_pages (int) pages kept as widgets. Default 3
+        on_finish (function) on_finish(values) when Finish is pressed with
+            every page valid, built or not
+        name_buttons (list) texts of the buttons. Default ['Back', 'Next', 'Finish']
+        form (dict) options of the FormTheme of each page
+    """
+
+    def __init__(self, master, *args, **kw):
+        self._configs = {
+            "cache_pages": 3,
+            "on_finish": None,
+            "name_buttons": ["Back", "Next", "Finish"],
+            "form": {},
+        }
+        for key in list(kw.keys()):
+            if key in self._configs:
+                self._configs[key] = kw.pop(key)
+
+        super(FormWizard, self).__init__(master, *args, **kw)
+
+        self._pages = []
+        self._forms = OrderedDict()
+        self._values = {}
+        self._index = None
+        self._prewarm_job = None
+
+        self._body = FrameTheme(self)
+        self._body.pack(fill="both", expand=True, side="top")
+
+        back, next, finish = self._configs["name_buttons"]
+        line = FrameTheme(self, padding=5)
+        line.pack(fill="x", side="bottom")
+        self._finish = ButtonTheme(line, finish, command=self.finish, width=10)
+        self._finish.pack(side="right")
+        self._next = ButtonTheme(line, next, command=self.next, width=10)
+        self._next.pack(side="right")
+        self._back = ButtonTheme(line, back, command=self.previous, width=10)
+        self._back.pack(side="right")
+
+    def add_page(self, title, spec):
+        """
+        Add a page.
+
+        Args:
+            title (str)
+            spec a schema of FormSchema (dict, str or FormSchema), or a
+                function spec(form) that adds the items to an empty form
+        """
+        page = {"title": title, "spec": spec}
+        if not callable(spec):
+            page["spec"] = plan = FormSchema.of(spec)
+            # Default values of the elements of the page
+            for method, args, kw in plan.calls():
+                if args and args[0] in plan.elements:
+                    self._values.setdefault(args[0], kw.get("value"))
+
+        self._pages.append(page)
+        return len(self._pages) - 1
+
+    def _build(self, index):
+        "Internal function. Create the form of page index with the model values"
+        page = self._pages[index]
+        form = FormTheme(self._body, **self._configs["form"])
+        form.add_title(page["title"], font=form._configs["font_subtitle"])
+
+        if isinstance(page["spec"], FormSchema):
+            page["spec"].build(form)
+        else:
+            page["spec"](form)
+
+        form.set_values(
+            {
+                name: self._values[name]
+                for name in form._elements
+                if self._values.get(name) != None
+            }
+        )
+        form.add_listener(lambda changes: self._on_change(changes))
+
+        self._forms[index] = form
+        self._evict(index)
+        return form
+
+    def _on_change(self, changes):
+        for name, (old, new) in changes.items():
+            self._values[name] = new
+
+    def _evict(self, keep=None):
+        """Internal function. Destroy the pages used first above cache_pages,
+        but the one shown and keep"""
+        while len(self._forms) > max(self._configs["cache_pages"], 1):
+            index = next((i for i in self._forms if i not in (self._index, keep)), None)
+            if index == None:
+                break
+            form = self._forms.pop(index)
+            self._keep_values(form)
+            form.destroy()
+
+    def _keep_values(self, form):
+        "Internal function. Read the values the listeners do not report"
+        form._refresh_stale()
+        self._values.update(form._model)
+
+    def _prewarm(self):
+        self._prewarm_job = None
+        following = self._index + 1
+        if (
+            self._configs["cache_pages"] > 1
+            and following < len(self._pages)
+            and following not in self._forms
+        ):
+            self._build(following)
+
+    def show(self, index):
+        "Show page index"
+        if not 0 <= index < len(self._pages):
+            raise (IndexError(f"page -{index} out of range!"))
+
+        if self._index != None and self._index in self._forms:
+            self._forms[self._index].pack_forget()
+
+        self._index = index
+        form = self._forms.get(index)
+        if form == None:
+            form = self._build(index)
+        self._forms.move_to_end(index)
+        form.pack(fill="both", expand=True)
+
+        if index > 0:
+            self._back.active()
+        else:
+            self._back.disable()
+        if index + 1 < len(self._pages):
+            self._next.active()
+        else:
+            self._next.disable()
+
+        if self._prewarm_job == None:
+            self._prewarm_job = self.after_idle(self._prewarm)
+
+        return form
+
+    def page(self, index=None):
+        "The FormTheme of page index, or of the page shown"
+        index = self._index if index == None else index
+        if index in self._forms:
+            return self._forms[index]
+        return self.show(index)
+
+    def _valid(self):
+        "Internal function. Show the errors of the page, if any"
+        if self._index == None:
+            return True
+        form = self._forms[self._index]
+        return not form._elements or form.get() != {}
+
+    def _errors(self, index):
+        """Internal function. True if page index is not valid. The pages of a
+        schema not built are checked in the model, without widgets."""
+        form = self._forms.get(index)
+        if form != None:
+            return bool(form.validate())
+
+        spec = self._pages[index]["spec"]
+        if not isinstance(spec, FormSchema):
+            # Its elements are only known by building it
+            return bool(self._build(index).validate())
+
+        for method, args, kw in spec.calls():
+            if (
+                args
+                and args[0] in spec.elements
+                and kw.get("required", False)
+                and self._values.get(args[0]) in (None, "")
+            ):
+                return True
+        return False
+
+    def next(self):
+        "Show the next page if the one shown is valid"
+        if self._index == None:
+            self.show(0)
+        elif self._valid() and self._index + 1 < len(self._pages):
+            self.show(self._index + 1)
+
+    def previous(self):
+        if self._index != None and self._index > 0:
+            self.show(self._index - 1)
+
+    def get(self):
+        "Values of every page like {'element_name':'element_value'}"
+        for form in self._forms.values():
+            self._keep_values(form)
+        return dict(self._values)
+
+    def finish(self):
+        """Run on_finish with the values if every page is valid, or show the
+        first page with errors"""
+        for index in range(len(self._pages)):
+            if self._errors(index):
+                self.show(index)
+                self._valid()
+                return
+        values = self.get()
+        if self._configs["on_finish"] != None:
+            self._configs["on_finish"](values)
+        return values
+
+    def destroy(self):
+        if self._prewarm_job != None:
+            self.after_cancel(self._prewarm_job)
+            self._prewarm_job = None
+        super().destroy()
+
+    @staticmethod
+    def how_it_works():
+        root = tk.Tk()
+        wizard = FormWizard(root, cache_pages=2, on_finish=print)
+        for i in range(10):
+            wizard.add_page(
+                f"Step {i + 1}",
+                {
+                    "items": [
+                        {
+                            "type": "entry",
+                            "name": f"field{i}_{j}",
+                            "label": f"Field {j}: ",
+                        }
+                        for j in range(20)
+                    ]
+                },
+            )
+        wizard.pack(fill="both", expand=True)
+        wizard.show(0)
+        root.mainloop()
+
+
 class HowTkinterThemeWidgetsWorks(tk.Tk):
     """Show how the defined widgets work"""
 